@@ -1,12 +1,347 @@
 #!/usr/bin/env python3
 import sys
 import os
-import subprocess
+import json
+import queue
+import socketserver
+import threading
+import time
+
+DEFAULT_DAEMON_PORT = 47610
+
+
+class _BroadcastStdout:
+    """Forwards printed lines to connected GUI clients (or the real stdout when none are connected)"""
+    
+    def __init__(self, daemon, original):
+        self.daemon = daemon
+        self.original = original
+        self._pending = ""
+        self._lock = threading.Lock()
+    
+    def write(self, text):
+        with self._lock:
+            self._pending += text
+            *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            if not self.daemon.broadcast({"type": "log", "text": line}):
+                self.original.write(line + "\n")
+        return len(text)
+    
+    def flush(self):
+        self.original.flush()
+
+
+class _Client:
+    """One connected GUI: messages are queued and written by the client's own thread
+    
+    A slow or stalled socket then only delays its own messages; the
+    translation loop and the other clients never wait on it. A client whose
+    queue fills up is disconnected.
+    """
+    
+    def __init__(self, daemon, wfile, max_pending=1000):
+        self.daemon = daemon
+        self.wfile = wfile
+        self.outbox = queue.Queue(maxsize=max_pending)
+        self.thread = threading.Thread(target=self._write_loop, name="daemon-client-writer", daemon=True)
+        self.thread.start()
+    
+    def put(self, data):
+        """Queue encoded data; returns False if the client is too far behind"""
+        try:
+            self.outbox.put_nowait(data)
+            return True
+        except queue.Full:
+            return False
+    
+    def close(self):
+        try:
+            self.outbox.put_nowait(None)
+        except queue.Full:
+            # The writer is stuck on the socket; closing it unblocks the write
+            self.wfile.close()
+    
+    def _write_loop(self):
+        while True:
+            data = self.outbox.get()
+            if data is None:
+                return
+            try:
+                self.wfile.write(data)
+                self.wfile.flush()
+            except (OSError, ValueError):
+                self.daemon.remove_client(self)
+                return
+
+
+class _ClientHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon = self.server.daemon
+        client = daemon.add_client(self.wfile)
+        try:
+            for raw in self.rfile:
+                try:
+                    command = json.loads(raw.decode("utf-8"))
+                except ValueError:
+                    daemon.send(client, {"type": "reply", "ok": False, "error": "invalid JSON"})
+                    continue
+                daemon.send(client, daemon.handle_command(command))
+        finally:
+            daemon.remove_client(client)
+            # Let queued replies and logs reach the socket before the handler closes it
+            client.thread.join(timeout=2)
+
+
+class _DaemonServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class BackendDaemon:
+    """Keeps one warm StandaloneTranslator and runs sessions on command from the GUI
+    
+    The GUI connects over a local TCP socket and sends newline-delimited JSON
+    commands (start, stop, set_languages, profile, status, shutdown). Imports and
+    the Recognizer/Translator are set up once, so start and language changes
+    only touch per-session state; the audio device is open only while a
+    session runs.
+    """
+    
+    def __init__(self, port=DEFAULT_DAEMON_PORT, profile=False):
+        self.port = port
+        self.profile = profile
+        self.translator = None
+        self.session_thread = None
+        # Held from the running check until the session thread has started, so two starts cannot race
+        self.session_lock = threading.Lock()
+        self.clients = []
+        self.clients_lock = threading.Lock()
+        self.warm = threading.Event()
+        self.server = None
+        self.console = sys.stdout
+    
+    def add_client(self, wfile):
+        client = _Client(self, wfile)
+        with self.clients_lock:
+            self.clients.append(client)
+        return client
+    
+    def remove_client(self, client):
+        with self.clients_lock:
+            if client not in self.clients:
+                return
+            self.clients.remove(client)
+        client.close()
+    
+    def send(self, client, message):
+        """Queue a message for one client; the socket write happens on the client's writer thread"""
+        data = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+        if not client.put(data):
+            self.console.write("⚠️  GUI client not reading - disconnecting it\n")
+            self.remove_client(client)
+    
+    def broadcast(self, message):
+        """Send a message to every client; returns False if nobody is connected"""
+        with self.clients_lock:
+            clients = list(self.clients)
+        for client in clients:
+            self.send(client, message)
+        return bool(clients)
+    
+    def forward_event(self, event):
+        """Pass a typed pipeline event (caption, status) to the GUI as-is"""
+        if not self.broadcast(event):
+            self.console.write(event["text"] + "\n")
+    
+    def warm_up(self):
+        """Import the pipeline and build the backends once; the audio device is only opened per session"""
+        try:
+            import standalone_translator
+            import event_bus
+            
+            event_bus.subscribe(self.forward_event)
+            self.translator = standalone_translator.StandaloneTranslator(profile=self.profile)
+            self.translator.backends.wait()
+            with self.translator.startup.phase("import capture modules"):
+                import audio_preprocess
+                import capture_monitor
+                import capture_sources
+                try:
+                    standalone_translator.backends.sounddevice()
+                except ImportError:
+                    pass  # loopback and file input work without PortAudio
+            self.translator.startup.report()
+            print("🔥 Backend warm - ready for instant start")
+        except Exception as e:
+            print(f"❌ Backend warm-up failed: {e}")
+        finally:
+            self.warm.set()
+            sys.stdout.flush()
+    
+    def handle_command(self, command):
+        name = command.get("cmd")
+        handler = getattr(self, f"_cmd_{name}", None)
+        if handler is None:
+            return {"type": "reply", "cmd": name, "ok": False, "error": f"unknown command: {name}"}
+        
+        started = time.perf_counter()
+        try:
+            reply = handler(command) or {}
+            reply.setdefault("ok", True)
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        reply.update({"type": "reply", "cmd": name, "elapsed_ms": (time.perf_counter() - started) * 1000})
+        return reply
+    
+    def _session_running(self):
+        return self.session_thread is not None and self.session_thread.is_alive()
+    
+    def _cmd_start(self, command):
+        with self.session_lock:
+            return self._start_session(command)
+    
+    def _start_session(self, command):
+        from startup_profile import StartupProfiler
+        
+        if self._session_running():
+            return {"ok": False, "error": "translation already running"}
+        self.warm.wait()
+        if self.translator is None:
+            return {"ok": False, "error": "backend failed to warm up"}
+        
+        # Switching between microphone, loopback and file reopens the capture
+        self.translator.set_input_source(command.get("input", "mic"))
+        self.translator.prepare_session(
+            command.get("source", "it"),
+            command.get("target", "en"),
+            command.get("output_folder", ""),
+            profiler=StartupProfiler(command.get("launch_epoch_ms")),
+            archive_audio=command.get("archive_audio"),
+            long_session=bool(command.get("long_session", False)),
+            sentence_delay=float(command.get("sentence_delay", 6.0))
+        )
+        self.translator.set_noise_suppression(bool(command.get("denoise", False)))
+        # Sessions started with the same port keep the server, so overlays stay connected
+        self.translator.set_caption_server(command.get("captions"))
+        # Likewise a Prometheus scraper keeps its target across sessions
+        self.translator.set_metrics(command.get("metrics"), command.get("metrics_file"))
+        self.translator.set_glossary(command.get("glossary"))
+        self.translator.set_translation_memory(command.get("translation_memory"))
+        self.translator.set_second_pass(command.get("second_pass"))
+        self.translator.set_speaker_detection(bool(command.get("speaker_turns", False)))
+        # The device is only held while a session runs; failing to open it fails the start command
+        self.translator.open_audio_stream()
+        self.session_thread = threading.Thread(
+            target=self._run_session,
+            name="translation-session",
+            daemon=True
+        )
+        self.session_thread.start()
+        return {"output_file": self.translator.output_file}
+    
+    def _run_session(self):
+        """Run one session, release the device, and tell the GUI the session is over (however it ended)"""
+        error = None
+        try:
+            self.translator.run_translation_loop(keep_stream_open=True)
+        except Exception as e:
+            error = str(e)
+            print(f"❌ Translation session failed: {e}")
+            sys.stdout.flush()
+        finally:
+            self.translator.close_audio_stream()
+            text = f"⏹️ Translation stopped: {error}" if error else "⏹️ Translation stopped"
+            self.forward_event({"type": "status", "text": text, "running": False, "error": error})
+    
+    def _cmd_stop(self, command):
+        if not self._session_running():
+            return {"ok": False, "error": "translation not running"}
+        # The loop notices within one tick and writes the session summary itself
+        self.translator.is_listening = False
+        return {}
+    
+    def _cmd_set_languages(self, command):
+        self.warm.wait()
+        if self.translator is None:
+            return {"ok": False, "error": "backend failed to warm up"}
+        self.translator.reconfigure(command.get("source"), command.get("target"))
+        return {}
+    
+    def _cmd_profile(self, command):
+        self.warm.wait()
+        if self.translator is None:
+            return {"ok": False, "error": "backend failed to warm up"}
+        enabled = bool(command.get("enabled", True))
+        return {"enabled": enabled, "files": self.translator.set_profiling(enabled)}
+    
+    def _cmd_status(self, command):
+        return {
+            "warm": self.warm.is_set(),
+            "running": self._session_running(),
+            "output_file": self.translator.output_file if self.translator else None
+        }
+    
+    def _cmd_shutdown(self, command):
+        if self._session_running():
+            self.translator.is_listening = False
+            self.session_thread.join(timeout=10)
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return {}
+    
+    def serve(self):
+        self.server = _DaemonServer(("127.0.0.1", self.port), _ClientHandler)
+        self.server.daemon = self
+        self.console = sys.stdout
+        sys.stdout = _BroadcastStdout(self, self.console)
+        
+        # Announce the port first so the GUI can connect while we warm up
+        print(f"🟢 BACKEND_READY port {self.port}")
+        sys.stdout.flush()
+        threading.Thread(target=self.warm_up, name="daemon-warmup", daemon=True).start()
+        
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if self.translator is not None:
+                self.translator.cleanup()
+        return 0
+
+
+def run_daemon(argv):
+    # --profile samples the backend from warm-up until shutdown (or the GUI's profile toggle)
+    profile = "--profile" in argv
+    argv = [arg for arg in argv if arg != "--profile"]
+    port = int(argv[0]) if argv else DEFAULT_DAEMON_PORT
+    standalone_script = "standalone_translator.py"
+    if not os.path.exists(standalone_script):
+        print(f"❌ Standalone translator not found: {standalone_script}")
+        return 1
+    sys.path.insert(0, os.path.dirname(os.path.abspath(standalone_script)))
+    
+    print(f"🚀 GUI Backend daemon starting on 127.0.0.1:{port}")
+    sys.stdout.flush()
+    try:
+        return BackendDaemon(port, profile).serve()
+    except KeyboardInterrupt:
+        print("\n🛑 GUI Backend daemon stopped by user")
+        sys.stdout.flush()
+        return 0
+    except OSError as e:
+        print(f"❌ Failed to start backend daemon: {e}")
+        sys.stdout.flush()
+        return 1
 
 def main():
-    source_lang = sys.argv[1] if len(sys.argv) > 1 else "it"
-    target_lang = sys.argv[2] if len(sys.argv) > 2 else "en"
-    output_folder = sys.argv[3] if len(sys.argv) > 3 else ""
+    if len(sys.argv) > 1 and sys.argv[1] == "--daemon":
+        return run_daemon(sys.argv[2:])
+    
+    profile = "--profile" in sys.argv
+    argv = [arg for arg in sys.argv if arg != "--profile"]
+    source_lang = argv[1] if len(argv) > 1 else "it"
+    target_lang = argv[2] if len(argv) > 2 else "en"
+    output_folder = argv[3] if len(argv) > 3 else ""
     
     print(f"🚀 GUI Backend starting: {source_lang} → {target_lang}")
     if output_folder:
@@ -26,37 +361,22 @@ def main():
     print(f"✅ Found standalone translator: {standalone_script}")
     sys.stdout.flush()
     
-    # Run the standalone translator with real-time output
+    # Run the standalone translator in this interpreter rather than a child
+    # process, so Python only starts (and imports its dependencies) once
     try:
-        # Pass through any arguments including output folder
-        cmd = [sys.executable, standalone_script, source_lang, target_lang]
+        args = [source_lang, target_lang]
         if output_folder:
-            cmd.append(output_folder)
+            args.append(output_folder)
+        if profile:
+            args.append("--profile")
             
-        print(f"▶️  Running: {' '.join(cmd)}")
+        print(f"▶️  Running: {standalone_script} {' '.join(args)}")
         sys.stdout.flush()
         
-        # Run the process with real-time output
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1,  # Line buffered
-            encoding='utf-8',
-            errors='replace'
-        )
-        
-        # Read output line by line in real-time
-        while True:
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                print(output.strip())
-                sys.stdout.flush()
+        sys.path.insert(0, os.path.dirname(os.path.abspath(standalone_script)))
+        import standalone_translator
         
-        return process.returncode
+        return standalone_translator.main(args) or 0
         
     except KeyboardInterrupt:
         print("\n🛑 GUI Backend stopped by user")
@@ -7,7 +7,6 @@
 #include <QStandardPaths>
 #include <QStyleFactory>
 #include <QFile>           
-#include <QTextCursor>     
 #include <QIcon>           
 #include <QGroupBox>       
 #include <QVBoxLayout>     // ADD THIS
@@ -15,7 +14,9 @@
 #include <QLabel>          // ADD THIS
 #include <QPushButton>     // ADD THIS
 #include <QProgressBar>    // ADD THIS
-#include <QTextEdit>       // ADD THIS
+#include <QListView>
+#include <QScrollBar>
+#include <QTimer>
 #include <QComboBox>       // ADD THIS
 #include <QSystemTrayIcon> // ADD THIS
 #include <QMenu>           // ADD THIS
@@ -23,6 +24,10 @@
 #include <QCloseEvent>     // ADD THIS
 #include <QFileDialog>
 #include <QMessageBox>
+#include <QHostAddress>
+#include <QJsonDocument>
+#include <QJsonArray>
+#include <QSignalBlocker>
 
 MainWindow::MainWindow(QWidget *parent)
     : QMainWindow(parent), 
@@ -34,19 +39,26 @@ MainWindow::MainWindow(QWidget *parent)
       startButton(nullptr),
       stopButton(nullptr),
       settingsButton(nullptr),
-      outputText(nullptr),
+      outputView(nullptr),
+      transcriptModel(nullptr),
+      scrollTimer(nullptr),
+      followOutput(true),
       statusLabel(nullptr),
+      liveStatusLabel(nullptr),
       languageLabel(nullptr),
       progressBar(nullptr),
       sourceLanguageCombo(nullptr),
       targetLanguageCombo(nullptr),
       outputFolder(""),
       outputFolderLabel(nullptr),
-      folderButton(nullptr)
+      folderButton(nullptr),
+      backendSocket(nullptr),
+      backendPort(47610)
 {
     // Initialize QProcess first
     pythonProcess = new QProcess(this);
     pythonProcess->setProcessChannelMode(QProcess::MergedChannels);
+    backendSocket = new QTcpSocket(this);
     
     settings = new QSettings("Michael7664", "RealTimeTranslator", this);
     
@@ -55,6 +67,9 @@ MainWindow::MainWindow(QWidget *parent)
     setupTrayIcon();
     loadSettings();
     
+    // Warm the backend while the user is still choosing languages
+    startBackendDaemon();
+    
     setWindowTitle("Real-Time Translator");
     setMinimumSize(900, 700);
     
@@ -110,6 +125,7 @@ void MainWindow::setupUI()
     sourceLanguageCombo->addItem("Portuguese", "pt");
     sourceLanguageCombo->addItem("Arabic", "ar");
     sourceLanguageCombo->addItem("Hindi", "hi");
+    sourceLanguageCombo->addItem("Auto-detect", "auto");
     
     QLabel *targetLabel = new QLabel("to:");
     targetLanguageCombo = new QComboBox();
@@ -137,6 +153,10 @@ void MainWindow::setupUI()
     startButton = new QPushButton("🎤 Start Translation");
     stopButton = new QPushButton("⏹ Stop Translation");
     settingsButton = new QPushButton("⚙ Settings");
+    // Sampling profiler in the backend; can be switched on and off mid-session
+    profileButton = new QPushButton("🔬 Profile");
+    profileButton->setCheckable(true);
+    profileButton->setToolTip("Sample the backend threads; unchecking writes a flamegraph-ready profile to the output folder");
     
     startButton->setStyleSheet("QPushButton { background-color: #27ae60; color: white; font-weight: bold; padding: 10px 20px; border-radius: 5px; }");
     stopButton->setStyleSheet("QPushButton { background-color: #e74c3c; color: white; font-weight: bold; padding: 10px 20px; border-radius: 5px; }");
@@ -147,6 +167,7 @@ void MainWindow::setupUI()
     controlLayout->addWidget(startButton);
     controlLayout->addWidget(stopButton);
     controlLayout->addWidget(settingsButton);
+    controlLayout->addWidget(profileButton);
     controlLayout->addStretch();
     
     // Status Panel
@@ -159,6 +180,11 @@ void MainWindow::setupUI()
     languageLabel = new QLabel();
     languageLabel->setStyleSheet("color: #7f8c8d; padding: 5px;");
     
+    // Frequent backend status (audio buffer, queue) is updated here in place
+    // instead of being appended to the transcript
+    liveStatusLabel = new QLabel();
+    liveStatusLabel->setStyleSheet("color: #7f8c8d; font-family: 'Courier New'; padding: 5px;");
+    
     progressBar = new QProgressBar();
     progressBar->setRange(0, 0); // Indeterminate progress
     progressBar->setVisible(false);
@@ -166,18 +192,41 @@ void MainWindow::setupUI()
     
     statusLayout->addWidget(statusLabel);
     statusLayout->addWidget(languageLabel);
+    statusLayout->addWidget(liveStatusLabel);
     statusLayout->addWidget(progressBar);
     
     // Output Panel
     QGroupBox *outputGroup = new QGroupBox("Live Translations");
     QVBoxLayout *outputLayout = new QVBoxLayout(outputGroup);
     
-    outputText = new QTextEdit();
-    outputText->setReadOnly(true);
-    outputText->setPlaceholderText("Translations will appear here in real-time...\n\nInstructions:\n1. Select source and target languages\n2. Click 'Start Translation'\n3. Ensure audio is playing through speakers\n4. Translations will appear automatically");
-    outputText->setStyleSheet("QTextEdit { font-family: 'Courier New'; font-size: 12px; }");
+    // A bounded list model instead of a growing rich-text document: appending
+    // a line stays cheap however long the session runs
+    transcriptModel = new TranscriptModel(5000, this);
+    outputView = new QListView();
+    outputView->setModel(transcriptModel);
+    outputView->setUniformItemSizes(false);
+    outputView->setWordWrap(true);
+    outputView->setLayoutMode(QListView::Batched);
+    outputView->setBatchSize(200);
+    outputView->setSelectionMode(QAbstractItemView::ExtendedSelection);
+    outputView->setEditTriggers(QAbstractItemView::NoEditTriggers);
+    outputView->setVerticalScrollMode(QAbstractItemView::ScrollPerPixel);
+    outputView->setStyleSheet("QListView { font-family: 'Courier New'; font-size: 12px; }");
+    
+    // Follow new lines only while the user is at the bottom, and scroll at
+    // most once per burst of messages
+    scrollTimer = new QTimer(this);
+    scrollTimer->setSingleShot(true);
+    scrollTimer->setInterval(50);
+    connect(scrollTimer, &QTimer::timeout, outputView, &QListView::scrollToBottom);
+    connect(outputView->verticalScrollBar(), &QScrollBar::valueChanged, this, [this](int value) {
+        followOutput = value >= outputView->verticalScrollBar()->maximum() - 4;
+    });
+    
+    transcriptModel->appendEntry(TranscriptModel::Debug, "Translations will appear here in real-time...");
+    transcriptModel->appendEntry(TranscriptModel::Debug, "Instructions: 1. Select source and target languages  2. Click 'Start Translation'  3. Ensure audio is playing through speakers  4. Translations will appear automatically");
     
-    outputLayout->addWidget(outputText);
+    outputLayout->addWidget(outputView);
     
     // Assemble main layout
     mainLayout->addWidget(languageGroup);
@@ -191,17 +240,23 @@ void MainWindow::setupConnections()
     connect(startButton, &QPushButton::clicked, this, &MainWindow::startTranslation);
     connect(stopButton, &QPushButton::clicked, this, &MainWindow::stopTranslation);
     connect(settingsButton, &QPushButton::clicked, this, &MainWindow::showSettings);
+    connect(profileButton, &QPushButton::toggled, this, &MainWindow::toggleProfiling);
     connect(folderButton, &QPushButton::clicked, this, &MainWindow::selectOutputFolder);
     connect(pythonProcess, &QProcess::readyReadStandardOutput, this, &MainWindow::updateOutput);
+    connect(pythonProcess, &QProcess::started, this, &MainWindow::processStarted);
     connect(pythonProcess, &QProcess::finished, this, &MainWindow::processFinished);
     connect(pythonProcess, &QProcess::errorOccurred, this, &MainWindow::processErrorOccurred);
+    connect(backendSocket, &QTcpSocket::connected, this, &MainWindow::backendConnected);
+    connect(backendSocket, &QTcpSocket::readyRead, this, &MainWindow::backendReadyRead);
     
-    // Update language display when selection changes
+    // Update language display when selection changes; a running session switches without a restart
     connect(sourceLanguageCombo, QOverload<int>::of(&QComboBox::currentIndexChanged), this, [this]() {
         updateLanguageDisplay();
+        sendLanguageChange();
     });
     connect(targetLanguageCombo, QOverload<int>::of(&QComboBox::currentIndexChanged), this, [this]() {
         updateLanguageDisplay();
+        sendLanguageChange();
     });
 }
 
@@ -287,7 +342,7 @@ void MainWindow::selectOutputFolder()
         updateOutputFolderDisplay();
         saveSettings();
         
-        outputText->append("<span style='color: green;'>✓ Output folder set to: " + outputFolder + "</span>");
+        appendLog(TranscriptModel::Success, "✓ Output folder set to: " + outputFolder);
     }
 }
 
@@ -308,93 +363,219 @@ void MainWindow::updateOutputFolderDisplay()
     }
 }
 
-void MainWindow::startTranslation()
+void MainWindow::startBackendDaemon()
 {
-    if (isRunning) return;
-    
-    outputText->clear();
-    outputText->append("<span style='color: green;'>[DEBUG] Starting translation process...</span>");
+    if (pythonProcess->state() != QProcess::NotRunning) return;
     
     // Use the GUI backend
     QString pythonBridge = QApplication::applicationDirPath() + "/gui_backend.py";
     
-    outputText->append("Looking for: " + pythonBridge);
-    outputText->append("Application dir: " + QApplication::applicationDirPath());
-    
     if (!QFile::exists(pythonBridge)) {
-        outputText->append("<span style='color: red;'>ERROR: GUI bridge not found at: " + pythonBridge + "</span>");
+        appendLog(TranscriptModel::Error, "ERROR: GUI bridge not found at: " + pythonBridge);
         return;
     }
     
+    // The daemon stays up for the lifetime of the window; Start/Stop and
+    // language changes are commands sent to it over a local socket
+    QStringList arguments;
+    arguments << pythonBridge << "--daemon" << QString::number(backendPort);
+    
+    // Set working directory to build directory
+    pythonProcess->setWorkingDirectory(QApplication::applicationDirPath());
+    
+    QProcessEnvironment env = QProcessEnvironment::systemEnvironment();
+    env.insert("PYTHONUNBUFFERED", "1");
+    pythonProcess->setProcessEnvironment(env);
+    
+    statusLabel->setText("Starting translation backend...");
+    pythonProcess->start("python", arguments);
+}
+
+void MainWindow::connectToBackend()
+{
+    if (backendSocket->state() != QAbstractSocket::UnconnectedState) return;
+    backendSocket->connectToHost(QHostAddress::LocalHost, backendPort);
+}
+
+void MainWindow::sendBackendCommand(const QJsonObject &command)
+{
+    backendSocket->write(QJsonDocument(command).toJson(QJsonDocument::Compact) + "\n");
+}
+
+void MainWindow::startTranslation()
+{
+    if (isRunning) return;
+    
+    transcriptModel->clear();
+    liveStatusLabel->clear();
+    followOutput = true;
+    appendLog(TranscriptModel::Success, "[DEBUG] Starting translation process...");
+    
     // Get selected languages
     QString sourceLang = sourceLanguageCombo->currentData().toString();
     QString targetLang = targetLanguageCombo->currentData().toString();
     
-    outputText->append("Starting translation: " + sourceLang + " → " + targetLang);
+    appendLog(TranscriptModel::Info, "Starting translation: " + sourceLang + " → " + targetLang);
     
     // Show output folder info
     if (outputFolder.isEmpty()) {
-        outputText->append("<span style='color: orange;'>Using default output location</span>");
+        appendLog(TranscriptModel::Warning, "Using default output location");
     } else {
-        outputText->append("<span style='color: green;'>Output folder: " + outputFolder + "</span>");
+        appendLog(TranscriptModel::Success, "Output folder: " + outputFolder);
     }
     
     statusLabel->setText("Starting translation...");
     progressBar->setVisible(true);
-    
-    // Start Python process with language arguments AND output folder
-    QStringList arguments;
-    arguments << pythonBridge << sourceLang << targetLang;
-    
-    // Add output folder as argument if specified
-    if (!outputFolder.isEmpty()) {
-        arguments << outputFolder;
+    startButton->setEnabled(false);
+    
+    // The click time lets the backend report Start → first audio frame
+    QJsonObject command;
+    command["cmd"] = "start";
+    command["source"] = sourceLang;
+    command["target"] = targetLang;
+    command["output_folder"] = outputFolder;
+    command["launch_epoch_ms"] = QString::number(QDateTime::currentMSecsSinceEpoch());
+    
+    if (backendSocket->state() == QAbstractSocket::ConnectedState) {
+        sendBackendCommand(command);
+    } else {
+        // Sent as soon as the backend accepts our connection
+        pendingStartCommand = command;
+        appendLog(TranscriptModel::Warning, "Backend is still starting, translation will begin when it is ready");
+        startBackendDaemon();
+        connectToBackend();
     }
+}
+
+void MainWindow::processStarted()
+{
+    appendLog(TranscriptModel::Success, "✓ Python backend started successfully");
+}
+
+void MainWindow::backendConnected()
+{
+    statusLabel->setText(isRunning ? "Translation running..." : "Ready to start translation");
     
-    // Set working directory to build directory
-    pythonProcess->setWorkingDirectory(QApplication::applicationDirPath());
-    
-    outputText->append("Starting Python process: python " + arguments.join(" "));
+    if (!pendingStartCommand.isEmpty()) {
+        sendBackendCommand(pendingStartCommand);
+        pendingStartCommand = QJsonObject();
+    }
+}
+
+void MainWindow::backendReadyRead()
+{
+    backendBuffer += backendSocket->readAll();
     
-    pythonProcess->start("python", arguments);
+    int newline;
+    while ((newline = backendBuffer.indexOf('\n')) >= 0) {
+        QByteArray raw = backendBuffer.left(newline);
+        backendBuffer.remove(0, newline + 1);
+        
+        QJsonObject message = QJsonDocument::fromJson(raw).object();
+        QString type = message.value("type").toString();
+        if (type == "log") {
+            handleBackendLine(message.value("text").toString());
+        } else if (type == "caption") {
+            handleCaption(message);
+        } else if (type == "revision") {
+            // A second recognition pass corrected an earlier segment
+            appendLog(TranscriptModel::Revision, message.value("text").toString());
+        } else if (type == "status") {
+            liveStatusLabel->setText(message.value("text").toString());
+            if (message.contains("running") && !message.value("running").toBool() && isRunning) {
+                // The session ended on the backend side (stop, end of input or a crash)
+                setRunningState(false);
+                QString error = message.value("error").toString();
+                if (!error.isEmpty()) {
+                    appendLog(TranscriptModel::Error, "Translation session failed: " + error);
+                    statusLabel->setText("Translation stopped with an error");
+                } else {
+                    statusLabel->setText("Ready to start translation");
+                }
+            }
+        } else if (type == "reply") {
+            handleBackendReply(message);
+        }
+    }
+}
+
+void MainWindow::handleBackendReply(const QJsonObject &reply)
+{
+    QString cmd = reply.value("cmd").toString();
+    QString elapsed = QString::number(reply.value("elapsed_ms").toDouble(), 'f', 1);
+    
+    if (!reply.value("ok").toBool()) {
+        appendLog(TranscriptModel::Error, "Backend " + cmd + " failed: " + reply.value("error").toString());
+        if (cmd == "start") {
+            setRunningState(false);
+            statusLabel->setText("Failed to start");
+        }
+        return;
+    }
     
-    if (pythonProcess->waitForStarted(5000)) {
-        isRunning = true;
-        startButton->setEnabled(false);
-        stopButton->setEnabled(true);
-        settingsButton->setEnabled(false);
+    if (cmd == "start") {
+        setRunningState(true);
         statusLabel->setText("Translation running...");
-        
-        outputText->append("<span style='color: green;'>✓ Python backend started successfully</span>");
-    } else {
-        QString error = "Failed to start Python backend!\n";
-        error += "Process error: " + QString::number(pythonProcess->error()) + "\n";
-        error += "Error: " + pythonProcess->errorString();
-        
-        outputText->append("<span style='color: red;'>" + error + "</span>");
-        QMessageBox::critical(this, "Error", error);
-        statusLabel->setText("Failed to start");
-        progressBar->setVisible(false);
+        appendLog(TranscriptModel::Success, "✓ Translation started in " + elapsed + " ms");
+    } else if (cmd == "set_languages") {
+        appendLog(TranscriptModel::Success, "✓ Language change accepted in " + elapsed + " ms (applies at the next segment)");
+    } else if (cmd == "profile") {
+        QJsonArray files = reply.value("files").toArray();
+        if (reply.value("enabled").toBool()) {
+            appendLog(TranscriptModel::Info, "🔬 Profiling backend threads");
+        } else if (!files.isEmpty()) {
+            appendLog(TranscriptModel::Success, "✓ Profile saved: " + files.first().toString());
+        }
     }
 }
 
+void MainWindow::toggleProfiling(bool enabled)
+{
+    if (backendSocket->state() != QAbstractSocket::ConnectedState) {
+        appendLog(TranscriptModel::Warning, "Backend not connected - profiling unavailable");
+        QSignalBlocker blocker(profileButton);
+        profileButton->setChecked(false);
+        return;
+    }
+    
+    QJsonObject command;
+    command["cmd"] = "profile";
+    command["enabled"] = enabled;
+    sendBackendCommand(command);
+}
+
+void MainWindow::setRunningState(bool running)
+{
+    isRunning = running;
+    startButton->setEnabled(!running);
+    stopButton->setEnabled(running);
+    settingsButton->setEnabled(!running);
+    progressBar->setVisible(running);
+}
+
+void MainWindow::sendLanguageChange()
+{
+    if (!isRunning || backendSocket->state() != QAbstractSocket::ConnectedState) return;
+    
+    QJsonObject command;
+    command["cmd"] = "set_languages";
+    command["source"] = sourceLanguageCombo->currentData().toString();
+    command["target"] = targetLanguageCombo->currentData().toString();
+    sendBackendCommand(command);
+}
+
 void MainWindow::stopTranslation()
 {
     if (!isRunning) return;
     
-    pythonProcess->terminate();
-    if (!pythonProcess->waitForFinished(5000)) {
-        pythonProcess->kill();
-    }
+    QJsonObject command;
+    command["cmd"] = "stop";
+    sendBackendCommand(command);
     
-    isRunning = false;
-    startButton->setEnabled(true);
-    stopButton->setEnabled(false);
-    settingsButton->setEnabled(true);
-    progressBar->setVisible(false);
+    setRunningState(false);
     statusLabel->setText("Translation stopped");
     
-    outputText->append("[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] Translation stopped");
+    appendLog(TranscriptModel::Info, "Translation stopped");
 }
 
 void MainWindow::showSettings()
@@ -406,87 +587,124 @@ void MainWindow::showSettings()
 void MainWindow::updateOutput()
 {
     if (!pythonProcess) {
-        outputText->append("<span style='color: red;'>[ERROR] pythonProcess is null!</span>");
+        appendLog(TranscriptModel::Error, "[ERROR] pythonProcess is null!");
         return;
     }
     
     QByteArray output = pythonProcess->readAllStandardOutput();
     QString outputTextStr = QString::fromLocal8Bit(output);
     
-    // Debug: show raw output
-    if (!outputTextStr.isEmpty()) {
-        outputText->append("<span style='color: gray;'>[RAW] " + outputTextStr + "</span>");
-    }
-    
     QStringList lines = outputTextStr.split('\n');
     for (const QString &line : lines) {
-        if (!line.trimmed().isEmpty()) {
-            // Parse different message types for color coding and display
-            if (line.contains("🚀") || line.contains("Starting") || line.contains("initialized")) {
-                outputText->append("<span style='color: green;'>[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] " + line + "</span>");
-            } 
-            else if (line.contains("🔊 RECOGNIZED_ITALIAN:")) {
-                QString recognized = line.mid(line.indexOf("RECOGNIZED_ITALIAN:") + 20);
-                outputText->append("<span style='color: blue; font-weight: bold;'>[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] 🔊 Italian: " + recognized + "</span>");
-            }
-            else if (line.contains("🌐 TRANSLATED_ENGLISH:")) {
-                QString translated = line.mid(line.indexOf("TRANSLATED_ENGLISH:") + 20);
-                outputText->append("<span style='color: green; font-weight: bold;'>[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] 🌐 English: " + translated + "</span>");
-                
-                // Also update the status with the latest translation
-                statusLabel->setText("Last: " + translated);
-            }
-            else if (line.contains("❌") || line.contains("ERROR")) {
-                outputText->append("<span style='color: red;'>[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] " + line + "</span>");
-            }
-            else if (line.contains("🔇") || line.contains("No speech")) {
-                outputText->append("<span style='color: orange;'>[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] " + line + "</span>");
-            }
-            else if (line.contains("📊") || line.contains("Audio buffer")) {
-                // Show audio level in status
-                statusLabel->setText(line);
-            }
-            else if (line.contains("🔍") || line.contains("Attempting")) {
-                outputText->append("<span style='color: purple;'>[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] " + line + "</span>");
-            }
-            else if (line.contains("🔄") || line.contains("Translating")) {
-                outputText->append("<span style='color: teal;'>[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] " + line + "</span>");
-            }
-            else if (line.contains("⚠️") || line.contains("No audio")) {
-                outputText->append("<span style='color: orange; font-weight: bold;'>[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] " + line + "</span>");
-            }
-            else {
-                outputText->append("[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] " + line);
-            }
-            
-            // Auto-scroll to bottom
-            QTextCursor cursor = outputText->textCursor();
-            cursor.movePosition(QTextCursor::End);
-            outputText->setTextCursor(cursor);
-            
-            // Ensure the text edit updates
-            outputText->repaint();
-            
-            // Force GUI update
-            QApplication::processEvents();
+        if (line.contains("BACKEND_READY")) {
+            connectToBackend();
         }
+        handleBackendLine(line);
+    }
+}
+
+void MainWindow::appendLog(TranscriptModel::Kind kind, const QString &text)
+{
+    transcriptModel->appendEntry(kind, text);
+    if (followOutput && !scrollTimer->isActive()) {
+        scrollTimer->start();
+    }
+}
+
+QString MainWindow::languageName(const QString &code) const
+{
+    int index = sourceLanguageCombo->findData(code);
+    if (index >= 0) return sourceLanguageCombo->itemText(index);
+    index = targetLanguageCombo->findData(code);
+    if (index >= 0) return targetLanguageCombo->itemText(index);
+    return code.toUpper();
+}
+
+void MainWindow::handleCaption(const QJsonObject &event)
+{
+    QString caption = event.value("caption").toString();
+    QString language = languageName(event.value("lang").toString());
+    
+    if (event.value("stage").toString() == "recognized") {
+        appendLog(TranscriptModel::Recognized, "🔊 " + language + ": " + caption);
+    } else {
+        appendLog(TranscriptModel::Translated, "🌐 " + language + ": " + caption);
+        
+        // Also update the status with the latest translation
+        statusLabel->setText("Last: " + caption);
+    }
+}
+
+void MainWindow::handleBackendLine(const QString &line)
+{
+    if (line.trimmed().isEmpty()) return;
+    
+    // Parse different message types for color coding and display
+    if (line.contains("🚀") || line.contains("Starting") || line.contains("initialized")) {
+        appendLog(TranscriptModel::Success, line);
+    }
+    else if (line.contains("🔊 RECOGNIZED_")) {
+        QString lang = line.section("RECOGNIZED_", 1).section(':', 0, 0).toLower();
+        QJsonObject event{{"stage", "recognized"}, {"lang", lang}, {"caption", line.section(": ", 1).trimmed()}};
+        handleCaption(event);
+    }
+    else if (line.contains("🌐 TRANSLATED_")) {
+        QString lang = line.section("TRANSLATED_", 1).section(':', 0, 0).toLower();
+        QJsonObject event{{"stage", "translated"}, {"lang", lang}, {"caption", line.section(": ", 1).trimmed()}};
+        handleCaption(event);
+    }
+    else if (line.contains("✏️ REVISED")) {
+        appendLog(TranscriptModel::Revision, line);
+    }
+    else if (line.contains("❌") || line.contains("ERROR")) {
+        appendLog(TranscriptModel::Error, line);
+    }
+    else if (line.contains("🔇") || line.contains("No speech")) {
+        appendLog(TranscriptModel::Warning, line);
+    }
+    else if (line.contains("⏱️ FIRST_FRAME:")) {
+        QString firstFrame = line.mid(line.indexOf("FIRST_FRAME:") + 13);
+        appendLog(TranscriptModel::Timing, "⏱️ First audio frame " + firstFrame);
+        statusLabel->setText("Listening (first audio frame " + firstFrame + ")");
+    }
+    else if (line.contains("🧭")) {
+        appendLog(TranscriptModel::Debug, line);
+    }
+    else if (line.contains("🌍")) {
+        appendLog(TranscriptModel::Language, line);
+    }
+    else if (line.contains("⏱️")) {
+        appendLog(TranscriptModel::Timing, line);
+    }
+    else if (line.contains("📊") || line.contains("Audio buffer")) {
+        // Status lines replace each other rather than filling the transcript
+        liveStatusLabel->setText(line);
+    }
+    else if (line.contains("🔍") || line.contains("Attempting")) {
+        appendLog(TranscriptModel::Debug, line);
+    }
+    else if (line.contains("🔄") || line.contains("Translating")) {
+        appendLog(TranscriptModel::Debug, line);
+    }
+    else if (line.contains("⚠️") || line.contains("No audio")) {
+        appendLog(TranscriptModel::Warning, line);
+    }
+    else {
+        appendLog(TranscriptModel::Info, line);
     }
 }
 
 void MainWindow::processFinished(int exitCode, QProcess::ExitStatus exitStatus)
 {
-    isRunning = false;
-    startButton->setEnabled(true);
-    stopButton->setEnabled(false);
-    settingsButton->setEnabled(true);
-    progressBar->setVisible(false);
+    setRunningState(false);
+    pendingStartCommand = QJsonObject();
     
     if (exitStatus == QProcess::NormalExit) {
-        statusLabel->setText("Translation completed successfully");
-        outputText->append("[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] Translation completed");
+        statusLabel->setText("Translation backend exited");
+        appendLog(TranscriptModel::Info, "Backend exited");
     } else {
-        statusLabel->setText("Translation process ended");
-        outputText->append("[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] Process ended with code: " + QString::number(exitCode));
+        statusLabel->setText("Translation backend ended");
+        appendLog(TranscriptModel::Info, "Process ended with code: " + QString::number(exitCode));
     }
 }
 
@@ -494,7 +712,12 @@ void MainWindow::processErrorOccurred(QProcess::ProcessError error)
 {
     QString errorText;
     switch (error) {
-        case QProcess::FailedToStart: errorText = "Failed to start"; break;
+        case QProcess::FailedToStart:
+            errorText = "Failed to start";
+            setRunningState(false);
+            pendingStartCommand = QJsonObject();
+            QMessageBox::critical(this, "Error", "Failed to start Python backend!\nError: " + pythonProcess->errorString());
+            break;
         case QProcess::Crashed: errorText = "Crashed"; break;
         case QProcess::Timedout: errorText = "Timed out"; break;
         case QProcess::WriteError: errorText = "Write error"; break;
@@ -503,7 +726,7 @@ void MainWindow::processErrorOccurred(QProcess::ProcessError error)
     }
     
     statusLabel->setText("Process error: " + errorText);
-    outputText->append("[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] Error: " + errorText);
+    appendLog(TranscriptModel::Error, "Error: " + errorText);
 }
 
 void MainWindow::trayIconActivated(QSystemTrayIcon::ActivationReason reason)
@@ -553,4 +776,14 @@ MainWindow::~MainWindow()
     if (isRunning) {
         stopTranslation();
     }
+    
+    if (backendSocket->state() == QAbstractSocket::ConnectedState) {
+        QJsonObject command;
+        command["cmd"] = "shutdown";
+        sendBackendCommand(command);
+        backendSocket->waitForBytesWritten(1000);
+    }
+    if (pythonProcess->state() != QProcess::NotRunning && !pythonProcess->waitForFinished(5000)) {
+        pythonProcess->kill();
+    }
 }
\ No newline at end of file
@@ -3,7 +3,8 @@
 
 #include <QMainWindow>
 #include <QPushButton>
-#include <QTextEdit>
+#include <QListView>
+#include <QTimer>
 #include <QLabel>
 #include <QProgressBar>
 #include <QProcess>
@@ -16,9 +17,12 @@
 #include <QMenu>
 #include <QAction>
 #include <QCloseEvent>
+#include <QTcpSocket>
+#include <QJsonObject>
 
 // Include SettingsDialog directly instead of forward declaration
 #include "SettingsDialog.h"
+#include "TranscriptModel.h"
 
 class MainWindow : public QMainWindow
 {
@@ -35,7 +39,11 @@ private slots:
     void startTranslation();
     void stopTranslation();
     void showSettings();
+    void toggleProfiling(bool enabled);
     void updateOutput();
+    void processStarted();
+    void backendConnected();
+    void backendReadyRead();
     void processFinished(int exitCode, QProcess::ExitStatus exitStatus);
     void processErrorOccurred(QProcess::ProcessError error);
     void trayIconActivated(QSystemTrayIcon::ActivationReason reason);
@@ -51,13 +59,28 @@ private:
     void loadSettings();
     void saveSettings();
     void updateLanguageDisplay();
+    void startBackendDaemon();
+    void connectToBackend();
+    void sendBackendCommand(const QJsonObject &command);
+    void sendLanguageChange();
+    void handleBackendLine(const QString &line);
+    void handleCaption(const QJsonObject &event);
+    void appendLog(TranscriptModel::Kind kind, const QString &text);
+    QString languageName(const QString &code) const;
+    void handleBackendReply(const QJsonObject &reply);
+    void setRunningState(bool running);
     
     // UI Components
     QPushButton *startButton;
     QPushButton *stopButton;
     QPushButton *settingsButton;
-    QTextEdit *outputText;
+    QPushButton *profileButton;
+    QListView *outputView;
+    TranscriptModel *transcriptModel;
+    QTimer *scrollTimer;
+    bool followOutput;
     QLabel *statusLabel;
+    QLabel *liveStatusLabel;
     QLabel *languageLabel;
     QProgressBar *progressBar;
     QComboBox *sourceLanguageCombo;
@@ -71,6 +94,10 @@ private:
     // Backend
     QProcess *pythonProcess;
     bool isRunning;
+    QTcpSocket *backendSocket;
+    quint16 backendPort;
+    QByteArray backendBuffer;
+    QJsonObject pendingStartCommand;
     
     // Settings
     QSettings *settings;
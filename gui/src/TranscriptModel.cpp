@@ -0,0 +1,81 @@
+#include "TranscriptModel.h"
+#include <QBrush>
+#include <QColor>
+#include <QDateTime>
+#include <QFont>
+
+TranscriptModel::TranscriptModel(int maxEntries, QObject *parent)
+    : QAbstractListModel(parent),
+      maxEntries(maxEntries)
+{
+}
+
+int TranscriptModel::rowCount(const QModelIndex &parent) const
+{
+    return parent.isValid() ? 0 : static_cast<int>(entries.size());
+}
+
+QVariant TranscriptModel::data(const QModelIndex &index, int role) const
+{
+    if (!index.isValid() || index.row() >= static_cast<int>(entries.size())) return QVariant();
+
+    const Entry &entry = entries[index.row()];
+
+    if (role == Qt::DisplayRole) {
+        return entry.display;
+    }
+
+    if (role == Qt::ForegroundRole) {
+        switch (entry.kind) {
+            case Success:    return QBrush(QColor("green"));
+            case Warning:    return QBrush(QColor("orange"));
+            case Error:      return QBrush(QColor("red"));
+            case Recognized: return QBrush(QColor("blue"));
+            case Translated: return QBrush(QColor("green"));
+            case Revision:   return QBrush(QColor("purple"));
+            case Timing:     return QBrush(QColor("darkcyan"));
+            case Language:   return QBrush(QColor("darkblue"));
+            case Debug:      return QBrush(QColor("gray"));
+            default:         return QVariant();
+        }
+    }
+
+    if (role == Qt::FontRole && (entry.kind == Recognized || entry.kind == Translated || entry.kind == Revision || entry.kind == Language)) {
+        QFont font("Courier New");
+        font.setPixelSize(12);
+        font.setBold(true);
+        return font;
+    }
+
+    return QVariant();
+}
+
+void TranscriptModel::appendEntry(Kind kind, const QString &text)
+{
+    if (text.trimmed().isEmpty()) return;
+
+    int row = static_cast<int>(entries.size());
+    beginInsertRows(QModelIndex(), row, row);
+    entries.push_back({kind, "[" + QDateTime::currentDateTime().toString("hh:mm:ss") + "] " + text});
+    endInsertRows();
+
+    trim();
+}
+
+void TranscriptModel::clear()
+{
+    beginResetModel();
+    entries.clear();
+    endResetModel();
+}
+
+void TranscriptModel::trim()
+{
+    if (static_cast<int>(entries.size()) <= maxEntries) return;
+
+    // Drop the oldest tenth in one go so the view relayouts once, not per line
+    int count = static_cast<int>(entries.size()) - maxEntries + maxEntries / 10;
+    beginRemoveRows(QModelIndex(), 0, count - 1);
+    entries.erase(entries.begin(), entries.begin() + count);
+    endRemoveRows();
+}
@@ -0,0 +1,49 @@
+#ifndef TRANSCRIPTMODEL_H
+#define TRANSCRIPTMODEL_H
+
+#include <QAbstractListModel>
+#include <QString>
+#include <deque>
+
+// Bounded, append-only log of backend messages for the Live Translations view.
+// Rows are formatted once when appended; the view only lays out the rows that
+// are visible, so a long session costs the same per line as a short one.
+class TranscriptModel : public QAbstractListModel
+{
+    Q_OBJECT
+
+public:
+    enum Kind {
+        Info,
+        Success,
+        Warning,
+        Error,
+        Recognized,
+        Translated,
+        Revision,
+        Timing,
+        Language,
+        Debug
+    };
+
+    explicit TranscriptModel(int maxEntries = 5000, QObject *parent = nullptr);
+
+    int rowCount(const QModelIndex &parent = QModelIndex()) const override;
+    QVariant data(const QModelIndex &index, int role = Qt::DisplayRole) const override;
+
+    void appendEntry(Kind kind, const QString &text);
+    void clear();
+
+private:
+    struct Entry {
+        Kind kind;
+        QString display;
+    };
+
+    void trim();
+
+    std::deque<Entry> entries;
+    int maxEntries;
+};
+
+#endif // TRANSCRIPTMODEL_H
@@ -0,0 +1,262 @@
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+import metrics
+
+DROPPED_SAMPLES = metrics.DROPPED_SAMPLES
+
+# Encoders in order of preference for each requested format. soundfile and
+# ffmpeg are optional; WAV always works but is uncompressed.
+ENCODER_PREFERENCE = {
+    'flac': ['soundfile-flac', 'ffmpeg-flac', 'wav'],
+    'opus': ['ffmpeg-opus', 'soundfile-flac', 'ffmpeg-flac', 'wav'],
+}
+
+
+class _SoundFileEncoder:
+    extension = 'flac'
+
+    def __init__(self, path, sample_rate):
+        import numpy as np
+        import soundfile
+        self._np = np
+        self.file = soundfile.SoundFile(path, 'w', samplerate=sample_rate, channels=1,
+                                        format='FLAC', subtype='PCM_16')
+
+    def write(self, pcm):
+        self.file.write(self._np.frombuffer(pcm, dtype=self._np.int16))
+
+    def close(self):
+        self.file.close()
+
+
+class _FFmpegEncoder:
+    def __init__(self, path, sample_rate, codec):
+        self.extension = 'opus' if codec == 'opus' else 'flac'
+        codec_args = ['-c:a', 'libopus', '-b:a', '24k', '-application', 'voip'] if codec == 'opus' else ['-c:a', 'flac']
+        self.process = subprocess.Popen(
+            ['ffmpeg', '-loglevel', 'error', '-y', '-f', 's16le', '-ar', str(sample_rate), '-ac', '1',
+             '-i', '-', *codec_args, path],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def write(self, pcm):
+        self.process.stdin.write(pcm)
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+
+class _WaveEncoder:
+    extension = 'wav'
+
+    def __init__(self, path, sample_rate):
+        self.file = wave.open(path, 'wb')
+        self.file.setnchannels(1)
+        self.file.setsampwidth(2)
+        self.file.setframerate(sample_rate)
+
+    def write(self, pcm):
+        self.file.writeframes(pcm)
+
+    def close(self):
+        self.file.close()
+
+
+def _open_encoder(name, base_path, sample_rate):
+    """Create an encoder by name, or return None if its dependency is missing"""
+    if name == 'soundfile-flac':
+        try:
+            return _SoundFileEncoder(f"{base_path}.flac", sample_rate)
+        except (ImportError, OSError):
+            return None
+    if name.startswith('ffmpeg-'):
+        if not shutil.which('ffmpeg'):
+            return None
+        codec = name.split('-', 1)[1]
+        return _FFmpegEncoder(f"{base_path}.{'opus' if codec == 'opus' else 'flac'}", sample_rate, codec)
+    return _WaveEncoder(f"{base_path}.wav", sample_rate)
+
+
+class SessionArchiver:
+    """Compresses a session's 16 kHz mono PCM to disk on a background thread
+
+    `submit()` never blocks: chunks go into a bounded queue and, if the
+    encoder falls behind, are dropped and counted. Every chunk carries its
+    sample offset, and dropped stretches are written as silence, so sample
+    offsets in the transcript always point at the right place in the file.
+    """
+
+    def __init__(self, base_path, sample_rate=16000, fmt='flac', max_pending=256):
+        self.sample_rate = sample_rate
+        self.requested_format = fmt
+        self.encoder = None
+        self.encoder_name = None
+        for name in ENCODER_PREFERENCE.get(fmt, ENCODER_PREFERENCE['flac']):
+            self.encoder = _open_encoder(name, base_path, sample_rate)
+            if self.encoder is not None:
+                self.encoder_name = name
+                break
+        self.path = f"{base_path}.{self.encoder.extension}"
+        if self.encoder_name == 'wav':
+            print("⚠️  No FLAC/Opus encoder available (install soundfile or ffmpeg) - archiving uncompressed WAV")
+            sys.stdout.flush()
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._encode_loop, name="audio-archive", daemon=True)
+
+        # Producer-side counters (only touched by the thread calling submit)
+        self.samples_submitted = 0
+        self.dropped_chunks = 0
+        self.dropped_samples = 0
+        # Encoder-side counters
+        self.samples_written = 0
+        self.encode_ns = 0
+        self.error = None
+        self.closed = False
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, pcm):
+        """Queue one chunk of 16-bit PCM for encoding; returns its starting sample offset"""
+        offset = self.samples_submitted
+        self.samples_submitted += len(pcm) // 2
+        try:
+            self._queue.put_nowait((offset, pcm))
+        except queue.Full:
+            self.dropped_chunks += 1
+            self.dropped_samples += len(pcm) // 2
+            DROPPED_SAMPLES.inc(len(pcm) // 2, where="archive")
+        return offset
+
+    def _encode_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            offset, pcm = item
+            if self.error is not None:
+                continue
+            start = time.perf_counter_ns()
+            try:
+                gap = offset - self.samples_written
+                if gap > 0:
+                    # Keep the file aligned with transcript offsets across dropped chunks
+                    self.encoder.write(bytes(2 * gap))
+                    self.samples_written += gap
+                self.encoder.write(pcm)
+                self.samples_written += len(pcm) // 2
+            except Exception as e:
+                self.error = e
+                print(f"❌ Audio archive error: {e}")
+                sys.stdout.flush()
+            self.encode_ns += time.perf_counter_ns() - start
+
+    def close(self):
+        """Flush queued audio, finish the file and return a one-line report"""
+        if self.closed:
+            return self.report()
+        self.closed = True
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            if self.error is None and self.samples_submitted > self.samples_written:
+                # Chunks dropped at the very end leave a gap no later chunk fills
+                self.encoder.write(bytes(2 * (self.samples_submitted - self.samples_written)))
+                self.samples_written = self.samples_submitted
+            self.encoder.close()
+        except Exception as e:
+            print(f"❌ Audio archive error: {e}")
+        return self.report()
+
+    def report(self):
+        """One-line summary: archive path, duration, encoder and drops"""
+        seconds = self.samples_written / self.sample_rate
+        realtime = self.encode_ns / 1e9 / seconds if seconds else 0.0
+        return (f"Audio archive: {self.path} | {seconds:.1f}s via {self.encoder_name} | "
+                f"encode {100 * realtime:.2f}% of real time | "
+                f"dropped {self.dropped_chunks} chunks ({self.dropped_samples / self.sample_rate:.1f}s)")
+
+
+class ArchiveReader:
+    """Random access to an archived session's 16-bit mono PCM by sample range
+
+    WAV files are read directly and FLAC through soundfile when it is
+    installed; anything else (Opus, FLAC without soundfile) is decoded once
+    with ffmpeg into a temporary raw file that is memory-mapped. `read()` is
+    safe to call from several threads.
+    """
+
+    def __init__(self, path, sample_rate=16000):
+        self.path = path
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._wave = None
+        self._sound_file = None
+        self._raw = None
+        self._raw_path = None
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.wav':
+            self._wave = wave.open(path, 'rb')
+            self.sample_rate = self._wave.getframerate()
+            self.frames = self._wave.getnframes()
+            return
+        if extension == '.flac':
+            try:
+                import soundfile
+                self._sound_file = soundfile.SoundFile(path)
+                self.sample_rate = self._sound_file.samplerate
+                self.frames = self._sound_file.frames
+                return
+            except (ImportError, OSError):
+                pass
+        self._decode_with_ffmpeg()
+
+    def _decode_with_ffmpeg(self):
+        import numpy as np
+        if not shutil.which('ffmpeg'):
+            raise RuntimeError(f"Cannot decode {self.path}: install ffmpeg (or soundfile for FLAC)")
+        handle, self._raw_path = tempfile.mkstemp(suffix='.raw')
+        os.close(handle)
+        subprocess.run(['ffmpeg', '-loglevel', 'error', '-y', '-i', self.path, '-f', 's16le', '-ac', '1',
+                        '-ar', str(self.sample_rate), self._raw_path], check=True)
+        self.frames = os.path.getsize(self._raw_path) // 2
+        self._raw = np.memmap(self._raw_path, dtype=np.int16, mode='r') if self.frames else np.zeros(0, np.int16)
+
+    @property
+    def duration(self):
+        return self.frames / self.sample_rate
+
+    def read(self, start, end):
+        """PCM bytes for samples [start, end), clipped to the archive"""
+        start, end = max(0, start), min(end, self.frames)
+        if end <= start:
+            return b""
+        if self._raw is not None:
+            return self._raw[start:end].tobytes()
+        with self._lock:
+            if self._wave is not None:
+                self._wave.setpos(start)
+                return self._wave.readframes(end - start)
+            self._sound_file.seek(start)
+            return self._sound_file.read(end - start, dtype='int16').tobytes()
+
+    def close(self):
+        if self._wave is not None:
+            self._wave.close()
+        if self._sound_file is not None:
+            self._sound_file.close()
+        if self._raw_path is not None:
+            self._raw = None
+            os.remove(self._raw_path)
+            self._raw_path = None
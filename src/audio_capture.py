@@ -1,10 +1,23 @@
 import queue
 import sys
 
+from capture_monitor import CaptureMonitor
+
 try:
-    import sounddevice as sd
     import numpy as np
-    SOUNDDEVICE_AVAILABLE = True
+    from audio_preprocess import AudioPreprocessor
+    from capture_sources import MicrophoneSource, create_source
+    from noise_suppression import SpectralGate
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import sounddevice as sd
+    # The sounddevice path preprocesses blocks with numpy
+    SOUNDDEVICE_AVAILABLE = NUMPY_AVAILABLE
+    if not NUMPY_AVAILABLE:
+        print("numpy not available (sounddevice capture needs it), trying pyaudio...")
 except ImportError:
     SOUNDDEVICE_AVAILABLE = False
     print("sounddevice not available, trying pyaudio...")
@@ -18,14 +31,30 @@ if not SOUNDDEVICE_AVAILABLE:
         print("pyaudio not available either")
 
 class AudioCapture:
-    def __init__(self, rate=16000, chunk_size=1024, channels=1):
+    def __init__(self, rate=16000, chunk_size=1024, channels=1, native_format=True, agc=True, denoise=False,
+                 source='mic'):
         self.rate = rate
         self.chunk_size = chunk_size
         self.channels = channels
+        # With sounddevice, capture at the device's own rate/channels and
+        # convert to `rate` mono in a vectorized preprocessing stage
+        self.native_format = native_format
+        self.agc = agc
+        self.denoise = denoise
+        self.preprocessor = None
+        # 'mic', 'loopback' (system audio via PulseAudio/PipeWire) or a WAV/raw file path
+        self.source_spec = source or 'mic'
         self.audio_queue = queue.Queue()
         self.is_recording = False
+        # Overflows, callback jitter and effective rate of the running capture
+        self.monitor = None
         
-        if SOUNDDEVICE_AVAILABLE:
+        if self.source_spec != 'mic':
+            if not NUMPY_AVAILABLE:
+                raise ImportError("numpy is required for loopback and file capture")
+            self.capture_method = "source"
+            self.stream = None
+        elif SOUNDDEVICE_AVAILABLE:
             self.capture_method = "sounddevice"
             self.stream = None
         elif PYTHON_AUDIO_AVAILABLE:
@@ -38,27 +67,38 @@ class AudioCapture:
         print(f"Using audio capture method: {self.capture_method}")
         
     def start_capture(self):
-        """Start capturing audio from microphone"""
+        """Start capturing audio from the configured source"""
         self.is_recording = True
         
-        if self.capture_method == "sounddevice":
+        if self.capture_method in ("sounddevice", "source"):
+            if self.capture_method == "source":
+                source = create_source(self.source_spec)
+            elif self.native_format:
+                source = MicrophoneSource(sd, max_channels=max(self.channels, 2))
+            else:
+                source = MicrophoneSource(sd, samplerate=self.rate, channels=self.channels)
+            blocksize = max(256, source.samplerate * self.chunk_size // self.rate)
+            self.preprocessor = AudioPreprocessor(
+                source.samplerate, source.channels, self.rate, max_block=blocksize * 2, agc=self.agc,
+                denoiser=SpectralGate(self.rate) if self.denoise else None
+            )
+            self.monitor = CaptureMonitor(source.samplerate, self.rate, realtime=getattr(source, 'realtime', True))
+            
             def audio_callback(indata, frames, time, status):
                 """Callback for audio stream"""
                 if self.is_recording:
-                    # Convert numpy array to bytes
-                    audio_bytes = (indata * 32767).astype(np.int16).tobytes()
-                    self.audio_queue.put(audio_bytes)
+                    audio_bytes = self.preprocessor.process(indata)
+                    self.monitor.on_block(frames, status, len(audio_bytes) // 2 if audio_bytes else 0)
+                    if audio_bytes:
+                        self.audio_queue.put(audio_bytes)
             
-            self.stream = sd.InputStream(
-                samplerate=self.rate,
-                channels=self.channels,
-                callback=audio_callback,
-                blocksize=self.chunk_size,
-                dtype='float32'
-            )
-            self.stream.start()
+            source.start(audio_callback, blocksize)
+            self.stream = source
+            print(f"Capturing from {source.description} at {source.samplerate} Hz, "
+                  f"{source.channels} channel(s) -> {self.rate} Hz mono")
             
         elif self.capture_method == "pyaudio":
+            self.monitor = CaptureMonitor(self.rate, self.rate)
             self.audio_interface = pyaudio.PyAudio()
             self.audio_stream = self.audio_interface.open(
                 format=pyaudio.paInt16,
@@ -75,6 +115,8 @@ class AudioCapture:
     def _audio_callback(self, in_data, frame_count, time_info, status):
         """Callback for pyaudio stream"""
         if self.is_recording:
+            # pyaudio's status is the PortAudio flag word; overflow/underflow bits are counted
+            self.monitor.on_block(frame_count, status, len(in_data) // 2)
             self.audio_queue.put(in_data)
         return (in_data, pyaudio.paContinue)
     
@@ -88,13 +130,17 @@ class AudioCapture:
     def stop_capture(self):
         """Stop audio capture"""
         self.is_recording = False
-        if self.capture_method == "sounddevice" and self.stream:
+        if self.capture_method in ("sounddevice", "source") and self.stream:
             self.stream.stop()
             self.stream.close()
+            if self.preprocessor and self.preprocessor.denoiser:
+                print(self.preprocessor.denoiser.report())
         elif self.capture_method == "pyaudio":
             if self.audio_stream:
                 self.audio_stream.stop_stream()
                 self.audio_stream.close()
             if self.audio_interface:
                 self.audio_interface.terminate()
+        if self.monitor is not None:
+            print(self.monitor.report())
         print("Audio capture stopped.")
\ No newline at end of file
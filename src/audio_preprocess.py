@@ -0,0 +1,156 @@
+from math import gcd
+
+import numpy as np
+
+
+class PolyphaseResampler:
+    """Streaming rational resampler (up/down) using a windowed-sinc polyphase filter
+
+    Each output sample is a K-tap dot product against one phase of the
+    prototype filter; a whole block of outputs is computed at once with
+    NumPy fancy indexing. The last K-1 input samples are carried over
+    between blocks so block boundaries are seamless.
+
+    `taps_per_phase` is the length for a 1:1 cutoff; when downsampling it is
+    scaled by the decimation ratio, so the transition band stays the same
+    width relative to the output rate (72 taps at 48k→16k and 44.1k→16k).
+    """
+
+    def __init__(self, input_rate, output_rate, taps_per_phase=24, max_block=8192):
+        divisor = gcd(int(input_rate), int(output_rate))
+        self.up = int(output_rate) // divisor
+        self.down = int(input_rate) // divisor
+        taps_per_phase *= max(1, -(-self.down // self.up))
+        self.taps = taps_per_phase
+
+        # Prototype low-pass at the upsampled rate, cutoff at the lower Nyquist
+        length = self.up * taps_per_phase
+        cutoff = 1.0 / max(self.up, self.down)
+        n = np.arange(length) - (length - 1) / 2.0
+        prototype = cutoff * np.sinc(cutoff * n) * np.kaiser(length, 8.0) * self.up
+        # phases[p, k] = prototype[p + k * up]; reversed along k so a window
+        # x[i - K + 1 .. i] lines up with taps k = K-1 .. 0
+        self.phases = prototype.reshape(taps_per_phase, self.up).T[:, ::-1].astype(np.float32).copy()
+
+        # Input history plus room for the largest expected block
+        self.history = taps_per_phase - 1
+        self._buffer = np.zeros(self.history + max_block, dtype=np.float32)
+        self._offsets = np.arange(-self.history, 1)
+        self._next_t = self.history * self.up  # upsampled position of the next output
+        max_out = max_block * self.up // self.down + 2
+        self._out = np.empty(max_out, dtype=np.float32)
+
+    def _grow(self, frames):
+        buffer = np.zeros(self.history + frames, dtype=np.float32)
+        buffer[:self.history] = self._buffer[:self.history]
+        self._buffer = buffer
+        self._out = np.empty(frames * self.up // self.down + 2, dtype=np.float32)
+
+    def process(self, block):
+        """Resample a mono float32 block; returns a view into an internal output array"""
+        frames = len(block)
+        if self.up == self.down:
+            return block
+        if self.history + frames > len(self._buffer):
+            self._grow(frames)
+
+        end = self.history + frames
+        self._buffer[self.history:end] = block
+
+        # All output positions whose newest input sample is inside this buffer
+        last_t = (end - 1) * self.up
+        count = (last_t - self._next_t) // self.down + 1 if last_t >= self._next_t else 0
+        if count > 0:
+            t = self._next_t + self.down * np.arange(count)
+            index = t // self.up
+            phase = t % self.up
+            windows = self._buffer[index[:, None] + self._offsets]
+            out = self._out[:count]
+            np.einsum('ij,ij->i', windows, self.phases[phase], out=out)
+            self._next_t += self.down * count
+        else:
+            out = self._out[:0]
+
+        # Keep the last K-1 samples and rebase the output position
+        self._buffer[:self.history] = self._buffer[end - self.history:end]
+        self._next_t -= frames * self.up
+        return out
+
+
+class AudioPreprocessor:
+    """Converts native-rate, multi-channel float32 capture blocks into 16 kHz mono PCM16
+
+    Pipeline: downmix → DC removal → polyphase resampling → optional noise
+    suppression → automatic gain control → int16. Work arrays are allocated once and reused for every
+    callback, so a single vectorized pass replaces the per-call conversions.
+    """
+
+    def __init__(self, input_rate, input_channels, output_rate=16000, max_block=8192,
+                 agc=True, target_rms=0.1, max_gain=8.0, noise_floor=0.003, denoiser=None):
+        self.input_rate = int(input_rate)
+        self.input_channels = int(input_channels)
+        self.output_rate = int(output_rate)
+        self.resampler = PolyphaseResampler(self.input_rate, self.output_rate, max_block=max_block)
+        # Runs at the output rate, before AGC so the gain is not driven by noise
+        self.denoiser = denoiser
+
+        self.agc = agc
+        self.target_rms = target_rms
+        self.max_gain = max_gain
+        self.noise_floor = noise_floor
+        self.gain = 1.0
+        self.dc = 0.0
+
+        self._mono = np.empty(max_block, dtype=np.float32)
+        self._pcm = np.empty(max_block, dtype=np.int16)
+
+    def process(self, indata):
+        """Return 16 kHz mono 16-bit PCM bytes for one capture block"""
+        frames = len(indata)
+        if frames > len(self._mono):
+            self._mono = np.empty(frames, dtype=np.float32)
+        mono = self._mono[:frames]
+
+        # Downmix
+        if indata.ndim == 2 and indata.shape[1] > 1:
+            np.mean(indata, axis=1, out=mono)
+        else:
+            mono[:] = indata.reshape(-1)
+
+        # DC removal: subtract a slowly tracking block-mean estimate
+        self.dc = 0.995 * self.dc + 0.005 * float(mono.mean())
+        mono -= self.dc
+
+        samples = self.resampler.process(mono)
+        denoiser = self.denoiser
+        if denoiser is not None:
+            samples = denoiser.process(samples)
+        count = len(samples)
+        if count == 0:
+            return b""
+
+        # Automatic gain control: move toward the target level, but never amplify silence
+        if self.agc:
+            rms = float(np.sqrt(np.dot(samples, samples) / count))
+            if rms > self.noise_floor:
+                desired = min(self.max_gain, self.target_rms / rms)
+                # Fast attack when getting louder, slow release when quieter
+                rate = 0.5 if desired < self.gain else 0.05
+                self.gain += (desired - self.gain) * rate
+            samples *= self.gain
+
+        if count > len(self._pcm):
+            self._pcm = np.empty(count, dtype=np.int16)
+        pcm = self._pcm[:count]
+        np.clip(samples, -1.0, 1.0, out=samples)
+        samples *= 32767
+        np.copyto(pcm, samples, casting='unsafe')
+        return pcm.tobytes()
+
+
+def native_input_format(sd, device=None, max_channels=2):
+    """Return (sample_rate, channels) the input device runs at natively"""
+    info = sd.query_devices(device, kind='input')
+    rate = int(info.get('default_samplerate') or 16000)
+    channels = max(1, min(int(info.get('max_input_channels') or 1), max_channels))
+    return rate, channels
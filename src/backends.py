@@ -0,0 +1,93 @@
+import importlib
+import threading
+from contextlib import nullcontext
+
+# speech_recognition, googletrans, sounddevice and numpy together take a large
+# share of startup time, so they are only imported when first needed.
+
+
+def speech_recognition():
+    """Return the speech_recognition module, importing it on first use"""
+    return importlib.import_module("speech_recognition")
+
+
+def googletrans():
+    """Return the googletrans module, importing it on first use"""
+    return importlib.import_module("googletrans")
+
+
+def sounddevice():
+    """Return the sounddevice module, importing it on first use"""
+    return importlib.import_module("sounddevice")
+
+
+def numpy():
+    """Return the numpy module, importing it on first use"""
+    return importlib.import_module("numpy")
+
+
+class BackendWarmer:
+    """Builds the Recognizer and Translator on a background thread
+
+    The warm-up runs while the main thread opens the audio device, so by the
+    time the first audio window is ready for recognition both objects exist.
+    """
+
+    def __init__(self, profiler=None):
+        self.profiler = profiler
+        self._recognizer = None
+        self._translator = None
+        self._error = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start warming the backends in the background"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._warm, name="backend-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def _phase(self, name):
+        if self.profiler is not None:
+            return self.profiler.phase(name)
+        return nullcontext()
+
+    def _warm(self):
+        try:
+            with self._phase("import speech_recognition"):
+                sr = speech_recognition()
+            with self._phase("create Recognizer"):
+                self._recognizer = sr.Recognizer()
+            with self._phase("import googletrans"):
+                gt = googletrans()
+            with self._phase("create Translator"):
+                self._translator = gt.Translator()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._ready.set()
+
+    def wait(self, timeout=None):
+        """Block until the backends are ready; re-raise any warm-up failure"""
+        self.start()
+        if not self._ready.wait(timeout):
+            return False
+        if self._error is not None:
+            raise self._error
+        return True
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    @property
+    def recognizer(self):
+        self.wait()
+        return self._recognizer
+
+    @property
+    def translator(self):
+        self.wait()
+        return self._translator
+
@@ -0,0 +1,320 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+import backends
+from audio_archive import ArchiveReader
+from audio_preprocess import AudioPreprocessor
+from languages import parse_targets, recognizer_locale, translator_code
+from recognition import recognize_nbest
+from segment import Segment
+from sentence_assembler import SentenceAssembler
+from transcript_writer import TranscriptWriter
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.ogg', '.opus', '.mp3', '.m4a')
+MANIFEST_NAME = "batch_manifest.jsonl"
+
+
+def load_pcm(path, sample_rate=16000):
+    """A whole recording as 16 kHz mono PCM16 bytes, decoded from the file (no audio device involved)"""
+    if path.lower().endswith('.wav'):
+        with wave.open(path, 'rb') as wav:
+            rate, channels, width = wav.getframerate(), wav.getnchannels(), wav.getsampwidth()
+            data = wav.readframes(wav.getnframes())
+        if width not in (2, 4):
+            raise ValueError(f"Unsupported WAV sample width: {8 * width} bits")
+    else:
+        reader = ArchiveReader(path, sample_rate)
+        try:
+            rate, channels, width = reader.sample_rate, 1, 2
+            data = reader.read(0, reader.frames)
+        finally:
+            reader.close()
+    if rate == sample_rate and channels == 1 and width == 2:
+        return data
+
+    dtype = np.int16 if width == 2 else np.int32
+    samples = np.frombuffer(data, dtype=dtype).reshape(-1, channels).astype(np.float32) / (1 << (8 * width - 1))
+    # Same downmix and resampling as live capture; recordings are already levelled, so no AGC
+    preprocessor = AudioPreprocessor(rate, channels, sample_rate, agc=False)
+    return b"".join(preprocessor.process(samples[i:i + 8192]) for i in range(0, len(samples), 8192))
+
+
+def split_on_pauses(pcm, sample_rate=16000, min_seconds=4.0, max_seconds=15.0, threshold=0.02):
+    """Cut a recording into recognition windows at its quietest points
+
+    Returns (start_sample, end_sample, pause_seconds, has_speech) tuples;
+    `pause_seconds` is the quiet time leading up to the cut, which the
+    sentence assembler uses as a boundary cue.
+    """
+    frame = sample_rate // 50
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    count = len(samples) // frame
+    if count == 0:
+        return []
+    frames = samples[:count * frame].reshape(count, frame).astype(np.float32) / 32768.0
+    rms = np.sqrt((frames * frames).mean(axis=1))
+    # 200 ms moving average so a cut lands inside a pause rather than between two syllables
+    smooth = np.convolve(rms, np.ones(10) / 10, mode='same')
+    loud = rms >= threshold
+
+    min_frames, max_frames = int(min_seconds * 50), int(max_seconds * 50)
+    windows, start = [], 0
+    while start < count:
+        if count - start <= max_frames:
+            end = count
+        else:
+            # Cut in the middle of the first quietest stretch, so the pause before the cut is kept with it
+            span = smooth[start + min_frames:start + max_frames]
+            quietest = span <= span.min() + 1e-4
+            first = int(np.argmax(quietest))
+            run = int(np.argmin(quietest[first:])) or len(span) - first
+            end = start + min_frames + first + run // 2
+        voiced = np.flatnonzero(loud[start:end])
+        pause = (end - start - 1 - voiced[-1]) / 50 if len(voiced) else (end - start) / 50
+        end_sample = len(samples) if end == count else end * frame
+        windows.append((start * frame, end_sample, pause, len(voiced) > 0))
+        start = end
+    return windows
+
+
+class FileTranslator:
+    """Recognizes, assembles and translates one recording on a thread pool
+
+    Windows are recognized concurrently; their results are consumed in
+    order by a SentenceAssembler (timed in audio seconds rather than wall
+    time), and each completed sentence is translated on the same pool.
+    Transcripts are written in order with TranscriptWriter, one per target
+    language, exactly as a live session would write them.
+    """
+
+    def __init__(self, source_lang, target_langs, threads=4, sentence_delay=6.0, glossary=None,
+                 sample_rate=16000):
+        self.source_lang = source_lang
+        self.target_langs = target_langs
+        self.threads = threads
+        self.sentence_delay = sentence_delay
+        self.glossary = glossary
+        self.sample_rate = sample_rate
+        self._thread_local = threading.local()
+
+    def _clients(self):
+        local = self._thread_local
+        if getattr(local, 'recognizer', None) is None:
+            local.recognizer = backends.speech_recognition().Recognizer()
+            local.translator = backends.googletrans().Translator()
+        return local.recognizer, local.translator
+
+    def _recognize(self, job):
+        """Recognized Segment for one window, or None for a window without speech"""
+        index, (start, end, pause, has_speech), pcm = job
+        if not has_speech:
+            return None
+        sr = backends.speech_recognition()
+        recognizer, _ = self._clients()
+        segment = Segment(index, self.source_lang, start, end, self.sample_rate)
+        stage_start = time.monotonic_ns()
+        try:
+            best = recognize_nbest(recognizer, sr.AudioData(pcm[2 * start:2 * end], self.sample_rate, 2),
+                                   recognizer_locale(self.source_lang))[0]
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            print(f"⚠️  Recognition failed at {start / self.sample_rate:.1f}s: {e}")
+            sys.stdout.flush()
+            return None
+        segment.recognize_ns = time.monotonic_ns() - stage_start
+        segment.source_text = best.text
+        segment.confidence = best.confidence
+        return segment
+
+    def _translate(self, segment):
+        _, translator = self._clients()
+        source = segment.source_lang
+
+        def translate_to(target):
+            def translate(text):
+                return translator.translate(text, src=translator_code(source), dest=translator_code(target)).text
+
+            try:
+                if self.glossary is not None:
+                    return self.glossary.translate(segment.source_text, source, target, translate)
+                return translate(segment.source_text)
+            except Exception as e:
+                return f"[Translation failed] {e}"
+
+        stage_start = time.monotonic_ns()
+        segment.translations = {target: translate_to(target) for target in self.target_langs}
+        segment.translate_ns = time.monotonic_ns() - stage_start
+        return segment
+
+    def run(self, path, writers, ended_at):
+        """Translate `path` into `writers`; returns (audio seconds, sentences written)"""
+        pcm = load_pcm(path, self.sample_rate)
+        windows = split_on_pauses(pcm, self.sample_rate)
+        assembler = SentenceAssembler(self.sentence_delay) if self.sentence_delay > 0 else None
+        audio_seconds = len(pcm) / 2 / self.sample_rate
+        recorded_at = ended_at - audio_seconds
+        pending = []
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="batch") as pool:
+            jobs = ((i + 1, window, pcm) for i, window in enumerate(windows))
+            for window, segment in zip(windows, pool.map(self._recognize, jobs)):
+                now = window[1] / self.sample_rate
+                if segment is None:
+                    sentences = assembler.pause(now) if assembler is not None else []
+                elif assembler is not None:
+                    sentences = assembler.add(segment, window[2], now)
+                else:
+                    sentences = [segment]
+                pending += [pool.submit(self._translate, sentence) for sentence in sentences]
+            if assembler is not None:
+                pending += [pool.submit(self._translate, sentence) for sentence in assembler.pause(audio_seconds)]
+
+            for future in pending:
+                segment = future.result()
+                # Timestamps follow the recording, not the time it was processed
+                segment.wall_time = recorded_at + segment.start_sample / self.sample_rate
+                for writer in writers:
+                    writer.write_segment(segment)
+        return audio_seconds, len(pending)
+
+
+def _output_paths(path, output_dir, targets):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if len(targets) == 1:
+        return {targets[0]: os.path.join(output_dir, f"translations_{stem}.txt")}
+    return {target: os.path.join(output_dir, f"translations_{stem}_{target}.txt") for target in targets}
+
+
+def translate_file(path, output_dir, source_lang, target_lang, threads=4, sentence_delay=6.0, glossary_path=None):
+    """Process-pool entry point: translate one recording and return its manifest record"""
+    started = time.perf_counter()
+    targets = parse_targets(target_lang)
+    glossary = None
+    if glossary_path:
+        from glossary import Glossary
+        glossary = Glossary(glossary_path)
+
+    outputs = _output_paths(path, output_dir, targets)
+    writers = []
+    for target, output_file in outputs.items():
+        writer = TranscriptWriter(output_file, source_lang, target)
+        writer.audio_archive = os.path.abspath(path)
+        writer.write_header()
+        writers.append(writer)
+
+    stat = os.stat(path)
+    file_translator = FileTranslator(source_lang, targets, threads, sentence_delay, glossary)
+    # A recording's modification time is roughly when it ended
+    audio_seconds, sentences = file_translator.run(path, writers, stat.st_mtime)
+    for writer in writers:
+        writer.finish()
+    return {"file": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime,
+            "outputs": list(outputs.values()), "audio_seconds": round(audio_seconds, 2),
+            "sentences": sentences, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def read_manifest(output_dir):
+    """Records of files already translated into `output_dir`, keyed by absolute path"""
+    done = {}
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by an interrupted run
+                done[record["file"]] = record
+    except OSError:
+        pass
+    return done
+
+
+def find_recordings(folder):
+    return sorted(path for path in glob.glob(os.path.join(folder, "*"))
+                  if os.path.isfile(path) and path.lower().endswith(AUDIO_EXTENSIONS))
+
+
+def is_done(path, done):
+    """True if the manifest has this file with the same size and modification time"""
+    record = done.get(os.path.abspath(path))
+    if record is None:
+        return False
+    stat = os.stat(path)
+    return (record.get("size") == stat.st_size and record.get("mtime") == stat.st_mtime
+            and all(os.path.exists(output) for output in record.get("outputs", [])))
+
+
+def main(argv=None):
+    """Command line entry point: translate every recording in a folder"""
+    parser = argparse.ArgumentParser(description="Translate a folder of recordings into transcripts")
+    parser.add_argument("folder", help="folder with WAV (or FLAC/Opus/MP3 with ffmpeg) recordings")
+    parser.add_argument("source_lang", nargs="?", default="it")
+    parser.add_argument("target_lang", nargs="?", default="en",
+                        help="target language, comma-separated for several (e.g. en,de,es)")
+    parser.add_argument("--output", metavar="DIR",
+                        help="where transcripts and the progress manifest go (default: FOLDER/translations)")
+    parser.add_argument("--processes", type=int, default=max(1, min(4, os.cpu_count() or 1)),
+                        help="recordings processed at once")
+    parser.add_argument("--threads", type=int, default=4,
+                        help="recognition/translation requests in flight per recording")
+    parser.add_argument("--sentence-delay", type=float, default=6.0, metavar="SECONDS",
+                        help="join windows into sentences up to this long before translating (0 disables)")
+    parser.add_argument("--glossary", metavar="FILE", help="terminology file applied to every translation")
+    parser.add_argument("--force", action="store_true", help="translate files already in the manifest again")
+    args = parser.parse_args(argv)
+
+    if args.source_lang.startswith("auto"):
+        parser.error("batch translation needs an explicit source language")
+    output_dir = args.output or os.path.join(args.folder, "translations")
+    os.makedirs(output_dir, exist_ok=True)
+    recordings = find_recordings(args.folder)
+    done = {} if args.force else read_manifest(output_dir)
+    todo = [path for path in recordings if not is_done(path, done)]
+    print(f"📂 {len(recordings)} recordings in {args.folder}: {len(recordings) - len(todo)} already done, "
+          f"{len(todo)} to translate with {args.processes} processes × {args.threads} threads")
+    sys.stdout.flush()
+
+    started = time.perf_counter()
+    audio_seconds, failed = 0.0, 0
+    with ProcessPoolExecutor(max_workers=args.processes) as pool, \
+            open(os.path.join(output_dir, MANIFEST_NAME), 'a', encoding='utf-8') as manifest:
+        futures = {
+            pool.submit(translate_file, path, output_dir, args.source_lang, args.target_lang,
+                        args.threads, args.sentence_delay, args.glossary): path
+            for path in todo
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {os.path.basename(path)}: {e}")
+                sys.stdout.flush()
+                continue
+            # Only finished files are recorded, so an interrupted run resumes where it stopped
+            manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+            manifest.flush()
+            audio_seconds += record["audio_seconds"]
+            print(f"✅ {os.path.basename(path)}: {record['sentences']} sentences from "
+                  f"{record['audio_seconds'] / 60:.1f} min of audio in {record['seconds']:.0f}s")
+            sys.stdout.flush()
+
+    wall = time.perf_counter() - started
+    speed = audio_seconds / wall if wall else 0.0
+    print(f"📊 Batch: {len(todo) - failed} translated, {failed} failed, {len(recordings) - len(todo)} skipped | "
+          f"{audio_seconds / 3600:.2f} h of audio in {wall:.0f}s ({speed:.1f} audio-hours per wall-hour)")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+import json
+import queue
+import socket
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CAPTION_PORT = 8765
+DEFAULT_SHM_NAME = "rt_translator_captions"
+
+# Shared-memory snapshot layout: a sequence number (odd while the writer is
+# mid-update), the payload length, then the UTF-8 JSON list of captions.
+# Readers retry until they see the same even sequence before and after copying.
+SHM_HEADER = struct.Struct("<QI")
+
+OVERLAY_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Live captions</title>
+<style>
+  html, body { margin: 0; background: transparent; overflow: hidden; }
+  #captions { position: fixed; left: 5%; right: 5%; bottom: 4%; text-align: center;
+              font: 600 32px/1.35 sans-serif; color: #fff; text-shadow: 0 0 6px #000, 0 0 2px #000; }
+  .line { margin-top: 6px; }
+  .partial { color: #ccc; font-style: italic; }
+</style>
+</head>
+<body>
+<div id="captions"></div>
+<script>
+  // ?lang=de picks a target language, ?lines=3 the number of captions shown
+  const params = new URLSearchParams(location.search);
+  const lang = params.get("lang");
+  const maxLines = parseInt(params.get("lines") || "2", 10);
+  const captions = new Map();
+  const box = document.getElementById("captions");
+
+  function text(c) {
+    if (c.kind === "partial") return c.source_text;
+    return (lang && c.translations[lang]) || Object.values(c.translations)[0] || "";
+  }
+  function render() {
+    const recent = [...captions.values()].slice(-maxLines);
+    box.innerHTML = "";
+    for (const c of recent) {
+      const div = document.createElement("div");
+      div.className = "line " + c.kind;
+      div.textContent = text(c);
+      box.appendChild(div);
+    }
+  }
+  function add(c) {
+    captions.delete(c.index);
+    captions.set(c.index, c);
+    while (captions.size > 20) captions.delete(captions.keys().next().value);
+  }
+
+  const events = new EventSource("/events");
+  events.addEventListener("snapshot", e => { captions.clear(); JSON.parse(e.data).forEach(add); render(); });
+  events.addEventListener("partial", e => { add(JSON.parse(e.data)); render(); });
+  events.addEventListener("final", e => { add(JSON.parse(e.data)); render(); });
+</script>
+</body>
+</html>
+""".encode("utf-8")
+
+
+class _CaptionHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, content_type, body):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        captions = self.server.captions
+        path = self.path.split("?", 1)[0]
+        if path == "/events":
+            self._stream(captions)
+        elif path == "/captions.json":
+            self._send("application/json; charset=utf-8", captions.snapshot())
+        elif path in ("/", "/overlay"):
+            self._send("text/html; charset=utf-8", OVERLAY_PAGE)
+        else:
+            self.send_error(404)
+
+    def _stream(self, captions):
+        # Captions are small and latency matters more than packet count
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+
+        subscriber = captions.subscribe()
+        try:
+            while True:
+                try:
+                    message = subscriber.get(timeout=15)
+                except queue.Empty:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    break
+                self.wfile.write(message)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            captions.unsubscribe(subscriber)
+
+
+class _CaptionHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class CaptionServer:
+    """Publishes the latest captions to overlays over Server-Sent Events and shared memory
+
+    Endpoints: `/` is a transparent overlay page (usable as an OBS browser
+    source), `/events` is the SSE stream and `/captions.json` the current
+    snapshot. Each segment is published twice: a `partial` event as soon as
+    it is recognized and a `final` event once it is translated.
+
+    Every event is encoded once and the same bytes are queued for each
+    subscriber, so more viewers cost one queue put each and never another
+    translation. A subscriber that falls behind loses its oldest queued
+    events rather than slowing the pipeline.
+    """
+
+    def __init__(self, port=DEFAULT_CAPTION_PORT, host="127.0.0.1", history=20,
+                 shm_name=DEFAULT_SHM_NAME, shm_size=65536, max_pending=64):
+        self.host = host
+        self.port = port
+        self.history = history
+        self.max_pending = max_pending
+        self.shm_name = shm_name
+        self.shm_size = shm_size
+        self.shm = None
+        self.server = None
+        self._thread = None
+
+        self._lock = threading.Lock()
+        self._captions = OrderedDict()
+        self._snapshot = b"[]"
+        self._subscribers = []
+        self.sequence = 0
+        self.events_published = 0
+        self.dropped_messages = 0
+
+    def start(self):
+        self.server = _CaptionHTTPServer((self.host, self.port), _CaptionHandler)
+        self.server.captions = self
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, name="caption-server", daemon=True)
+        self._thread.start()
+        if self.shm_name:
+            self._open_shared_memory()
+        print(f"📺 Live captions at http://{self.host}:{self.port}/ (SSE /events, JSON /captions.json"
+              f"{f', shared memory {self.shm_name!r}' if self.shm is not None else ''})")
+        sys.stdout.flush()
+        return self
+
+    def _open_shared_memory(self):
+        try:
+            from multiprocessing import shared_memory
+        except ImportError:
+            return
+        try:
+            self.shm = shared_memory.SharedMemory(name=self.shm_name, create=True, size=self.shm_size)
+        except FileExistsError:
+            # Left over from a previous run that did not shut down cleanly: use its size, and
+            # restart the sequence in case that writer died mid-update (odd), which stalls readers
+            self.shm = shared_memory.SharedMemory(name=self.shm_name)
+            self.shm_size = self.shm.size
+            if self.shm_size > SHM_HEADER.size:
+                SHM_HEADER.pack_into(self.shm.buf, 0, 0, 0)
+        except OSError as e:
+            print(f"⚠️  Caption shared memory unavailable: {e}")
+            sys.stdout.flush()
+            return
+        if self.shm_size <= SHM_HEADER.size:
+            print(f"⚠️  Caption shared memory {self.shm_name!r} is too small ({self.shm_size} bytes)")
+            sys.stdout.flush()
+            self.shm.close()
+            self.shm = None
+            return
+        self._write_shared_memory(self._snapshot)
+
+    @staticmethod
+    def _event(kind, segment):
+        return {
+            "kind": kind,
+            "index": segment.index,
+            "time": segment.wall_time,
+            "clock": segment.clock(),
+            "source_lang": segment.source_lang,
+            "source_text": segment.source_text,
+            "translations": dict(segment.translations),
+            "confidence": segment.confidence,
+            "latency_ms": round(segment.elapsed_ns() / 1e6, 1),
+        }
+
+    def publish_partial(self, segment):
+        """Recognized text, before translation"""
+        self._publish(self._event("partial", segment))
+
+    def publish_final(self, segment):
+        """Recognized text with all its translations; replaces the partial"""
+        self._publish(self._event("final", segment))
+
+    def _publish(self, event):
+        message = f"event: {event['kind']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8")
+        with self._lock:
+            self._captions.pop(event["index"], None)
+            self._captions[event["index"]] = event
+            while len(self._captions) > self.history:
+                self._captions.popitem(last=False)
+            self._snapshot = json.dumps(list(self._captions.values()), ensure_ascii=False).encode("utf-8")
+            self.sequence += 1
+            self.events_published += 1
+            subscribers = list(self._subscribers)
+            snapshot = self._snapshot
+        for subscriber in subscribers:
+            self._offer(subscriber, message)
+        if self.shm is not None:
+            self._write_shared_memory(snapshot)
+
+    def _offer(self, subscriber, message):
+        while True:
+            try:
+                subscriber.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    subscriber.get_nowait()
+                    self.dropped_messages += 1
+                except queue.Empty:
+                    pass
+
+    def _write_shared_memory(self, payload):
+        capacity = self.shm_size - SHM_HEADER.size
+        if len(payload) > capacity:
+            # Keep the newest captions that fit
+            with self._lock:
+                captions = list(self._captions.values())
+            while captions and len(payload) > capacity:
+                captions.pop(0)
+                payload = json.dumps(captions, ensure_ascii=False).encode("utf-8")
+        buf = self.shm.buf
+        sequence = SHM_HEADER.unpack_from(buf)[0]
+        SHM_HEADER.pack_into(buf, 0, sequence + 1, 0)
+        buf[SHM_HEADER.size:SHM_HEADER.size + len(payload)] = payload
+        SHM_HEADER.pack_into(buf, 0, sequence + 2, len(payload))
+
+    def snapshot(self):
+        """The latest captions as a UTF-8 JSON list"""
+        return self._snapshot
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=self.max_pending)
+        with self._lock:
+            subscriber.put_nowait(b"event: snapshot\ndata: " + self._snapshot + b"\n\n")
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def report(self):
+        return (f"Captions: {self.events_published} events | {len(self._subscribers)} subscribers | "
+                f"dropped {self.dropped_messages} for slow subscribers")
+
+    def close(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            self._offer(subscriber, None)
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.shm is not None:
+            self.shm.close()
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = None
+
+
+def read_shared_snapshot(name=DEFAULT_SHM_NAME):
+    """Read the caption list published by a CaptionServer in another process"""
+    from multiprocessing import shared_memory
+
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 an attaching process registers the segment with its
+        # resource tracker, which would unlink it from under the server at exit
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+    try:
+        while True:
+            before, length = SHM_HEADER.unpack_from(shm.buf)
+            if before % 2:
+                continue
+            payload = bytes(shm.buf[SHM_HEADER.size:SHM_HEADER.size + length])
+            if SHM_HEADER.unpack_from(shm.buf)[0] == before:
+                return json.loads(payload.decode("utf-8"))
+    finally:
+        shm.close()
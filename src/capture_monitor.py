@@ -0,0 +1,148 @@
+import bisect
+import threading
+import time
+from collections import deque
+
+import metrics
+
+XRUNS = metrics.counter("rt_capture_xruns_total", "Input overflows/underflows reported by the capture device", ["kind"])
+DROPPED_SAMPLES = metrics.DROPPED_SAMPLES
+CALLBACK_JITTER = metrics.histogram("rt_capture_callback_jitter_seconds",
+                                    "Deviation of each capture callback from the block period",
+                                    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25))
+RATE_RATIO = metrics.gauge("rt_capture_rate_ratio", "Effective capture sample rate divided by the nominal one")
+
+# PortAudio callback flags, as pyaudio passes them (sounddevice passes CallbackFlags)
+PA_INPUT_UNDERFLOW = 0x1
+PA_INPUT_OVERFLOW = 0x2
+
+
+def _status_kinds(status):
+    """'overflow' / 'underflow' flags set in a sounddevice or pyaudio callback status"""
+    if not status:
+        return ()
+    if isinstance(status, int):
+        return tuple(kind for kind, bit in (("overflow", PA_INPUT_OVERFLOW), ("underflow", PA_INPUT_UNDERFLOW))
+                     if status & bit)
+    return tuple(kind for kind in ("overflow", "underflow") if getattr(status, f"input_{kind}", False))
+
+
+class CaptureMonitor:
+    """Health of the capture callback: device overflows, callback jitter and the effective sample rate
+
+    `on_block` is called from the capture callback with the device's status
+    and costs a few arithmetic operations. Overflow/underflow events are
+    kept with the position (in output samples, the same offsets
+    Segment.start_sample/end_sample use) and wall time at which they were
+    reported, so the windows recognized from damaged audio can be marked.
+    Jitter is how far each callback interval is from the duration of the
+    block before it; the effective rate is the frames delivered per second
+    of wall time. Both are only meaningful for real-time sources, so input
+    from a pipe (read as fast as it is written) reports neither.
+
+    Only the latest `max_events` events are kept: windows are marked soon
+    after capture, so older ones are never queried, and a flaky device on
+    an all-day session cannot grow the list without bound. The totals in
+    `counts` cover the whole session.
+    """
+
+    def __init__(self, samplerate, output_rate=16000, realtime=True, recent=2048, max_events=1024):
+        self.samplerate = samplerate
+        self.output_rate = output_rate
+        self.realtime = realtime
+        self.max_events = max_events
+        self._jitter = deque(maxlen=recent)
+        # Taken by the callback only when an event is recorded
+        self._events_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start counting a new session at output position 0"""
+        self.position = 0
+        self.blocks = 0
+        self.frames = 0
+        self.event_positions = deque(maxlen=self.max_events)
+        self.events = deque(maxlen=self.max_events)
+        self.total_events = 0
+        self.counts = {"overflow": 0, "underflow": 0}
+        self.max_jitter = 0.0
+        self._jitter.clear()
+        self._jitter_sum = 0.0
+        self._first_at = None
+        self._first_frames = 0
+        self._last_at = None
+        self._last_frames = 0
+        self._reported = 0
+
+    def on_block(self, frames, status, output_samples):
+        """Record one capture callback; `output_samples` is what it contributed after resampling"""
+        now = time.monotonic()
+        if self._last_at is None:
+            self._first_at, self._first_frames = now, frames
+        elif self.realtime:
+            # A late callback makes the next ones early, so the deviation is taken either way
+            jitter = abs(now - self._last_at - self._last_frames / self.samplerate)
+            self._jitter.append(jitter)
+            self._jitter_sum += jitter
+            self.max_jitter = max(self.max_jitter, jitter)
+            CALLBACK_JITTER.observe(jitter)
+        for kind in _status_kinds(status):
+            self.counts[kind] += 1
+            XRUNS.inc(kind=kind)
+            with self._events_lock:
+                self.event_positions.append(self.position)
+                self.events.append((self.position, time.time(), kind))
+                self.total_events += 1
+            if kind == "overflow" and self._last_at is not None:
+                # The device does not say how much it lost; the gap beyond one block period is the estimate
+                gap = now - self._last_at - self._last_frames / self.samplerate
+                if gap > 0:
+                    DROPPED_SAMPLES.inc(int(gap * self.output_rate), where="capture")
+        self._last_at, self._last_frames = now, frames
+        self.blocks += 1
+        self.frames += frames
+        self.position += output_samples
+
+    @property
+    def started_at(self):
+        """time.monotonic() of the first callback since the last reset, or None"""
+        return self._first_at
+
+    def events_between(self, start, end):
+        """Overflow/underflow events reported while samples [start, end) were captured"""
+        with self._events_lock:
+            positions = list(self.event_positions)
+        return bisect.bisect_left(positions, end) - bisect.bisect_left(positions, start)
+
+    def new_events(self):
+        """Events since the last call (at most the `max_events` latest), for periodic warnings"""
+        with self._events_lock:
+            events = list(self.events)
+            count = min(self.total_events - self._reported, len(events))
+            self._reported = self.total_events
+        return events[len(events) - count:]
+
+    def effective_rate(self):
+        """Frames per second of wall time since the first callback, or None without enough data"""
+        if not self.realtime or self._last_at is None or self._last_at - self._first_at < 1.0:
+            return None
+        rate = (self.frames - self._first_frames) / (self._last_at - self._first_at)
+        RATE_RATIO.set(rate / self.samplerate)
+        return rate
+
+    def jitter_percentile(self, q):
+        if not self._jitter:
+            return 0.0
+        ordered = sorted(self._jitter)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def report(self):
+        line = (f"Capture: {self.blocks} blocks | {self.counts['overflow']} overflows, "
+                f"{self.counts['underflow']} underflows")
+        rate = self.effective_rate()
+        if rate is not None:
+            mean = 1e3 * self._jitter_sum / max(1, self.blocks - 1)
+            line += (f" | effective rate {rate:.0f} Hz ({100 * rate / self.samplerate:.2f}% of {self.samplerate}) | "
+                     f"callback jitter mean {mean:.2f} ms, p99 {1e3 * self.jitter_percentile(99):.2f} ms, "
+                     f"max {1e3 * self.max_jitter:.2f} ms")
+        return line
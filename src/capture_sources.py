@@ -0,0 +1,266 @@
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+
+import numpy as np
+
+from audio_preprocess import native_input_format
+
+# Every source delivers float32 blocks of shape (frames, channels) through the
+# same callback(indata, frames, time, status) signature sounddevice uses, so
+# the capture pipeline does not care where the audio comes from.
+
+
+class CaptureSource:
+    """Base class: a started source calls `callback` from its own thread
+
+    `finished` becomes true when a source runs out of audio by itself (end
+    of a file or pipe), after its last block has been delivered.
+    """
+
+    description = "audio"
+    finished = False
+
+    def __init__(self, samplerate, channels):
+        self.samplerate = int(samplerate)
+        self.channels = int(channels)
+
+    def start(self, callback, blocksize):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MicrophoneSource(CaptureSource):
+    """Default input device through sounddevice, at its native format"""
+
+    description = "microphone"
+
+    def __init__(self, sd, device=None, samplerate=None, channels=None, max_channels=2):
+        if samplerate is None or channels is None:
+            native_rate, native_channels = native_input_format(sd, device, max_channels)
+            samplerate = samplerate or native_rate
+            channels = channels or native_channels
+        super().__init__(samplerate, channels)
+        self.sd = sd
+        self.device = device
+        self.stream = None
+
+    def start(self, callback, blocksize):
+        self.stream = self.sd.InputStream(
+            device=self.device,
+            samplerate=self.samplerate,
+            channels=self.channels,
+            callback=callback,
+            blocksize=blocksize,
+            dtype='float32'
+        )
+        self.stream.start()
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.stop()
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+
+class _ReaderSource(CaptureSource):
+    """Reads raw interleaved samples from a byte stream on a background thread"""
+
+    dtype = np.float32
+    scale = 1.0
+
+    def __init__(self, samplerate, channels, realtime=False):
+        super().__init__(samplerate, channels)
+        self.realtime = realtime
+        self._running = threading.Event()
+        self._thread = None
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _release(self):
+        pass
+
+    def start(self, callback, blocksize):
+        stream = self._open()
+        self.finished = False
+        self._running.set()
+        self._thread = threading.Thread(
+            target=self._read_loop, args=(stream, callback, blocksize),
+            name=f"capture-{self.description}", daemon=True
+        )
+        self._thread.start()
+
+    def _read_loop(self, stream, callback, blocksize):
+        frame_bytes = self.channels * np.dtype(self.dtype).itemsize
+        block_seconds = blocksize / self.samplerate
+        next_block = time.monotonic()
+        try:
+            while self._running.is_set():
+                data = stream.read(blocksize * frame_bytes)
+                usable = len(data) - len(data) % frame_bytes
+                if usable == 0:
+                    print(f"📄 End of {self.description} input")
+                    sys.stdout.flush()
+                    break
+                block = np.frombuffer(data[:usable], dtype=self.dtype).reshape(-1, self.channels)
+                if self.scale != 1.0:
+                    block = block.astype(np.float32) * self.scale
+                callback(block, len(block), None, None)
+
+                if self.realtime:
+                    # Deliver a file at the speed it would have been captured live
+                    next_block += block_seconds
+                    delay = next_block - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+        except Exception as e:
+            print(f"❌ {self.description} capture error: {e}")
+            sys.stdout.flush()
+        finally:
+            # Still running means the input ended rather than stop() being called
+            if self._running.is_set():
+                self.finished = True
+            self._running.clear()
+
+    def stop(self):
+        self._running.clear()
+        self._release()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+class MonitorSource(_ReaderSource):
+    """System audio (what the speakers play) from the PulseAudio/PipeWire monitor of the default sink
+
+    Meeting audio reaches the pipeline digitally instead of through the
+    speakers and the microphone. Uses `parec` (PulseAudio, or PipeWire's
+    pulse server) and falls back to `pw-record`.
+    """
+
+    description = "loopback"
+
+    def __init__(self, sink=None, samplerate=48000, channels=2):
+        super().__init__(samplerate, channels)
+        self.sink = sink
+        self.process = None
+
+    @staticmethod
+    def default_sink():
+        """Name of the default output sink, or None if it cannot be queried"""
+        if not shutil.which("pactl"):
+            return None
+        try:
+            result = subprocess.run(["pactl", "get-default-sink"], capture_output=True, text=True, timeout=2)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return result.stdout.strip() or None
+
+    def _command(self):
+        sink = self.sink or self.default_sink()
+        if shutil.which("parec"):
+            device = f"{sink}.monitor" if sink else "@DEFAULT_MONITOR@"
+            return ["parec", f"--device={device}", "--format=float32le", f"--rate={self.samplerate}",
+                    f"--channels={self.channels}", "--latency-msec=20"]
+        if shutil.which("pw-record"):
+            command = ["pw-record", "-P", "{ stream.capture.sink=true }", "--format=f32",
+                       f"--rate={self.samplerate}", f"--channels={self.channels}"]
+            if sink:
+                command.append(f"--target={sink}")
+            return command + ["-"]
+        raise RuntimeError("Loopback capture needs PulseAudio or PipeWire (parec or pw-record not found)")
+
+    def _open(self):
+        command = self._command()
+        self.description = f"loopback ({command[0]})"
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        return self.process.stdout
+
+    def _release(self):
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+
+
+class FileSource(_ReaderSource):
+    """A WAV file, or raw 16-bit PCM from a file, FIFO or stdin ('-'), for testing without a device
+
+    Regular files are paced to real time by default so the pipeline sees the
+    same timing as live capture; pipes are read as fast as they are written.
+    """
+
+    def __init__(self, path, raw_rate=16000, raw_channels=1, realtime=None):
+        self.path = path
+        self._file = None
+        self._wave = None
+        is_pipe = path == '-' or (os.path.exists(path) and not os.path.isfile(path))
+        if realtime is None:
+            realtime = not is_pipe
+
+        if path.lower().endswith('.wav'):
+            self._wave = wave.open(path, 'rb')
+            width = self._wave.getsampwidth()
+            if width not in (2, 4):
+                self._wave.close()
+                raise ValueError(f"Unsupported WAV sample width: {8 * width} bits")
+            self.dtype = np.int16 if width == 2 else np.int32
+            self.scale = 1.0 / (1 << (8 * width - 1))
+            super().__init__(self._wave.getframerate(), self._wave.getnchannels(), realtime)
+        else:
+            self.dtype = np.int16
+            self.scale = 1.0 / 32768
+            super().__init__(raw_rate, raw_channels, realtime)
+        self.description = "stdin" if path == '-' else os.path.basename(path)
+
+    def _open(self):
+        if self._wave is not None:
+            return _WaveReader(self._wave, self.channels * np.dtype(self.dtype).itemsize)
+        self._file = sys.stdin.buffer if self.path == '-' else open(self.path, 'rb')
+        return self._file
+
+    def close(self):
+        if self._wave is not None:
+            self._wave.close()
+        if self._file is not None and self._file is not sys.stdin.buffer:
+            self._file.close()
+
+
+class _WaveReader:
+    """Adapts wave.Wave_read to a byte-count read()"""
+
+    def __init__(self, wav, frame_bytes):
+        self.wav = wav
+        self.frame_bytes = frame_bytes
+
+    def read(self, size):
+        return self.wav.readframes(size // self.frame_bytes)
+
+
+def create_source(spec='mic', sd=None):
+    """Build a capture source from 'mic', 'loopback' / 'loopback:<sink>', or a file path ('-' for stdin)"""
+    spec = spec or 'mic'
+    if spec == 'mic':
+        if sd is None:
+            raise ValueError("Microphone capture needs the sounddevice module")
+        return MicrophoneSource(sd)
+    if spec == 'loopback' or spec.startswith('loopback:'):
+        sink = spec.split(':', 1)[1] if ':' in spec else None
+        return MonitorSource(sink)
+    return FileSource(spec)
@@ -4,10 +4,15 @@ class Config:
     SAMPLE_RATE = 16000
     CHUNK_SIZE = 1024
     CHANNELS = 1
+    INPUT_SOURCE = 'mic'  # 'mic', 'loopback' (system audio on Linux) or a WAV/raw file path
+    CAPTURE_NATIVE_FORMAT = True  # capture at the device rate and resample to SAMPLE_RATE
+    AUTO_GAIN = True
+    NOISE_SUPPRESSION = False  # spectral gating for fan/room noise when capturing from speakers
     
     # Language settings
     SOURCE_LANGUAGE = 'it'  # Italian
     TARGET_LANGUAGE = 'en'  # English
+    GLOSSARY_FILE = None  # tab-separated terminology file enforced on every translation (see glossary.py)
     
     # Recognition settings
     PHRASE_TIMEOUT = 3.0  # seconds
@@ -0,0 +1,58 @@
+import sys
+import threading
+
+# Typed pipeline events. Every event has a "type" and a human-readable
+# "text" line; the other fields depend on the type:
+#
+#   status   - replaces the previous status (buffer_seconds, queue)
+#   caption  - recognized or translated text (stage, lang, caption, segment)
+#
+# With no subscribers the text line is printed, so command-line use looks
+# exactly as before. The GUI daemon subscribes and forwards the events as
+# JSON, which keeps frequent status updates out of the transcript log.
+
+
+class EventBus:
+    """Minimal publish/subscribe hub for pipeline events"""
+
+    def __init__(self):
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not callback]
+
+    def publish(self, event_type, text, **fields):
+        subscribers = self._subscribers
+        if not subscribers:
+            print(text)
+            sys.stdout.flush()
+            return
+        event = {"type": event_type, "text": text}
+        event.update(fields)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"❌ Event subscriber failed: {e}")
+                sys.stdout.flush()
+
+
+bus = EventBus()
+
+
+def subscribe(callback):
+    bus.subscribe(callback)
+
+
+def unsubscribe(callback):
+    bus.unsubscribe(callback)
+
+
+def publish(event_type, text, **fields):
+    bus.publish(event_type, text, **fields)
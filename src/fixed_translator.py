@@ -9,6 +9,12 @@ import numpy as np
 import queue
 import io
 import os
+from collections import deque
+from language_id import LanguageIdentifier, parse_source
+from languages import recognizer_locale, translator_code
+from render_cache import RegionRenderer, TextCache
+from segment import Segment
+from session_history import MemoryMonitor, SessionHistory, current_rss_bytes
 
 def __init__(self, source_lang='it', target_lang='en'):
     self.config = Config()
@@ -24,32 +30,53 @@ def __init__(self, source_lang='it', target_lang='en'):
         channels=self.config.CHANNELS
     )
     self.speech_to_text = SpeechToText(
-        language=f'{self.config.SOURCE_LANGUAGE}-{self.config.SOURCE_LANGUAGE.upper()}'
+        language=recognizer_locale(self.config.SOURCE_LANGUAGE)
     )
     self.translator = TextTranslator(
         src_lang=self.config.SOURCE_LANGUAGE,
-        dest_lang=self.config.TARGET_LANGUAGE
+        dest_lang=self.config.TARGET_LANGUAGE,
+        glossary_file=self.config.GLOSSARY_FILE
     )
 
 
 class FixedTranslator:
-    def __init__(self):
+    PROCESS_AUDIO_EVENT = pygame.USEREVENT + 1
+    STATS_EVENT = pygame.USEREVENT + 2
+    
+    def __init__(self, speaker_turns=False, source_lang='it', long_session=False):
         self.recognizer = sr.Recognizer()
         self.translator = Translator()
-        self.translated_lines = []
-        self.debug_messages = []
+        # 'auto' / 'auto:it,en' identifies the source language per segment, as the standalone translator does
+        self.source_lang, candidates = parse_source(source_lang)
+        self.language_id = LanguageIdentifier(candidates) if candidates is not None else None
+        # Display history is fixed-size; older translations live only in the file and the history spill
+        self.translated_lines = deque(maxlen=5)
+        self.debug_messages = deque(maxlen=10)
+        self.renderer = None
         self.is_listening = False
-        self.saved_translations = []
-        self.current_paragraph = []
+        self.current_paragraph = deque(maxlen=50)
         self.last_translation_time = time.time()
         
         # Create output file
         self.output_file = f"translations_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        # Long sessions spill older history to disk and track RSS; short ones only keep the display window
+        self.long_session = long_session
+        spill_path = os.path.splitext(self.output_file)[0] + ".history.jsonl" if long_session else None
+        self.saved_translations = SessionHistory(window=100, spill_path=spill_path)
+        self.memory = MemoryMonitor() if long_session else None
         self._initialize_output_file()
         
         # Audio queue for sounddevice
         self.audio_queue = queue.Queue()
         self.audio_buffer = bytearray()
+        self.samples_captured = 0
+        self.segment_counter = 0
+        # Optional speaker-change detection; a new speaker starts a new paragraph
+        self.speaker_detector = None
+        self.last_speaker_turn = None
+        if speaker_turns:
+            from speaker_change import SpeakerChangeDetector
+            self.speaker_detector = SpeakerChangeDetector(16000)
         
         # Pygame for display
         pygame.init()
@@ -57,6 +84,7 @@ class FixedTranslator:
         pygame.display.set_caption("Fixed Translator - Italian to English")
         self.font = pygame.font.Font(None, 20)
         self.small_font = pygame.font.Font(None, 16)
+        self._setup_display()
         
         # Start audio capture
         self.start_audio_capture()
@@ -71,9 +99,9 @@ class FixedTranslator:
             f.write("=" * 60 + "\n\n")
         self.add_debug(f"Output file created: {self.output_file}")
     
-    def _save_to_file(self, text, translation, is_new_paragraph=False):
+    def _save_to_file(self, segment, is_new_paragraph=False):
         """Save translation to file with structured formatting"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
+        timestamp = segment.clock()
         
         with open(self.output_file, 'a', encoding='utf-8') as f:
             if is_new_paragraph:
@@ -82,21 +110,20 @@ class FixedTranslator:
                 f.write("─" * 50 + "\n")
             
             f.write(f"[{timestamp}]\n")
-            f.write(f"Italian: {text}\n")
-            f.write(f"English: {translation}\n")
+            source_label = f"{segment.source_lang.upper()}" if self.language_id else "Italian"
+            f.write(f"{source_label}: {segment.source_text}\n")
+            f.write(f"English: {segment.translated_text}\n")
             f.write("-" * 40 + "\n")
         
         # Also save to memory for display
-        self.saved_translations.append({
-            'timestamp': timestamp,
-            'italian': text,
-            'english': translation
-        })
+        self.saved_translations.append(segment)
     
-    def _should_start_new_paragraph(self, current_time):
-        """Determine if we should start a new paragraph based on timing"""
+    def _should_start_new_paragraph(self, current_time, speaker_turn=None):
+        """Determine if we should start a new paragraph based on timing and speaker changes"""
         if not self.current_paragraph:
             return True
+        if speaker_turn is not None and speaker_turn != self.last_speaker_turn:
+            return True
         
         # If more than 10 seconds since last translation, start new paragraph
         time_gap = current_time - self.last_translation_time
@@ -110,9 +137,9 @@ class FixedTranslator:
     def add_debug(self, message):
         """Add debug message"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.debug_messages.insert(0, f"[{timestamp}] {message}")
-        if len(self.debug_messages) > 10:
-            self.debug_messages = self.debug_messages[:10]
+        self.debug_messages.appendleft(f"[{timestamp}] {message}")
+        if self.renderer is not None:
+            self.renderer.invalidate('status')
         print(message)
     
     def audio_callback(self, indata, frames, time, status):
@@ -148,55 +175,91 @@ class FixedTranslator:
                 2  # 16-bit = 2 bytes per sample
             )
             
+            self.segment_counter += 1
+            segment = Segment(
+                self.segment_counter, 'it', self.samples_captured - len(self.audio_buffer) // 2, self.samples_captured
+            )
+            
             # Clear buffer after processing
             self.audio_buffer.clear()
+            if self.speaker_detector is not None:
+                segment.speaker_turn = self.speaker_detector.turn_at((segment.start_sample + segment.end_sample) // 2)
             
-            # Try Italian recognition
-            italian_text = self.recognizer.recognize_google(audio_data, language='it-IT')
-            self.add_debug(f"SUCCESS: Recognized Italian: {italian_text}")
+            # Recognize in the source language (the session prior when auto-detecting)
+            source_lang = self.language_id.current() if self.language_id else self.source_lang
+            stage_start = time.monotonic_ns()
+            try:
+                segment.source_text = self.recognizer.recognize_google(audio_data, language=recognizer_locale(source_lang))
+            except sr.UnknownValueError:
+                if self.language_id:
+                    self.language_id.note_failure()
+                raise
+            segment.recognize_ns = time.monotonic_ns() - stage_start
+            if self.language_id:
+                detected = self.language_id.decide(segment.source_text)
+                segment.language_id_ns = int(self.language_id.last_latency_ms * 1e6)
+                segment.language_confidence = self.language_id.last_confidence
+                if detected != source_lang:
+                    self.add_debug(f"Language switch detected: {source_lang} -> {detected}, re-recognizing segment")
+                    segment.source_text = self.recognizer.recognize_google(audio_data,
+                                                                           language=recognizer_locale(detected))
+                    source_lang = detected
+            segment.source_lang = source_lang
+            self.add_debug(f"SUCCESS: Recognized {source_lang}: {segment.source_text}")
             
             # Translate
-            translated = self.translator.translate(italian_text, src='it', dest='en')
+            stage_start = time.monotonic_ns()
+            translated = self.translator.translate(segment.source_text, src=translator_code(source_lang), dest='en')
+            segment.translations = {'en': translated.text}
+            segment.translate_ns = time.monotonic_ns() - stage_start
             self.add_debug(f"SUCCESS: Translated: {translated.text}")
             
             # Determine if this should be a new paragraph
-            current_time = time.time()
-            is_new_paragraph = self._should_start_new_paragraph(current_time)
+            current_time = segment.wall_time
+            is_new_paragraph = self._should_start_new_paragraph(current_time, segment.speaker_turn)
             
             # Save to file
-            self._save_to_file(italian_text, translated.text, is_new_paragraph)
+            self._save_to_file(segment, is_new_paragraph)
             
             # Update paragraph tracking
             if is_new_paragraph and self.current_paragraph:
-                self.current_paragraph = []  # Start new paragraph
+                self.current_paragraph.clear()  # Start new paragraph
             
             self.current_paragraph.append(translated.text)
             self.last_translation_time = current_time
+            self.last_speaker_turn = segment.speaker_turn
             
-            # Add to display
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.translated_lines.insert(0, f"[{timestamp}] {translated.text}")
-            if len(self.translated_lines) > 5:
-                self.translated_lines = self.translated_lines[:5]
+            # Add to display; the caption string is built when drawn
+            self.translated_lines.appendleft(segment)
+            self.renderer.invalidate('captions')
+            self.renderer.invalidate('stats')
                 
         except sr.UnknownValueError:
-            self.add_debug("No Italian speech detected in audio")
+            self.add_debug("No speech detected in audio")
         except sr.RequestError as e:
             self.add_debug(f"Speech recognition error: {e}")
         except Exception as e:
             self.add_debug(f"Processing error: {e}")
     
-    def update_display(self):
-        """Update the display"""
-        self.screen.fill((0, 0, 0))
-        
+    def _setup_display(self):
+        """Split the window into regions that are only redrawn when their content changes"""
+        self.text_cache = TextCache()
+        self.renderer = RegionRenderer(self.screen)
+        self.renderer.add('header', (0, 0, 1200, 200), self._draw_header)
+        self.renderer.add('captions', (0, 200, 1200, 100), self._draw_captions)
+        self.renderer.add('status', (0, 300, 1200, 240), self._draw_status)
+        self.renderer.add('stats', (0, 550, 1200, 18), self._draw_stats)
+        self.renderer.add('footer', (0, 568, 1200, 32), self._draw_footer)
+    
+    def _text(self, font, text, color):
+        return self.text_cache.render(font, text, color)
+    
+    def _draw_header(self, rect):
         # Title
-        title = self.font.render("Fixed Translator - Italian to English (Real-time)", True, (255, 255, 255))
-        self.screen.blit(title, (20, 20))
+        self.screen.blit(self._text(self.font, "Fixed Translator - Italian to English (Real-time)", (255, 255, 255)), (20, 20))
         
         # File info
-        file_info = self.small_font.render(f"Saving to: {self.output_file}", True, (128, 255, 255))
-        self.screen.blit(file_info, (20, 45))
+        self.screen.blit(self._text(self.small_font, f"Saving to: {self.output_file}", (128, 255, 255)), (20, 45))
         
         # Instructions
         instructions = [
@@ -208,52 +271,49 @@ class FixedTranslator:
         
         y_offset = 70
         for instruction in instructions:
-            text = self.small_font.render(instruction, True, (255, 255, 0))
-            self.screen.blit(text, (20, y_offset))
+            self.screen.blit(self._text(self.small_font, instruction, (255, 255, 0)), (20, y_offset))
             y_offset += 20
         
         # Translated text
         y_offset += 20
-        title = self.font.render("LIVE TRANSLATIONS:", True, (0, 255, 0))
-        self.screen.blit(title, (20, y_offset))
-        y_offset += 30
-        
+        self.screen.blit(self._text(self.font, "LIVE TRANSLATIONS:", (0, 255, 0)), (20, y_offset))
+    
+    def _draw_captions(self, rect):
         if not self.translated_lines:
-            text = self.font.render("Listening for Italian audio...", True, (128, 128, 128))
-            self.screen.blit(text, (20, y_offset))
+            self.screen.blit(self._text(self.font, "Listening for Italian audio...", (128, 128, 128)), (20, rect.top))
         else:
-            for i, line in enumerate(self.translated_lines):
-                text = self.font.render(line, True, (255, 255, 0))
-                self.screen.blit(text, (20, y_offset + i * 25))
-        
+            for i, segment in enumerate(self.translated_lines):
+                self.screen.blit(self._text(self.font, segment.caption(), (255, 255, 0)), (20, rect.top + i * 20))
+    
+    def _draw_status(self, rect):
         # Debug messages
-        y_offset = 300
-        title = self.font.render("STATUS MESSAGES:", True, (255, 0, 0))
-        self.screen.blit(title, (20, y_offset))
-        y_offset += 30
+        self.screen.blit(self._text(self.font, "STATUS MESSAGES:", (255, 0, 0)), (20, rect.top))
+        y_offset = rect.top + 30
         
         for i, message in enumerate(self.debug_messages):
             color = (255, 100, 100) if "ERROR" in message else (100, 255, 100) if "SUCCESS" in message else (200, 200, 200)
-            text = self.small_font.render(message, True, color)
-            self.screen.blit(text, (20, y_offset + i * 18))
-        
-        # Stats
-        stats_y = 550
+            self.screen.blit(self._text(self.small_font, message, color), (20, y_offset + i * 18))
+    
+    def _draw_stats(self, rect):
         stats = [
             f"Translations saved: {len(self.saved_translations)}",
             f"Current paragraph: {len(self.current_paragraph)} sentences",
             f"Audio buffer: {len(self.audio_buffer) / (16000 * 2):.1f}s"
         ]
+        if self.long_session:
+            stats.append(f"RSS: {current_rss_bytes() / (1024 * 1024):.0f} MB")
         
         for i, stat in enumerate(stats):
-            text = self.small_font.render(stat, True, (128, 128, 255))
-            self.screen.blit(text, (20 + i * 250, stats_y))
-        
+            self.screen.blit(self._text(self.small_font, stat, (128, 128, 255)), (20 + i * 250, rect.top))
+    
+    def _draw_footer(self, rect):
         # Controls
-        controls = self.small_font.render("Press Q to quit | S to show file location", True, (128, 128, 255))
-        self.screen.blit(controls, (20, 570))
-        
-        pygame.display.flip()
+        controls = "Press Q to quit | S to show file location"
+        self.screen.blit(self._text(self.small_font, controls, (128, 128, 255)), (20, rect.top + 2))
+    
+    def update_display(self):
+        """Redraw the regions that changed since the last update"""
+        self.renderer.render()
     
     def show_file_location(self):
         """Show where the file is saved"""
@@ -261,18 +321,35 @@ class FixedTranslator:
         self.add_debug(f"Translation file: {file_path}")
         return file_path
     
+    def _collect_audio(self):
+        """Move captured audio from the queue into the recognition buffer"""
+        try:
+            while True:  # Empty the queue
+                audio_data = self.audio_queue.get_nowait()
+                self.audio_buffer.extend(audio_data)
+                self.samples_captured += len(audio_data) // 2
+                if self.speaker_detector is not None:
+                    self.speaker_detector.feed(audio_data)
+        except queue.Empty:
+            pass
+        
+        # Limit buffer size
+        while len(self.audio_buffer) > 16000 * 2 * 5:  # Max 5 seconds
+            del self.audio_buffer[:16000 * 2]  # Remove oldest second in place
+    
     def run(self):
         """Main loop"""
         self.add_debug("Fixed translator started with sounddevice backend")
         self.add_debug("Real-time translation active - speaking Italian should be translated automatically")
         self.add_debug(f"Translations will be saved to: {self.output_file}")
         
+        # Event-driven: sleep until an input event or one of the timers fires
+        pygame.time.set_timer(self.PROCESS_AUDIO_EVENT, 3000)  # process audio every 3 seconds
+        pygame.time.set_timer(self.STATS_EVENT, 1000)
         running = True
-        last_process_time = time.time()
         
         while running:
-            # Handle events
-            for event in pygame.event.get():
+            for event in [pygame.event.wait()] + pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
@@ -281,27 +358,20 @@ class FixedTranslator:
                     elif event.key == pygame.K_s:
                         file_path = self.show_file_location()
                         self.add_debug(f"File location: {file_path}")
-            
-            # Collect audio data
-            try:
-                while True:  # Empty the queue
-                    audio_data = self.audio_queue.get_nowait()
-                    self.audio_buffer.extend(audio_data)
-            except queue.Empty:
-                pass
-            
-            # Process audio every 3 seconds
-            current_time = time.time()
-            if current_time - last_process_time > 3.0 and len(self.audio_buffer) > 0:
-                self.process_audio_buffer()
-                last_process_time = current_time
-            
-            # Limit buffer size
-            if len(self.audio_buffer) > 16000 * 2 * 5:  # Max 5 seconds
-                self.audio_buffer = self.audio_buffer[16000 * 2:]  # Remove oldest second
+                elif event.type == self.PROCESS_AUDIO_EVENT:
+                    self._collect_audio()
+                    if len(self.audio_buffer) > 0:
+                        self.process_audio_buffer()
+                elif event.type == self.STATS_EVENT:
+                    self.renderer.invalidate('stats')
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT):
+                    self.renderer.invalidate()
             
             self.update_display()
-            pygame.time.delay(50)
+        
+        pygame.time.set_timer(self.PROCESS_AUDIO_EVENT, 0)
+        pygame.time.set_timer(self.STATS_EVENT, 0)
+        print(self.text_cache.report())
         
         # Save final summary
         self._save_final_summary()
@@ -322,12 +392,23 @@ class FixedTranslator:
             f.write(f"Ended: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"Total translations: {len(self.saved_translations)}\n")
             f.write("=" * 60 + "\n")
+        self.saved_translations.close()
         
         self.add_debug(f"Final summary saved to {self.output_file}")
         print(f"\n=== TRANSLATION COMPLETE ===")
         print(f"All translations saved to: {os.path.abspath(self.output_file)}")
         print(f"Total translations recorded: {len(self.saved_translations)}")
+        if self.memory is not None:
+            print(self.saved_translations.report())
+            print(self.memory.report())
+        if self.speaker_detector is not None:
+            print(self.speaker_detector.report())
+        if self.language_id is not None:
+            print(self.language_id.report())
 
 if __name__ == "__main__":
-    translator = FixedTranslator()
+    # Optional source language: 'it' (default), another code, or 'auto' / 'auto:it,en'
+    # Optional --long-session: spill history beyond 100 segments to disk and report memory
+    args = [arg for arg in sys.argv[1:] if arg != '--long-session']
+    translator = FixedTranslator(source_lang=args[0] if args else 'it', long_session='--long-session' in sys.argv)
     translator.run()
\ No newline at end of file
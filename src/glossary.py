@@ -0,0 +1,217 @@
+import os
+import re
+import sys
+import threading
+import time
+
+# Glossary file: tab-separated, the first non-comment line names the language
+# of each column, every following line is one term in those languages.
+#
+#   it                          en                          de
+#   intelligenza artificiale    artificial intelligence     künstliche Intelligenz
+#   Mario Rossi                 Mario Rossi                 Mario Rossi
+#
+# Empty cells are allowed. Lines starting with '#' are comments.
+
+# Protected terms are swapped for tokens the translation service passes
+# through untouched, then replaced with the glossary translation
+PLACEHOLDER = "ZX{}QJ"
+PLACEHOLDER_PATTERN = re.compile(r"Z\s*X\s*(\d+)\s*Q\s*J", re.IGNORECASE)
+
+
+def _fold(text):
+    """Lowercase without changing the length, so match offsets apply to the original text"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class TermMatcher:
+    """Aho–Corasick automaton over a set of terms
+
+    Matching walks the text once, so the cost depends on the text length
+    and the number of matches, not on how many terms the glossary has.
+    Matching is case-insensitive and only accepts whole words.
+    """
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self.terms = []
+        for term in terms:
+            self._add(_fold(term))
+        self._build()
+
+    def _add(self, term):
+        if not term:
+            return
+        state = 0
+        for ch in term:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append(len(self.terms))
+        self.terms.append(term)
+
+    def _build(self):
+        queue = list(self.goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text):
+        """Non-overlapping whole-word matches as (start, end, term_id), leftmost-longest first"""
+        folded = _fold(text)
+        goto, fail, output, terms = self.goto, self.fail, self.output, self.terms
+        candidates = []
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for term_id in output[state]:
+                end = i + 1
+                start = end - len(terms[term_id])
+                if (start == 0 or not folded[start - 1].isalnum()) and (end == len(folded) or not folded[end].isalnum()):
+                    candidates.append((start, -end, term_id))
+
+        matches = []
+        position = 0
+        for start, neg_end, term_id in sorted(candidates):
+            if start >= position:
+                matches.append((start, -neg_end, term_id))
+                position = -neg_end
+        return matches
+
+
+class Glossary:
+    """User terminology applied around the translation backend
+
+    Terms found in the source text are replaced by placeholders before the
+    text is sent for translation and by the glossary's target term after,
+    so names and domain terms come out the same in every segment. The file
+    is re-read automatically when it changes.
+    """
+
+    def __init__(self, path, reload_interval=2.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._columns = []
+        self._rows = []
+        self._matchers = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self.segments = 0
+        self.terms_applied = 0
+        self.placeholders_lost = 0
+        self.match_ns = 0
+        self.reloads = 0
+        self._load()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            lines = [line.rstrip("\n") for line in f if line.strip() and not line.lstrip().startswith("#")]
+        columns = [column.strip().lower() for column in lines[0].split("\t")] if lines else []
+        rows = [[cell.strip() for cell in line.split("\t")] for line in lines[1:]]
+        self._columns = columns
+        self._rows = rows
+        self._matchers = {}
+        self._mtime = os.stat(self.path).st_mtime
+
+    def _check_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            if os.stat(self.path).st_mtime == self._mtime:
+                return
+            self._load()
+            self.reloads += 1
+            print(f"📖 Glossary reloaded: {len(self._rows)} terms from {self.path}")
+        except (OSError, UnicodeDecodeError) as e:
+            # Keep the previous glossary while the file is being edited or is missing
+            print(f"⚠️  Glossary reload failed, keeping previous terms: {e}")
+        sys.stdout.flush()
+
+    def _matcher(self, source, target):
+        """Compiled matcher and target terms for one language pair (built on first use)"""
+        with self._lock:
+            self._check_reload()
+            key = (source, target)
+            if key not in self._matchers:
+                entries = {}
+                if source in self._columns and target in self._columns:
+                    s, t = self._columns.index(source), self._columns.index(target)
+                    for row in self._rows:
+                        if len(row) > max(s, t) and row[s] and row[t]:
+                            entries[_fold(row[s])] = row[t]
+                matcher = TermMatcher(entries)
+                self._matchers[key] = (matcher, [entries[term] for term in matcher.terms])
+            return self._matchers[key]
+
+    def protect(self, text, source, target):
+        """Replace glossary terms with placeholders; returns the text and the target terms"""
+        start_ns = time.perf_counter_ns()
+        matcher, replacements = self._matcher(source, target)
+        parts = []
+        terms = []
+        position = 0
+        for start, end, term_id in matcher.find(text):
+            parts.append(text[position:start])
+            parts.append(PLACEHOLDER.format(len(terms)))
+            terms.append(replacements[term_id])
+            position = end
+        parts.append(text[position:])
+        self.match_ns += time.perf_counter_ns() - start_ns
+        return "".join(parts), terms
+
+    def restore(self, translated, terms):
+        """Put the target terms back in place of the placeholders"""
+        seen = set()
+
+        def substitute(match):
+            index = int(match.group(1))
+            if index >= len(terms):
+                return match.group(0)
+            seen.add(index)
+            return terms[index]
+
+        restored = PLACEHOLDER_PATTERN.sub(substitute, translated)
+        self.placeholders_lost += len(terms) - len(seen)
+        return restored
+
+    def translate(self, text, source, target, translate):
+        """Translate `text` with the `translate(text)` callable, enforcing the glossary"""
+        protected, terms = self.protect(text, source, target)
+        self.segments += 1
+        if not terms:
+            return translate(text)
+        self.terms_applied += len(terms)
+        if not PLACEHOLDER_PATTERN.sub("", protected).strip(" \t.,;:!?"):
+            # The whole segment is glossary terms: no request needed
+            return self.restore(protected, terms)
+        return self.restore(translate(protected), terms)
+
+    def report(self):
+        per_segment = self.match_ns / 1e3 / self.segments if self.segments else 0.0
+        return (f"Glossary: {len(self._rows)} terms | applied {self.terms_applied} in {self.segments} segments | "
+                f"lost placeholders {self.placeholders_lost} | match {per_segment:.0f} µs/segment | "
+                f"reloads {self.reloads}")
@@ -9,6 +9,8 @@ import sounddevice as sd
 import numpy as np
 import queue
 
+from languages import recognizer_locale, translator_code
+
 class GUITranslator:
     def __init__(self, source_lang='it', target_lang='en'):
         self.recognizer = sr.Recognizer()
@@ -88,7 +90,7 @@ class GUITranslator:
             self.audio_buffer.clear()
             
             # Try recognition in source language
-            language_code = f'{self.source_lang}-{self.source_lang.upper()}'
+            language_code = recognizer_locale(self.source_lang)
             recognized_text = self.recognizer.recognize_google(audio_data, language=language_code)
             
             # Send recognized text to GUI immediately
@@ -96,7 +98,8 @@ class GUITranslator:
             sys.stdout.flush()
             
             # Translate to target language
-            translated_text = self.translator.translate(recognized_text, src=self.source_lang, dest=self.target_lang).text
+            translated_text = self.translator.translate(recognized_text, src=translator_code(self.source_lang),
+                                                     dest=translator_code(self.target_lang)).text
             
             # Send translated text to GUI immediately
             print(f"🌐 TRANSLATED: {translated_text}")
@@ -0,0 +1,194 @@
+import time
+from collections import Counter, OrderedDict, deque
+
+# Languages offered in the GUI's source list
+DEFAULT_CANDIDATES = ['it', 'en', 'es', 'fr', 'de', 'pt', 'ru', 'zh', 'ja', 'ko', 'ar', 'hi']
+
+# Very common function words; enough to tell Latin-script languages apart
+# on a few recognized words without any network access
+STOPWORDS = {
+    'it': {'il', 'lo', 'la', 'gli', 'le', 'di', 'che', 'è', 'e', 'non', 'un', 'una', 'per', 'con', 'sono',
+           'mi', 'ma', 'come', 'questo', 'questa', 'anche', 'del', 'della', 'ci', 'si', 'ho', 'cosa', 'perché'},
+    'en': {'the', 'and', 'is', 'are', 'to', 'of', 'a', 'in', 'that', 'it', 'you', 'i', 'we', 'this', 'for',
+           'with', 'not', 'be', 'have', 'what', 'so', 'on', 'do', 'can', 'was', 'will', 'they'},
+    'es': {'el', 'la', 'los', 'las', 'de', 'que', 'y', 'es', 'en', 'un', 'una', 'por', 'con', 'no', 'para',
+           'se', 'lo', 'como', 'pero', 'está', 'muy', 'sí', 'yo', 'del', 'también', 'qué', 'hay'},
+    'fr': {'le', 'la', 'les', 'de', 'des', 'et', 'est', 'un', 'une', 'que', 'qui', 'pas', 'je', 'vous', 'nous',
+           'il', 'en', 'pour', 'dans', 'ce', 'c\'est', 'sur', 'avec', 'mais', 'très', 'oui', 'du'},
+    'de': {'der', 'die', 'das', 'und', 'ist', 'nicht', 'ich', 'sie', 'wir', 'ein', 'eine', 'zu', 'den', 'mit',
+           'es', 'auf', 'für', 'auch', 'von', 'dem', 'aber', 'sind', 'wie', 'was', 'noch', 'ja', 'haben'},
+    'pt': {'o', 'a', 'os', 'as', 'de', 'que', 'e', 'é', 'do', 'da', 'em', 'um', 'uma', 'para', 'com', 'não',
+           'se', 'na', 'no', 'mas', 'por', 'eu', 'você', 'muito', 'isso', 'está', 'também'},
+}
+
+# Languages identified by their writing system
+SCRIPT_RANGES = [
+    ('ja', ((0x3040, 0x309F), (0x30A0, 0x30FF))),  # Hiragana, Katakana
+    ('ko', ((0xAC00, 0xD7AF), (0x1100, 0x11FF))),  # Hangul
+    ('zh', ((0x4E00, 0x9FFF),)),                    # CJK ideographs (also used by Japanese)
+    ('ru', ((0x0400, 0x04FF),)),                    # Cyrillic
+    ('ar', ((0x0600, 0x06FF),)),                    # Arabic
+    ('hi', ((0x0900, 0x097F),)),                    # Devanagari
+]
+
+
+class StopwordDetector:
+    """Offline text language detector based on writing system and stop words"""
+
+    def __init__(self, candidates=None):
+        self.candidates = list(candidates or DEFAULT_CANDIDATES)
+
+    def _script_language(self, text):
+        counts = Counter()
+        for char in text:
+            code = ord(char)
+            if code < 0x0400:
+                continue
+            for lang, ranges in SCRIPT_RANGES:
+                if any(low <= code <= high for low, high in ranges):
+                    counts[lang] += 1
+                    break
+        if not counts:
+            return None, 0.0
+        # Kana anywhere means Japanese even when most characters are kanji
+        if counts['ja']:
+            return 'ja', 1.0
+        lang, count = counts.most_common(1)[0]
+        return lang, count / sum(counts.values())
+
+    def detect(self, text):
+        """Return (language, confidence) for a piece of text"""
+        lang, confidence = self._script_language(text)
+        if lang is not None and lang in self.candidates:
+            return lang, confidence
+
+        words = [w.strip('.,;:!?¿¡"()').lower() for w in text.split()]
+        words = [w for w in words if w]
+        if not words:
+            return None, 0.0
+
+        scores = {}
+        for candidate in self.candidates:
+            stopwords = STOPWORDS.get(candidate)
+            if stopwords:
+                scores[candidate] = sum(1 for w in words if w in stopwords)
+        if not scores:
+            return None, 0.0
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best, best_score = ranked[0]
+        if best_score == 0:
+            return None, 0.0
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0
+        # Confidence grows with the margin over the runner-up and with how much evidence there is
+        margin = (best_score - runner_up) / best_score
+        evidence = min(1.0, best_score / 3.0)
+        return best, round(margin * evidence, 3)
+
+
+class LanguageIdentifier:
+    """Per-segment source-language identification with a session prior and a decision cache
+
+    The recognizer runs with the current prior; the recognized text is then
+    checked by a local detector. Detection is skipped while recent decisions
+    agree with the prior (re-checked every `recheck_every` segments), and
+    results are cached by text so repeats cost nothing.
+    """
+
+    def __init__(self, candidates=None, prior=None, detector=None, min_confidence=0.5,
+                 recheck_every=4, history_size=12, cache_size=256):
+        self.candidates = list(candidates or DEFAULT_CANDIDATES)
+        self.detector = detector or StopwordDetector(self.candidates)
+        self.min_confidence = min_confidence
+        self.recheck_every = recheck_every
+        self.history = deque(maxlen=history_size)
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.prior = prior or self.candidates[0]
+        self._segments_since_check = recheck_every  # detect on the first segment
+
+        # Statistics, reported separately from recognition latency
+        self.detections = 0
+        self.cache_hits = 0
+        self.skipped = 0
+        self.switches = 0
+        self.total_ns = 0
+        self.last_latency_ms = 0.0
+        self.last_confidence = 0.0
+        self.last_source = "prior"
+
+    def current(self):
+        """Language to recognize the next segment with"""
+        return self.prior
+
+    def note_failure(self):
+        """Nothing was recognized with the prior; force a detection next time"""
+        self._segments_since_check = self.recheck_every
+
+    def _stable(self):
+        return (len(self.history) >= 2
+                and all(lang == self.prior for lang in list(self.history)[-3:])
+                and self._segments_since_check < self.recheck_every)
+
+    def _detect(self, text):
+        key = text.strip().lower()
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            self.last_source = "cache"
+            return cached
+
+        result = self.detector.detect(text)
+        self.detections += 1
+        self.last_source = "detector"
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def decide(self, text):
+        """Return the source language for a segment recognized with the current prior"""
+        start = time.perf_counter_ns()
+        self._segments_since_check += 1
+
+        if self._stable():
+            self.skipped += 1
+            self.last_source = "prior"
+            lang, confidence = self.prior, self.last_confidence
+        else:
+            self._segments_since_check = 0
+            lang, confidence = self._detect(text)
+            if lang is None or lang not in self.candidates or confidence < self.min_confidence:
+                lang = self.prior
+
+        self.history.append(lang)
+        # The session prior follows the majority of recent decisions
+        majority = Counter(self.history).most_common(1)[0][0]
+        if lang != self.prior and (majority == lang or confidence >= 0.8):
+            self.prior = lang
+            self.switches += 1
+
+        elapsed = time.perf_counter_ns() - start
+        self.total_ns += elapsed
+        self.last_latency_ms = elapsed / 1e6
+        self.last_confidence = confidence
+        return lang
+
+    def report(self):
+        """One-line summary of detection work and latency"""
+        decisions = self.detections + self.cache_hits + self.skipped
+        average_ms = self.total_ns / decisions / 1e6 if decisions else 0.0
+        return (f"LID: prior {self.prior} | decisions {decisions} | detector runs {self.detections} | "
+                f"cache hits {self.cache_hits} | skipped {self.skipped} | switches {self.switches} | "
+                f"avg {average_ms:.3f} ms")
+
+
+def parse_source(value):
+    """Parse a source-language argument: 'it', 'auto' or 'auto:it,en' (first entry is the prior)"""
+    if not value.startswith('auto'):
+        return value, None
+    candidates = None
+    if ':' in value:
+        candidates = [lang.strip() for lang in value.split(':', 1)[1].split(',') if lang.strip()]
+    return 'auto', candidates or list(DEFAULT_CANDIDATES)
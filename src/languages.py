@@ -0,0 +1,85 @@
+# Language code tables shared by the recognizer and the translator.
+#
+# The GUI and the command line use bare ISO 639-1 codes ('it', 'en', ...).
+# Google Speech Recognition needs a full locale, and deriving it as
+# f'{lang}-{lang.upper()}' is wrong for most languages (en-EN, ja-JA, zh-ZH),
+# so the locale is looked up here instead.
+
+RECOGNIZER_LOCALES = {
+    'ar': 'ar-SA',
+    'de': 'de-DE',
+    'en': 'en-US',
+    'es': 'es-ES',
+    'fr': 'fr-FR',
+    'hi': 'hi-IN',
+    'it': 'it-IT',
+    'ja': 'ja-JP',
+    'ko': 'ko-KR',
+    'nl': 'nl-NL',
+    'pl': 'pl-PL',
+    'pt': 'pt-BR',
+    'ru': 'ru-RU',
+    'sv': 'sv-SE',
+    'tr': 'tr-TR',
+    'zh': 'zh-CN',
+}
+
+# googletrans uses bare codes except for Chinese
+TRANSLATOR_CODES = {
+    'zh': 'zh-cn',
+}
+
+LANGUAGE_NAMES = {
+    'ar': 'Arabic',
+    'de': 'German',
+    'en': 'English',
+    'es': 'Spanish',
+    'fr': 'French',
+    'hi': 'Hindi',
+    'it': 'Italian',
+    'ja': 'Japanese',
+    'ko': 'Korean',
+    'nl': 'Dutch',
+    'pl': 'Polish',
+    'pt': 'Portuguese',
+    'ru': 'Russian',
+    'sv': 'Swedish',
+    'tr': 'Turkish',
+    'zh': 'Chinese',
+}
+
+
+def base_language(lang):
+    """Return the bare language code for a code or locale ('pt-BR' -> 'pt')"""
+    return lang.replace('_', '-').split('-')[0].lower()
+
+
+def recognizer_locale(lang):
+    """Return the Google Speech Recognition locale for a language code"""
+    if '-' in lang or '_' in lang:
+        # Already a full locale such as 'en-GB'
+        return lang.replace('_', '-')
+    return RECOGNIZER_LOCALES.get(lang.lower(), lang)
+
+
+def translator_code(lang):
+    """Return the googletrans language code for a language code or locale"""
+    base = base_language(lang)
+    return TRANSLATOR_CODES.get(base, base)
+
+
+def language_name(lang):
+    """Return the English name of a language, or the upper-cased code if unknown"""
+    return LANGUAGE_NAMES.get(base_language(lang), lang.upper())
+
+
+def parse_targets(value):
+    """Parse one or more target languages ('en', 'en,de,es' or a list) into a de-duplicated list"""
+    if isinstance(value, str):
+        value = value.split(',')
+    targets = []
+    for lang in value:
+        lang = lang.strip()
+        if lang and lang not in targets:
+            targets.append(lang)
+    return targets or ['en']
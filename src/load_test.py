@@ -0,0 +1,387 @@
+import argparse
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import types
+import wave
+import zlib
+
+import numpy as np
+
+# standalone_translator.py lives in the repository root, one level above src/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import standalone_translator
+from session_history import current_rss_bytes
+
+SAMPLE_RATE = 16000
+# Windows quieter than this (int16 RMS) are "no speech" for the stub recognizer
+SILENCE_RMS = 300.0
+VOCABULARY = ("allora", "dobbiamo", "parlare", "del", "progetto", "questa", "settimana", "il", "cliente",
+              "vuole", "una", "nuova", "versione", "entro", "venerdì", "però", "manca", "ancora", "il",
+              "budget", "per", "la", "fase", "due", "quindi", "propongo", "di", "rivedere", "le", "priorità")
+
+
+class LatencyModel:
+    """Seeded latency and failure draws for one simulated backend
+
+    Latencies are log-normal around `median` seconds (`sigma` is the spread
+    of the underlying normal); with probability `spike_rate` a request is
+    `spike_factor` times slower, and with probability `error_rate` it fails.
+    Every draw is seeded from the request's content, so a request gets the
+    same latency and outcome in every run whatever the thread scheduling.
+    """
+
+    def __init__(self, name, median, sigma=0.5, spike_rate=0.02, spike_factor=8.0, error_rate=0.01, seed=0):
+        self.name = name
+        self.median = median
+        self.sigma = sigma
+        self.spike_rate = spike_rate
+        self.spike_factor = spike_factor
+        self.error_rate = error_rate
+        self.seed = seed
+        self.calls = 0
+        self.spikes = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def draw(self, key):
+        """(latency in seconds, failed, rng for the response) for one request"""
+        rng = random.Random(f"{self.seed}:{self.name}:{key}")
+        latency = self.median * math.exp(self.sigma * rng.gauss(0.0, 1.0))
+        spiked = rng.random() < self.spike_rate
+        if spiked:
+            latency *= self.spike_factor
+        failed = rng.random() < self.error_rate
+        with self._lock:
+            self.calls += 1
+            self.spikes += spiked
+            self.failures += failed
+        return latency, failed, rng
+
+    def report(self):
+        return (f"{self.name}: {self.calls} calls, {self.spikes} tail spikes, {self.failures} failures "
+                f"(log-normal median {1e3 * self.median:.0f} ms, sigma {self.sigma})")
+
+
+class UnknownValueError(Exception):
+    pass
+
+
+class RequestError(Exception):
+    pass
+
+
+class StubAudioData:
+    def __init__(self, frame_data, sample_rate, sample_width):
+        self.frame_data = frame_data
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+
+
+class StubRecognizer:
+    """Answers recognize_google like Google would, after a simulated network delay"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def recognize_google(self, audio_data, language=None, show_all=False):
+        latency, failed, rng = self.model.draw(zlib.crc32(audio_data.frame_data))
+        time.sleep(latency)
+        if failed:
+            raise RequestError("simulated recognizer failure")
+        pcm = np.frombuffer(audio_data.frame_data, dtype=np.int16).astype(np.float32)
+        if not len(pcm) or float(np.sqrt(np.mean(pcm * pcm))) < SILENCE_RMS:
+            if show_all:
+                return []
+            raise UnknownValueError()
+        seconds = len(pcm) / audio_data.sample_rate
+        text = " ".join(rng.choice(VOCABULARY) for _ in range(max(1, int(2.5 * seconds))))
+        if rng.random() < 0.4:
+            text += "."
+        if show_all:
+            return {"alternative": [{"transcript": text, "confidence": round(rng.uniform(0.6, 0.98), 3)}],
+                    "final": True}
+        return text
+
+
+class StubTranslator:
+    """googletrans.Translator stand-in with a simulated network delay"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def translate(self, text, src="auto", dest="en"):
+        latency, failed, _ = self.model.draw(f"{src}:{dest}:{text}")
+        time.sleep(latency)
+        if failed:
+            raise Exception("simulated translator failure")
+        return types.SimpleNamespace(text=f"<{dest}> {text}", src=src, dest=dest)
+
+
+def install_stub_backends(recognize_model, translate_model):
+    """Register stub speech_recognition/googletrans modules, so every backend call in this process is simulated"""
+    sr = types.ModuleType("speech_recognition")
+    sr.AudioData = StubAudioData
+    sr.UnknownValueError = UnknownValueError
+    sr.RequestError = RequestError
+    sr.Recognizer = lambda: StubRecognizer(recognize_model)
+    gt = types.ModuleType("googletrans")
+    gt.Translator = lambda: StubTranslator(translate_model)
+    sys.modules["speech_recognition"] = sr
+    sys.modules["googletrans"] = gt
+
+
+def synthesize_speech(path, seconds, seed, sample_rate=SAMPLE_RATE):
+    """Write a deterministic speech-like WAV: voiced utterances of 1.5-6 s separated by 0.3-1.2 s pauses"""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    signal = rng.normal(0.0, 0.002, total)
+    position = int(rng.uniform(0.2, 1.0) * sample_rate)
+    while position < total:
+        length = min(int(rng.uniform(1.5, 6.0) * sample_rate), total - position)
+        t = np.arange(length) / sample_rate
+        # A gliding pitch with five harmonics, loudness modulated at a syllable rate
+        pitch = rng.uniform(100, 220) * (1.0 + 0.05 * np.sin(2 * np.pi * rng.uniform(0.5, 2.0) * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+        voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+        syllables = 0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(3.0, 5.0) * t)
+        signal[position:position + length] += 0.2 * voice * syllables
+        position += length + int(rng.uniform(0.3, 1.2) * sample_rate)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes((np.clip(signal, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def slope(points):
+    """Least-squares slope of (x, y) points"""
+    if len(points) < 2:
+        return 0.0
+    xs, ys = np.array([p[0] for p in points]), np.array([p[1] for p in points])
+    spread = float(((xs - xs.mean()) ** 2).sum())
+    return float(((xs - xs.mean()) * (ys - ys.mean())).sum() / spread) if spread else 0.0
+
+
+class LoadStream(standalone_translator.StandaloneTranslator):
+    """A StandaloneTranslator that keeps every delivered sentence's latencies for the load test"""
+
+    def __init__(self, *args, **kwargs):
+        self.records = []
+        super().__init__(*args, **kwargs)
+
+    def _observe_latencies(self, segment):
+        super()._observe_latencies(segment)
+        # Caption delay: from the moment the sentence's last sample was captured to the transcript
+        started = self.capture_monitor.started_at if self.capture_monitor is not None else None
+        delay = time.monotonic() - started - segment.end_sample / segment.sample_rate if started else None
+        self.records.append((segment.elapsed_ns() / 1e9, segment.recognize_ns / 1e9,
+                             segment.translate_ns / 1e9, delay))
+
+    def recognized_samples(self):
+        return self.samples_captured - len(self.audio_buffer) // 2
+
+    def backlog_seconds(self):
+        """Audio captured but not yet handed to the recognizer"""
+        if self.capture_monitor is None:
+            return 0.0
+        return max(0, self.capture_monitor.position - self.recognized_samples()) / self.sample_rate
+
+
+class LoadTest:
+    """Runs `streams` live pipelines at once on synthetic audio against simulated backends
+
+    Each stream is a full StandaloneTranslator (capture from a real-time
+    paced WAV file, preprocessing, sentence assembly, the translation pool
+    and transcript files) on its own loop thread; only the network
+    backends are replaced by seeded stubs. While the streams run the
+    harness samples every stream's backlog (audio captured but not yet
+    recognized) and audio queue once a second. A host is saturated at this
+    stream count when the backlog keeps growing after warm-up.
+    """
+
+    def __init__(self, streams, duration, workdir, source_lang="it", target_lang="en", sentence_delay=6.0,
+                 seed=0, recognize=None, translate=None, warmup=0.25, max_growth=0.05):
+        self.streams = streams
+        self.duration = duration
+        self.workdir = workdir
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.sentence_delay = sentence_delay
+        self.seed = seed
+        self.recognize = recognize or LatencyModel("recognizer", 0.4, seed=seed)
+        self.translate = translate or LatencyModel("translator", 0.15, sigma=0.4, seed=seed)
+        self.warmup = warmup
+        self.max_growth = max_growth
+        self.result = None
+
+    def _streams(self):
+        translators = []
+        for i in range(self.streams):
+            folder = os.path.join(self.workdir, f"{self.streams}_streams", f"stream_{i}")
+            os.makedirs(folder, exist_ok=True)
+            wav = os.path.join(folder, "input.wav")
+            # Same seed, same audio per stream index, so levels are comparable
+            synthesize_speech(wav, self.duration + 10, self.seed * 1000 + i)
+            translators.append(LoadStream(self.source_lang, self.target_lang, folder, input_source=wav,
+                                          sentence_delay=self.sentence_delay))
+        return translators
+
+    def run(self):
+        install_stub_backends(self.recognize, self.translate)
+        rss_before = current_rss_bytes()
+        translators = self._streams()
+        threads = [threading.Thread(target=t.run_translation_loop, name=f"load-stream-{i}", daemon=True)
+                   for i, t in enumerate(translators)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+
+        backlog, queues = [], []
+        while time.monotonic() - started < self.duration:
+            time.sleep(1.0)
+            now = time.monotonic() - started
+            backlog.append((now, sum(t.backlog_seconds() for t in translators) / len(translators)))
+            queues.append(max(t.audio_queue.qsize() for t in translators))
+        elapsed = time.monotonic() - started
+        rss_after = current_rss_bytes()
+        recognized = sum(t.recognized_samples() for t in translators) / SAMPLE_RATE
+
+        for t in translators:
+            t.is_listening = False
+        for thread in threads:
+            thread.join(timeout=30)
+
+        records = [r for t in translators for r in t.records]
+        steady = [point for point in backlog if point[0] >= self.warmup * self.duration]
+        growth = slope(steady)
+        self.result = {
+            "streams": self.streams,
+            "elapsed": elapsed,
+            "audio_per_second": recognized / elapsed,
+            "sentences_per_second": len(records) / elapsed,
+            "sentences": len(records),
+            "end_to_end": [r[0] for r in records],
+            "recognize": [r[1] for r in records],
+            "translate": [r[2] for r in records],
+            "caption_delay": [r[3] for r in records if r[3] is not None],
+            "backlog_growth": growth,
+            "max_backlog": max((point[1] for point in backlog), default=0.0),
+            "max_queue": max(queues, default=0),
+            "memory_per_stream": (rss_after - rss_before) / self.streams,
+            "saturated": growth > self.max_growth,
+        }
+        return self.result
+
+    def report(self):
+        r = self.result
+        mb = 1024 * 1024
+
+        def spread(name):
+            values = r[name]
+            return (f"p50 {percentile(values, 50):.2f} / p90 {percentile(values, 90):.2f} / "
+                    f"p99 {percentile(values, 99):.2f} s")
+
+        return "\n".join([
+            f"{r['streams']} streams × {r['elapsed']:.0f}s: {'SATURATED' if r['saturated'] else 'keeping up'}",
+            f"  throughput     {r['audio_per_second']:.2f} audio-s/s ({r['audio_per_second'] / r['streams']:.2f}× "
+            f"real time per stream), {r['sentences_per_second']:.2f} sentences/s ({r['sentences']} sentences)",
+            f"  end-to-end     {spread('end_to_end')}",
+            f"  caption delay  {spread('caption_delay')}",
+            f"  recognize      {spread('recognize')} | translate {spread('translate')}",
+            f"  backlog        {60 * r['backlog_growth']:+.2f} s/min per stream after warm-up "
+            f"(max {r['max_backlog']:.1f} s) | audio queue max {r['max_queue']} blocks",
+            f"  memory         {r['memory_per_stream'] / mb:+.1f} MB RSS per stream",
+            f"  {self.recognize.report()}",
+            f"  {self.translate.report()}",
+        ])
+
+
+def main(argv=None):
+    """Command line entry point: find how many live streams this host sustains"""
+    parser = argparse.ArgumentParser(description="Load-test the live pipeline with synthetic streams and "
+                                                 "simulated recognition/translation backends")
+    parser.add_argument("source_lang", nargs="?", default="it")
+    parser.add_argument("target_lang", nargs="?", default="en",
+                        help="target language, comma-separated for several (e.g. en,de,es)")
+    parser.add_argument("--streams", default="1,2,4,8", metavar="N[,N...]",
+                        help="concurrent streams; a list runs one level after another (default 1,2,4,8)")
+    parser.add_argument("--duration", type=float, default=60.0, metavar="SECONDS",
+                        help="how long each level runs (default 60)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the audio and every backend draw")
+    parser.add_argument("--recognize-latency", type=float, default=0.4, metavar="SECONDS",
+                        help="median recognizer latency (default 0.4)")
+    parser.add_argument("--translate-latency", type=float, default=0.15, metavar="SECONDS",
+                        help="median translator latency (default 0.15)")
+    parser.add_argument("--sigma", type=float, default=0.5, help="log-normal spread of both latencies (default 0.5)")
+    parser.add_argument("--spike-rate", type=float, default=0.02,
+                        help="share of requests in the slow tail (default 0.02)")
+    parser.add_argument("--spike-factor", type=float, default=8.0,
+                        help="how much slower a tail request is (default 8)")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="share of requests that fail (default 0.01)")
+    parser.add_argument("--sentence-delay", type=float, default=6.0, metavar="SECONDS",
+                        help="sentence assembly deadline, as in the live translator (default 6)")
+    parser.add_argument("--max-growth", type=float, default=0.05, metavar="SECONDS",
+                        help="backlog growth per second of audio that counts as saturated (default 0.05)")
+    parser.add_argument("--output", metavar="DIR",
+                        help="keep transcripts and the pipeline log here (default: a temporary folder)")
+    args = parser.parse_args(argv)
+
+    levels = [int(n) for n in args.streams.split(",") if n.strip()]
+    workdir = args.output or tempfile.mkdtemp(prefix="rt_load_test_")
+    os.makedirs(workdir, exist_ok=True)
+    log_path = os.path.join(workdir, "load_test.log")
+    sustained = None
+    try:
+        for streams in levels:
+            test = LoadTest(
+                streams, args.duration, workdir, args.source_lang, args.target_lang, args.sentence_delay,
+                args.seed, max_growth=args.max_growth,
+                recognize=LatencyModel("recognizer", args.recognize_latency, args.sigma, args.spike_rate,
+                                       args.spike_factor, args.error_rate, args.seed),
+                translate=LatencyModel("translator", args.translate_latency, args.sigma, args.spike_rate,
+                                       args.spike_factor, args.error_rate, args.seed),
+            )
+            print(f"🏋️ Running {streams} streams for {args.duration:.0f}s...")
+            sys.stdout.flush()
+            # The pipelines' own progress output goes to the log, not between the reports
+            real_stdout = sys.stdout
+            with open(log_path, 'a', encoding='utf-8') as log:
+                sys.stdout = log
+                try:
+                    result = test.run()
+                finally:
+                    sys.stdout = real_stdout
+            print(test.report())
+            sys.stdout.flush()
+            if result["saturated"]:
+                break
+            sustained = streams
+    finally:
+        if not args.output:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if sustained is None:
+        print("🏋️ Saturated at the first level")
+    else:
+        print(f"🏋️ Highest sustained level: {sustained} streams")
+    if args.output:
+        print(f"📁 Transcripts and pipeline log: {workdir}")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
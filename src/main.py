@@ -1,13 +1,18 @@
 import pygame
 import sys
 import time
-from datetime import datetime
+from collections import deque
 from config import Config
 from audio_capture import AudioCapture
 from speech_to_text import SpeechToText
 from translator import TextTranslator
+from languages import recognizer_locale
+from render_cache import RegionRenderer, TextCache
+from segment import Segment
 
 class TeamsTranslator:
+    AUDIO_POLL_EVENT = pygame.USEREVENT + 1
+    
     def __init__(self, config):
         self.config = config
         
@@ -16,21 +21,27 @@ class TeamsTranslator:
             self.audio_capture = AudioCapture(
                 rate=config.SAMPLE_RATE,
                 chunk_size=config.CHUNK_SIZE,
-                channels=config.CHANNELS
+                channels=config.CHANNELS,
+                native_format=config.CAPTURE_NATIVE_FORMAT,
+                agc=config.AUTO_GAIN,
+                denoise=config.NOISE_SUPPRESSION,
+                source=config.INPUT_SOURCE
             )
         except ImportError as e:
             print(f"Audio capture initialization failed: {e}")
             print("Please install sounddevice: pip install sounddevice")
             sys.exit(1)
             
-        self.speech_to_text = SpeechToText(language=f'{config.SOURCE_LANGUAGE}-{config.SOURCE_LANGUAGE.upper()}')
+        self.speech_to_text = SpeechToText(language=recognizer_locale(config.SOURCE_LANGUAGE))
         self.translator = TextTranslator(
             src_lang=config.SOURCE_LANGUAGE,
-            dest_lang=config.TARGET_LANGUAGE
+            dest_lang=config.TARGET_LANGUAGE,
+            glossary_file=config.GLOSSARY_FILE
         )
         
         # For displaying translations
-        self.translated_lines = []
+        self.translated_lines = deque(maxlen=config.MAX_DISPLAY_LINES)
+        self.segment_counter = 0
         self.last_audio_time = time.time()
         self.audio_buffer_duration = 0
         
@@ -41,11 +52,23 @@ class TeamsTranslator:
         self.font = pygame.font.Font(None, self.config.FONT_SIZE)
         self.small_font = pygame.font.Font(None, 18)
         
+        # Cached text surfaces and per-region redraws instead of a full repaint every frame
+        self.text_cache = TextCache()
+        self._status_text = ""
+        self.renderer = RegionRenderer(self.screen)
+        self.renderer.add('title', (0, 0, 1000, 45), self._draw_title)
+        self.renderer.add('status', (0, 45, 1000, 30), self._draw_status)
+        self.renderer.add('captions', (0, 75, 1000, 370), self._draw_captions)
+        self.renderer.add('instructions', (0, 445, 1000, 55), self._draw_instructions)
+        
     def start(self):
         """Start the translation process"""
         print("Starting Teams Real-time Translator...")
         print("Press 'Q' to quit or close the window")
-        print("Make sure Teams audio is playing and microphone can capture it")
+        if self.config.INPUT_SOURCE == 'mic':
+            print("Make sure Teams audio is playing and microphone can capture it")
+        else:
+            print(f"Capturing audio directly from: {self.config.INPUT_SOURCE}")
         
         try:
             self.audio_capture.start_capture()
@@ -58,88 +81,102 @@ class TeamsTranslator:
             self.cleanup()
             
     def _main_loop(self):
-        """Main application loop"""
+        """Main application loop: sleeps until input or the audio poll timer, redraws only what changed"""
+        pygame.time.set_timer(self.AUDIO_POLL_EVENT, 100)
         running = True
         
         while running:
             # Handle events
-            for event in pygame.event.get():
+            for event in [pygame.event.wait()] + pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_q:
                         running = False
-            
-            # Process audio
-            self._process_audio()
+                elif event.type == self.AUDIO_POLL_EVENT:
+                    # Process audio
+                    self._process_audio()
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT):
+                    self.renderer.invalidate()
             
             # Update display
             self._update_display()
-            
-            # Cap the frame rate
-            pygame.time.delay(50)
+        
+        pygame.time.set_timer(self.AUDIO_POLL_EVENT, 0)
+        print(self.text_cache.report())
             
     def _process_audio(self):
         """Process audio data and perform translation"""
         audio_data = self.audio_capture.get_audio_data()
         
-        if audio_data:
+        while audio_data:
             self.speech_to_text.add_audio_data(audio_data)
             self.last_audio_time = time.time()
             self.audio_buffer_duration += len(audio_data) / (self.config.SAMPLE_RATE * 2)
+            audio_data = self.audio_capture.get_audio_data()
             
         # Process speech recognition periodically
         current_time = time.time()
         if current_time - self.last_audio_time > self.config.PHRASE_TIMEOUT and self.audio_buffer_duration > 1.0:
             print("Processing audio...")
+            self.segment_counter += 1
+            segment = Segment(self.segment_counter, self.config.SOURCE_LANGUAGE, sample_rate=self.config.SAMPLE_RATE)
             recognized_text = self.speech_to_text.recognize_speech()
+            segment.recognize_ns = segment.elapsed_ns()
             self.audio_buffer_duration = 0
             
             if recognized_text:
                 print(f"Recognized (Italian): {recognized_text}")
+                segment.source_text = recognized_text
+                segment.confidence = self.speech_to_text.last_confidence
+                segment.alternatives = [tuple(h) for h in self.speech_to_text.last_alternatives]
                 
                 # Translate the text
+                stage_start = time.monotonic_ns()
                 translated_text = self.translator.translate_text(recognized_text)
+                segment.translations = {self.config.TARGET_LANGUAGE: translated_text}
+                segment.translate_ns = time.monotonic_ns() - stage_start
                 print(f"Translated (English): {translated_text}")
                 
-                # Add to display lines
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                display_text = f"[{timestamp}] {translated_text}"
-                self.translated_lines.insert(0, display_text)
-                
-                # Keep only recent lines
-                if len(self.translated_lines) > self.config.MAX_DISPLAY_LINES:
-                    self.translated_lines = self.translated_lines[:self.config.MAX_DISPLAY_LINES]
+                # Newest first; the deque drops the oldest segment without reallocating
+                self.translated_lines.appendleft(segment)
+                self.renderer.invalidate('captions')
                     
                 self.last_audio_time = current_time
     
-    def _update_display(self):
-        """Update the display with translated text"""
-        self.screen.fill((0, 0, 0))  # Black background
-        
-        # Display title
-        title = self.font.render("Teams Real-time Translation (Italian → English)", True, (255, 255, 255))
+    def _draw_title(self, rect):
+        title = self.text_cache.render(self.font, "Teams Real-time Translation (Italian → English)", (255, 255, 255))
         self.screen.blit(title, (20, 20))
-        
-        # Display status
-        status = self.small_font.render("Status: Listening... | Buffer: {:.1f}s".format(self.audio_buffer_duration), True, (0, 255, 0))
-        self.screen.blit(status, (20, 50))
-        
-        # Display translated lines
-        y_offset = 80
+    
+    def _draw_status(self, rect):
+        status = self.text_cache.render(self.small_font, self._status_text, (0, 255, 0))
+        self.screen.blit(status, (20, rect.top + 5))
+    
+    def _draw_captions(self, rect):
+        y_offset = rect.top + 5
         if not self.translated_lines:
-            placeholder = self.font.render("Waiting for Italian audio...", True, (128, 128, 128))
+            placeholder = self.text_cache.render(self.font, "Waiting for Italian audio...", (128, 128, 128))
             self.screen.blit(placeholder, (20, y_offset))
         else:
-            for i, line in enumerate(self.translated_lines):
-                text_surface = self.font.render(line, True, (255, 255, 0))  # Yellow text
+            for i, segment in enumerate(self.translated_lines):
+                text_surface = self.text_cache.render(self.font, segment.caption(), (255, 255, 0))  # Yellow text
                 self.screen.blit(text_surface, (20, y_offset + i * 30))
-            
-        # Display instructions
-        instructions = self.small_font.render("Press 'Q' to quit | Make sure Teams audio is audible", True, (128, 128, 128))
-        self.screen.blit(instructions, (20, 450))
-        
-        pygame.display.flip()
+    
+    def _draw_instructions(self, rect):
+        if self.config.INPUT_SOURCE == 'mic':
+            hint = "Press 'Q' to quit | Make sure Teams audio is audible"
+        else:
+            hint = f"Press 'Q' to quit | Capturing from: {self.config.INPUT_SOURCE}"
+        instructions = self.text_cache.render(self.small_font, hint, (128, 128, 128))
+        self.screen.blit(instructions, (20, rect.top + 5))
+    
+    def _update_display(self):
+        """Update the display with translated text (only the regions that changed)"""
+        status_text = "Status: Listening... | Buffer: {:.1f}s".format(self.audio_buffer_duration)
+        if status_text != self._status_text:
+            self._status_text = status_text
+            self.renderer.invalidate('status')
+        self.renderer.render()
         
     def cleanup(self):
         """Clean up resources"""
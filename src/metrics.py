@@ -0,0 +1,310 @@
+import bisect
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_METRICS_PORT = 9464
+
+# Seconds; covers a few-ms write up to a slow remote recognizer call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def samples(self):
+        """(suffix, label values, extra labels, value) rows for the text exposition"""
+        with self._lock:
+            return [("", key, (), value) for key, value in self._values.items()]
+
+    def to_dict(self):
+        with self._lock:
+            values = [{"labels": dict(zip(self.label_names, key)), "value": value} for key, value in self._values.items()]
+        return {"type": self.kind, "help": self.help, "values": values}
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down (queue depth, buffer length)"""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram of observations, e.g. latencies in seconds"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _cumulative(self, counts):
+        total, cumulative = 0, []
+        for count in counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def samples(self):
+        rows = []
+        with self._lock:
+            states = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        for key, counts, value_sum, count in states:
+            bounds = self.buckets + (float("inf"),)
+            for bound, cumulative in zip(bounds, self._cumulative(counts)):
+                rows.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+            rows.append(("_sum", key, (), value_sum))
+            rows.append(("_count", key, (), count))
+        return rows
+
+    def to_dict(self):
+        with self._lock:
+            states = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        values = []
+        for key, counts, value_sum, count in states:
+            bounds = [_format_value(bound) for bound in self.buckets + (float("inf"),)]
+            values.append({"labels": dict(zip(self.label_names, key)),
+                           "buckets": dict(zip(bounds, self._cumulative(counts))),
+                           "sum": value_sum, "count": count})
+        return {"type": self.kind, "help": self.help, "values": values}
+
+
+class Registry:
+    """Named metrics for the whole process, rendered as Prometheus text or a JSON snapshot
+
+    Metrics are created once (usually at import time) and updated from any
+    thread; each update takes one short per-metric lock. Callbacks added
+    with `on_collect` run before every scrape or snapshot, for values that
+    are cheaper to read on demand than to keep current.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, labels, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labels, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"metric {name} already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._get_or_create(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._get_or_create(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labels, buckets=buckets)
+
+    def __len__(self):
+        return len(self._metrics)
+
+    def on_collect(self, callback):
+        with self._lock:
+            self._collectors.append(callback)
+
+    def remove_collector(self, callback):
+        with self._lock:
+            if callback in self._collectors:
+                self._collectors.remove(callback)
+
+    def _collect(self):
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for callback in collectors:
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠️  Metrics collector failed: {e}")
+        return metrics
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._collect():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, key, extra, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(metric.label_names, key, extra)} "
+                             f"{_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        return {"timestamp": time.time(), "host": socket.gethostname(), "pid": os.getpid(),
+                "metrics": {metric.name: metric.to_dict() for metric in self._collect()}}
+
+
+registry = Registry()
+counter = registry.counter
+gauge = registry.gauge
+histogram = registry.histogram
+
+# Shared by every stage that can lose audio (capture, archive, buffer trim), labelled by where
+DROPPED_SAMPLES = counter("rt_dropped_samples_total", "Captured audio samples lost, by where they were dropped", ["where"])
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body, content_type = self.server.registry.render().encode("utf-8"), "text/plain; version=0.0.4"
+        elif path == "/metrics.json":
+            body, content_type = json.dumps(self.server.registry.snapshot()).encode("utf-8"), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _MetricsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class MetricsExporter:
+    """Serves a registry for Prometheus scrapes and/or writes it to a JSON file periodically
+
+    `/metrics` is the Prometheus text format and `/metrics.json` the same
+    data as JSON. The snapshot file is replaced atomically every
+    `snapshot_interval` seconds, so a collector tailing it never reads a
+    half-written file.
+    """
+
+    def __init__(self, port=DEFAULT_METRICS_PORT, host="127.0.0.1", snapshot_path=None, snapshot_interval=15.0,
+                 registry=registry):
+        self.port = port
+        self.host = host
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.registry = registry
+        self.server = None
+        self._stop = threading.Event()
+        self._threads = []
+        self.snapshots_written = 0
+
+    def start(self):
+        if self.port is not None:
+            self.server = _MetricsHTTPServer((self.host, self.port), _MetricsHandler)
+            self.server.registry = self.registry
+            self.port = self.server.server_address[1]
+            self._threads.append(threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True))
+            print(f"📈 Metrics at http://{self.host}:{self.port}/metrics")
+        if self.snapshot_path:
+            self._threads.append(threading.Thread(target=self._snapshot_loop, name="metrics-snapshot", daemon=True))
+            print(f"📈 Metrics snapshot every {self.snapshot_interval:.0f}s: {self.snapshot_path}")
+        for thread in self._threads:
+            thread.start()
+        sys.stdout.flush()
+        return self
+
+    def write_snapshot(self):
+        temporary = f"{self.snapshot_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self.registry.snapshot(), f)
+        os.replace(temporary, self.snapshot_path)
+        self.snapshots_written += 1
+
+    def _snapshot_loop(self):
+        while not self._stop.wait(self.snapshot_interval):
+            try:
+                self.write_snapshot()
+            except OSError as e:
+                print(f"⚠️  Could not write metrics snapshot: {e}")
+                sys.stdout.flush()
+
+    def report(self):
+        where = [f"http://{self.host}:{self.port}/metrics"] if self.server is not None else []
+        if self.snapshot_path:
+            where.append(f"{self.snapshot_path} ({self.snapshots_written} snapshots)")
+        return f"Metrics: {len(self.registry)} metric families | " + ", ".join(where)
+
+    def close(self):
+        self._stop.set()
+        if self.snapshot_path:
+            try:
+                self.write_snapshot()  # the final values of the session
+            except OSError:
+                pass
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,119 @@
+import time
+
+import numpy as np
+
+
+class SpectralGate:
+    """Streaming spectral-gating noise suppressor for 16 kHz mono float32 audio
+
+    Audio is cut into 50%-overlapping frames (sqrt-Hann analysis and synthesis
+    windows, so overlap-add reconstructs the input exactly when the gain is 1).
+    Each frequency bin is attenuated toward `min_gain` unless its power stands
+    clearly above a learned noise profile. The profile starts from the first
+    frames of the stream and afterwards is only updated on frames that look
+    like silence, so speech does not leak into it.
+
+    Output lags the input by `frame_size - hop` samples.
+    """
+
+    def __init__(self, sample_rate=16000, frame_size=512, hop=256, threshold=2.0,
+                 min_gain=0.15, noise_update=0.05, gain_smoothing=0.6, warmup_frames=8):
+        if frame_size != 2 * hop:
+            raise ValueError("SpectralGate needs 50% overlap (frame_size == 2 * hop)")
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop = hop
+        self.threshold = threshold          # bin power must exceed threshold × noise to pass
+        self.min_gain = min_gain            # floor for attenuated bins (about -16 dB)
+        self.noise_update = noise_update    # EMA rate of the noise profile on silent frames
+        self.gain_smoothing = gain_smoothing
+        self.warmup_frames = warmup_frames
+
+        # Periodic Hann; its square root used twice sums to 1 at 50% overlap
+        hann = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(frame_size) / frame_size)
+        self.window = np.sqrt(hann).astype(np.float32)
+
+        bins = frame_size // 2 + 1
+        self.noise_psd = np.zeros(bins, dtype=np.float64)
+        self.gain = np.ones(bins, dtype=np.float64)
+        self.noise_level = 0.0              # mean noise power per bin, for silence detection
+        self.frames_seen = 0
+
+        # Input not yet consumed by a full hop (starts with one hop of zeros) and the overlap-add tail
+        self._pending = np.zeros(frame_size, dtype=np.float32)
+        self._pending_count = frame_size - hop
+        self._tail = np.zeros(hop, dtype=np.float32)
+
+        # Per-frame CPU accounting; frames share one FFT call per block, so the worst
+        # case is tracked as the slowest block's average per frame
+        self.frames_processed = 0
+        self.silent_frames = 0
+        self.total_ns = 0
+        self.max_block_frame_ns = 0
+
+    def _is_silent(self, power):
+        level = float(power.mean())
+        if self.frames_seen < self.warmup_frames:
+            return True
+        return level < self.noise_level * self.threshold
+
+    def process(self, samples):
+        """Denoise a block of mono float32 samples; returns whole hops of output"""
+        start = time.perf_counter_ns()
+        data = np.concatenate((self._pending[:self._pending_count], np.asarray(samples, dtype=np.float32)))
+        count = (len(data) - self.hop) // self.hop if len(data) >= self.frame_size else 0
+        if count == 0:
+            self._pending[:len(data)] = data
+            self._pending_count = len(data)
+            return np.zeros(0, dtype=np.float32)
+
+        # All frames of this block in one FFT call
+        index = np.arange(count)[:, None] * self.hop + np.arange(self.frame_size)
+        spectra = np.fft.rfft(data[index] * self.window, axis=1)
+        power = spectra.real ** 2 + spectra.imag ** 2
+
+        for i in range(count):
+            frame_power = power[i]
+            if self._is_silent(frame_power):
+                rate = 1.0 / (self.frames_seen + 1) if self.frames_seen < self.warmup_frames else self.noise_update
+                self.noise_psd += (frame_power - self.noise_psd) * rate
+                self.noise_level = float(self.noise_psd.mean())
+                self.silent_frames += 1
+            self.frames_seen += 1
+
+            # Soft gate: Wiener-like gain from the a-posteriori SNR, floored and smoothed over time
+            snr = frame_power / (self.noise_psd * self.threshold + 1e-12)
+            target = np.clip(1.0 - 1.0 / np.maximum(snr, 1e-6), self.min_gain, 1.0)
+            self.gain = self.gain_smoothing * self.gain + (1.0 - self.gain_smoothing) * target
+            spectra[i] *= self.gain
+
+        frames = np.fft.irfft(spectra, n=self.frame_size, axis=1).astype(np.float32) * self.window
+
+        # Overlap-add: each output hop is the second half of one frame plus the first half of the next
+        out = np.empty(count * self.hop, dtype=np.float32)
+        out[:self.hop] = self._tail + frames[0, :self.hop]
+        if count > 1:
+            out[self.hop:] = (frames[:-1, self.hop:] + frames[1:, :self.hop]).reshape(-1)
+        self._tail = frames[-1, self.hop:].copy()
+
+        consumed = count * self.hop
+        remaining = data[consumed:]
+        self._pending[:len(remaining)] = remaining
+        self._pending_count = len(remaining)
+
+        elapsed = time.perf_counter_ns() - start
+        self.frames_processed += count
+        self.total_ns += elapsed
+        self.max_block_frame_ns = max(self.max_block_frame_ns, elapsed // count)
+        return out
+
+    def report(self):
+        """One-line summary of per-frame CPU cost against the real-time hop budget"""
+        if not self.frames_processed:
+            return "Noise suppression: no frames processed"
+        average_us = self.total_ns / self.frames_processed / 1e3
+        budget_us = self.hop / self.sample_rate * 1e6
+        return (f"Noise suppression: {self.frames_processed} frames | avg {average_us:.1f} µs/frame "
+                f"(max block average {self.max_block_frame_ns / 1e3:.1f}) | budget {budget_us:.0f} µs/frame | "
+                f"{100 * average_us / budget_us:.1f}% of one core | "
+                f"silent frames {100 * self.silent_frames / self.frames_processed:.0f}%")
@@ -0,0 +1,135 @@
+import queue
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import backends
+
+Hypothesis = namedtuple("Hypothesis", "text confidence")
+Revision = namedtuple("Revision", "segment text confidence translations")
+
+
+def recognize_nbest(recognizer, audio_data, language):
+    """All of Google's alternatives for a window, best first; raises UnknownValueError when there is no speech
+
+    Google only reports a confidence for the top alternative, so the
+    others carry None.
+    """
+    sr = backends.speech_recognition()
+    response = recognizer.recognize_google(audio_data, language=language, show_all=True)
+    alternatives = response.get("alternative", []) if isinstance(response, dict) else []
+    hypotheses = [Hypothesis(a["transcript"], a.get("confidence"))
+                  for a in alternatives if a.get("transcript", "").strip()]
+    if not hypotheses:
+        raise sr.UnknownValueError()
+    return hypotheses
+
+
+def _words(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def strip_context(text, context_text):
+    """Drop the leading words of `text` that repeat the end of `context_text`"""
+    words = text.split()
+    folded = [_words(word) for word in words]
+    tail = _words(context_text)[-8:]
+    for count in range(min(len(words), len(tail)), 0, -1):
+        prefix = [w for word in folded[:count] for w in word]
+        if prefix and prefix == tail[-len(prefix):]:
+            return " ".join(words[count:])
+    return text
+
+
+class SecondPass:
+    """Re-recognizes low-confidence sentences on a background thread
+
+    High-confidence segments never wait for it. A sentence whose first-pass
+    confidence is below `threshold` is recognized again from its whole
+    audio (one request for the sentence instead of one per window, plus a
+    second of the preceding audio for single-window sentences). When the
+    new transcript differs and is more confident it is translated and
+    queued as a Revision for the caller to apply.
+    """
+
+    def __init__(self, recognize, translate, threshold=0.7, margin=0.05, max_pending=4):
+        self.recognize = recognize
+        self.translate = translate
+        self.threshold = threshold
+        self.margin = margin
+        self._jobs = queue.Queue(maxsize=max_pending)
+        self._done = queue.Queue()
+        self._thread = threading.Thread(target=self._work, name="second-pass", daemon=True)
+        self._thread.start()
+        self.submitted = 0
+        self.skipped = 0
+        self.revised = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.work_ns = 0
+
+    def wants(self, segment):
+        return segment.confidence is not None and segment.confidence < self.threshold
+
+    def submit(self, segment, pcm, context_text=""):
+        """Queue a sentence for re-recognition; returns False if the worker is saturated"""
+        try:
+            self._jobs.put_nowait((segment, pcm, context_text, segment.source_text, segment.source_lang))
+        except queue.Full:
+            self.skipped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            segment, pcm, context_text, first_text, language = job
+            started = time.perf_counter_ns()
+            try:
+                best = self.recognize(pcm, language)[0]
+                text = strip_context(best.text, context_text) if context_text else best.text
+                improved = (best.confidence or 0.0) >= (segment.confidence or 0.0) + self.margin
+                if text and improved and _words(text) != _words(first_text):
+                    self._done.put(Revision(segment, text, best.confidence, self.translate(text, language)))
+                    self.revised += 1
+                else:
+                    self.unchanged += 1
+            except Exception:
+                # No speech on the second pass or a network error: keep the first result
+                self.failed += 1
+            self.work_ns += time.perf_counter_ns() - started
+
+    def revisions(self):
+        """Revisions finished since the last call"""
+        done = []
+        try:
+            while True:
+                done.append(self._done.get_nowait())
+        except queue.Empty:
+            pass
+        return done
+
+    def close(self):
+        try:
+            self._jobs.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def report(self):
+        average_ms = self.work_ns / 1e6 / self.submitted if self.submitted else 0.0
+        return (f"Second pass: {self.submitted} low-confidence sentences (< {self.threshold:.2f}) | "
+                f"{self.revised} revised, {self.unchanged} kept, {self.failed} failed, "
+                f"{self.skipped} skipped while busy | {average_ms:.0f} ms each off the main path")
+
+
+def print_alternatives(hypotheses):
+    """Log the n-best list when the recognizer was unsure"""
+    if len(hypotheses) > 1:
+        others = " | ".join(h.text for h in hypotheses[1:4])
+        print(f"🔢 Alternatives: {others}")
+        sys.stdout.flush()
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (text, font, color)
+
+    font.render is by far the most expensive call in the pygame displays,
+    and almost every line they draw is identical from one frame to the next.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (text, font, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def report(self):
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups else 0.0
+        return f"Text cache: {len(self._surfaces)} surfaces | hit rate {hit_rate:.0f}% ({self.hits}/{lookups})"
+
+
+class RegionRenderer:
+    """Redraws only the screen regions whose content changed
+
+    Each region has a rectangle and a draw function. `invalidate(name)` marks
+    it dirty; `render()` clears and redraws just the dirty regions and pushes
+    only their rectangles to the display. With nothing dirty it does no work.
+    """
+
+    def __init__(self, screen, background=(0, 0, 0)):
+        self.screen = screen
+        self.background = background
+        self._regions = OrderedDict()
+        self._dirty = set()
+        self.frames = 0
+
+    def add(self, name, rect, draw):
+        self._regions[name] = (pygame.Rect(rect), draw)
+        self._dirty.add(name)
+
+    def invalidate(self, name=None):
+        """Mark one region (or every region when name is None) for redraw"""
+        if name is None:
+            self._dirty.update(self._regions)
+        else:
+            self._dirty.add(name)
+
+    @property
+    def dirty(self):
+        return bool(self._dirty)
+
+    def render(self):
+        if not self._dirty:
+            return 0
+        rects = []
+        for name, (rect, draw) in self._regions.items():
+            if name not in self._dirty:
+                continue
+            self.screen.fill(self.background, rect)
+            # Keep each region's drawing inside its own rectangle
+            self.screen.set_clip(rect)
+            draw(rect)
+            self.screen.set_clip(None)
+            rects.append(rect)
+        self._dirty.clear()
+        pygame.display.update(rects)
+        self.frames += 1
+        return len(rects)
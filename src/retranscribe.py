@@ -0,0 +1,246 @@
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import backends
+from audio_archive import ArchiveReader
+from languages import recognizer_locale, translator_code
+from recognition import recognize_nbest, strip_context
+from segment import Segment
+from transcript_writer import TranscriptWriter
+
+_STARTED = re.compile(r"^Started: (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})$")
+_LANGUAGES = re.compile(r"^Languages: (\S+) → (\S+)$")
+_ARCHIVE = re.compile(r"^Audio archive: (.+) \((\d+) Hz mono\)$")
+_ENTRY_TIME = re.compile(r"^\[(\d{2}:\d{2}:\d{2})\]$")
+_ENTRY_TEXT = re.compile(r"^([A-Z]{2,3}): (.*)$")
+_ENTRY_AUDIO = re.compile(r"^AUDIO: samples (\d+)-(\d+)")
+
+
+def read_transcript(path):
+    """Header fields and the audio-backed entries of a live transcript, as Segments"""
+    with open(path, encoding='utf-8') as f:
+        lines = [line.rstrip("\n") for line in f]
+    info = {'started': None, 'source_lang': None, 'target_lang': None, 'archive': None, 'sample_rate': 16000}
+    for line in lines[:12]:
+        if _STARTED.match(line):
+            info['started'] = datetime.strptime(_STARTED.match(line).group(1), '%Y-%m-%d %H:%M:%S')
+        elif _LANGUAGES.match(line):
+            info['source_lang'], info['target_lang'] = _LANGUAGES.match(line).groups()
+        elif _ARCHIVE.match(line):
+            archive, rate = _ARCHIVE.match(line).groups()
+            info['archive'], info['sample_rate'] = archive, int(rate)
+
+    segments = []
+    day = info['started'] or datetime.now()
+    previous_clock = None
+    for i, line in enumerate(lines[:-3]):
+        entry = _ENTRY_TIME.match(line)
+        source, target = _ENTRY_TEXT.match(lines[i + 1]), _ENTRY_TEXT.match(lines[i + 2])
+        audio = _ENTRY_AUDIO.match(lines[i + 3])
+        if not (entry and source and target and audio):
+            continue
+        clock = datetime.strptime(entry.group(1), '%H:%M:%S').time()
+        if previous_clock is not None and clock < previous_clock:
+            day += timedelta(days=1)  # the session ran past midnight
+        previous_clock = clock
+        segment = Segment(len(segments) + 1, source.group(1).lower(), int(audio.group(1)), int(audio.group(2)),
+                          info['sample_rate'])
+        segment.source_text = source.group(2)
+        segment.translations = {target.group(1).lower(): target.group(2)}
+        segment.wall_time = datetime.combine(day.date(), clock).timestamp()
+        segments.append(segment)
+    info['segments'] = segments
+    return info
+
+
+def plan_windows(segments, window_seconds=20.0, max_gap_seconds=1.0):
+    """Group consecutive live segments into recognition windows of up to `window_seconds`
+
+    Windows only end on live segment boundaries, and never span a
+    language change or a pause longer than `max_gap_seconds`.
+    """
+    windows, current = [], []
+    for segment in segments:
+        if current:
+            rate = segment.sample_rate
+            if (segment.source_lang != current[0].source_lang
+                    or segment.start_sample - current[-1].end_sample > max_gap_seconds * rate
+                    or segment.end_sample - current[0].start_sample > window_seconds * rate):
+                windows.append(current)
+                current = []
+        current.append(segment)
+    if current:
+        windows.append(current)
+    return windows
+
+
+class Retranscriber:
+    """Re-recognizes an archived session in large windows on a worker pool
+
+    The live pass recognizes 3-second windows as they are captured; here
+    every window covers up to `window_seconds` of consecutive segments
+    plus `context_seconds` of the audio before it, so the recognizer sees
+    whole sentences with their lead-in. Windows are independent, so
+    `workers` of them are recognized and translated concurrently with the
+    same speech_recognition/googletrans backends the live translator uses
+    (one client per worker thread). The improved transcript is written in
+    session order next to the live one, in the same format.
+    """
+
+    def __init__(self, transcript_path, workers=4, window_seconds=20.0, context_seconds=2.0, glossary=None):
+        self.transcript_path = transcript_path
+        self.workers = workers
+        self.window_seconds = window_seconds
+        self.context_seconds = context_seconds
+        self.glossary = glossary
+        self.info = read_transcript(transcript_path)
+        self.output_file = os.path.splitext(transcript_path)[0] + ".final.txt"
+        self._thread_local = threading.local()
+        self._lock = threading.Lock()
+        self.windows = 0
+        self.changed = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+        self.wall_seconds = 0.0
+
+    def _archive_path(self):
+        archive = self.info['archive']
+        if archive and not os.path.exists(archive):
+            # The session folder may have been moved since it was recorded
+            archive = os.path.join(os.path.dirname(self.transcript_path), os.path.basename(archive))
+        return archive
+
+    def _clients(self):
+        local = self._thread_local
+        if getattr(local, 'recognizer', None) is None:
+            local.recognizer = backends.speech_recognition().Recognizer()
+            local.translator = backends.googletrans().Translator()
+        return local.recognizer, local.translator
+
+    def _translate(self, text, source, target, translator):
+        def translate(text):
+            return translator.translate(text, src=translator_code(source), dest=translator_code(target)).text
+
+        if self.glossary is not None:
+            return self.glossary.translate(text, source, target, translate)
+        return translate(text)
+
+    def _process(self, job):
+        """Recognize and translate one window; falls back to the live text on any error"""
+        window, archive, previous = job
+        first = window[0]
+        rate = first.sample_rate
+        segment = Segment(first.index, first.source_lang, first.start_sample,
+                          max(s.end_sample for s in window), rate)
+        segment.wall_time = first.wall_time
+        segment.source_text = " ".join(s.source_text for s in window)
+        segment.translations = {}
+        for live in window:
+            for target, text in live.translations.items():
+                segment.translations[target] = f"{segment.translations.get(target, '')} {text}".strip()
+
+        context_start = segment.start_sample
+        context_text = ""
+        if previous is not None and first.start_sample - previous.end_sample <= rate:
+            context_start = max(previous.start_sample, first.start_sample - int(self.context_seconds * rate))
+            context_text = previous.source_text
+        sr = backends.speech_recognition()
+        recognizer, translator = self._clients()
+        try:
+            pcm = archive.read(context_start, segment.end_sample)
+            best = recognize_nbest(recognizer, sr.AudioData(pcm, rate, 2), recognizer_locale(segment.source_lang))[0]
+            text = strip_context(best.text, context_text) if context_text else best.text
+            if text.strip():
+                segment.confidence = best.confidence
+                if text != segment.source_text:
+                    segment.source_text = text
+                    segment.translations = {target: self._translate(text, segment.source_lang, target, translator)
+                                            for target in segment.translations}
+                    with self._lock:
+                        self.changed += 1
+        except Exception as e:
+            print(f"⚠️  Window at {first.start_sample / rate:.1f}s kept from the live pass: {e}")
+            sys.stdout.flush()
+            with self._lock:
+                self.failed += 1
+        return segment
+
+    def run(self):
+        """Write the improved transcript; returns its path"""
+        segments = self.info['segments']
+        archive_path = self._archive_path()
+        if not segments or not archive_path:
+            raise ValueError(f"{self.transcript_path} has no archived audio ranges "
+                             "(record the session with --archive-audio)")
+        windows = plan_windows(segments, self.window_seconds)
+        jobs_previous = [None] + [window[-1] for window in windows[:-1]]
+
+        started = time.perf_counter()
+        archive = ArchiveReader(archive_path, self.info['sample_rate'])
+        writer = TranscriptWriter(self.output_file, self.info['source_lang'], self.info['target_lang'])
+        writer.audio_archive = archive_path
+        writer.audio_rate = archive.sample_rate
+        writer.write_header()
+        print(f"🔁 Re-transcribing {len(segments)} segments in {len(windows)} windows "
+              f"with {self.workers} workers: {archive_path}")
+        sys.stdout.flush()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="retranscribe") as pool:
+                # map() yields in session order while later windows are still being recognized
+                jobs = ((window, archive, previous) for window, previous in zip(windows, jobs_previous))
+                for segment in pool.map(self._process, jobs):
+                    writer.write_segment(segment)
+                    self.windows += 1
+                    self.audio_seconds += segment.duration
+            writer.finish()
+        finally:
+            archive.close()
+        self.wall_seconds = time.perf_counter() - started
+        return self.output_file
+
+    def report(self):
+        speed = self.audio_seconds / self.wall_seconds if self.wall_seconds else 0.0
+        return (f"Re-transcription: {self.windows} windows, {self.audio_seconds / 3600:.2f} h of audio in "
+                f"{self.wall_seconds:.0f}s with {self.workers} workers | {speed:.1f} audio-hours per wall-hour | "
+                f"{self.changed} changed, {self.failed} kept from the live pass")
+
+
+def main(argv=None):
+    """Command line entry point: re-transcribe one or more archived sessions"""
+    parser = argparse.ArgumentParser(description="Re-transcribe archived sessions for a higher-quality final transcript")
+    parser.add_argument("transcripts", nargs="+", metavar="TRANSCRIPT",
+                        help="live transcript(s) recorded with --archive-audio")
+    parser.add_argument("--workers", type=int, default=4, help="windows recognized concurrently (default 4)")
+    parser.add_argument("--window", type=float, default=20.0, metavar="SECONDS",
+                        help="longest recognition window, built from whole live segments (default 20)")
+    parser.add_argument("--context", type=float, default=2.0, metavar="SECONDS",
+                        help="audio before each window given to the recognizer as context (default 2)")
+    parser.add_argument("--glossary", metavar="FILE", help="terminology file applied to every translation")
+    args = parser.parse_args(argv)
+
+    glossary = None
+    if args.glossary:
+        from glossary import Glossary
+        glossary = Glossary(args.glossary)
+    for path in args.transcripts:
+        try:
+            # Reading the transcript can fail too; one bad file must not stop the others
+            retranscriber = Retranscriber(path, args.workers, args.window, args.context, glossary)
+            output_file = retranscriber.run()
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"❌ {path}: {e}")
+            sys.stdout.flush()
+            continue
+        print(f"✅ Final transcript: {output_file}")
+        print(f"🔁 {retranscriber.report()}")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
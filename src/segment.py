@@ -0,0 +1,80 @@
+import time
+
+
+class Segment:
+    """One recognized audio window and its translations, shared by every pipeline stage and sink
+
+    Times are taken once: `created_ns` (time.monotonic_ns) when the audio
+    window is cut and `wall_time` (time.time) for display. Stage latencies
+    are stored as nanoseconds; the clock string is only formatted when a
+    sink asks for it.
+    """
+
+    __slots__ = ('index', 'source_lang', 'source_text', 'translations',
+                 'start_sample', 'end_sample', 'sample_rate',
+                 'confidence', 'alternatives', 'language_confidence', 'speaker_turn', 'capture_glitches',
+                 'created_ns', 'wall_time',
+                 'recognize_ns', 'language_id_ns', 'translate_ns', 'write_ns')
+
+    def __init__(self, index=0, source_lang=None, start_sample=0, end_sample=0, sample_rate=16000):
+        self.index = index
+        self.source_lang = source_lang
+        self.source_text = ""
+        self.translations = {}
+        self.start_sample = start_sample
+        self.end_sample = end_sample
+        self.sample_rate = sample_rate
+        self.confidence = None            # recognizer confidence, when the backend reports one
+        self.alternatives = []            # n-best (text, confidence) pairs from the recognizer
+        self.language_confidence = None   # source-language identification confidence
+        self.speaker_turn = None          # speaker turn number, when speaker changes are detected
+        self.capture_glitches = 0         # device overflows/underflows while this audio was captured
+        self.created_ns = time.monotonic_ns()
+        self.wall_time = time.time()
+        self.recognize_ns = 0
+        self.language_id_ns = 0
+        self.translate_ns = 0
+        self.write_ns = 0
+
+    def elapsed_ns(self):
+        """Nanoseconds since the audio window was cut"""
+        return time.monotonic_ns() - self.created_ns
+
+    @property
+    def sample_range(self):
+        return self.start_sample, self.end_sample
+
+    @property
+    def duration(self):
+        """Length of the audio window in seconds"""
+        return (self.end_sample - self.start_sample) / self.sample_rate
+
+    @property
+    def translated_text(self):
+        """Translation into the first target language"""
+        return next(iter(self.translations.values()), "")
+
+    def clock(self):
+        """Wall-clock time of the segment as HH:MM:SS"""
+        return time.strftime('%H:%M:%S', time.localtime(self.wall_time))
+
+    def caption(self, target=None):
+        """'[HH:MM:SS] translation' line for caption displays"""
+        text = self.translations.get(target) if target else self.translated_text
+        return f"[{self.clock()}] {text}"
+
+    def latency_report(self):
+        """Per-stage latencies in milliseconds"""
+        return (f"recognize {self.recognize_ns / 1e6:.0f} ms | language {self.language_id_ns / 1e6:.1f} ms | "
+                f"translate {self.translate_ns / 1e6:.0f} ms | write {self.write_ns / 1e6:.1f} ms")
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        segment = cls()
+        for name in cls.__slots__:
+            if name in data:
+                setattr(segment, name, data[name])
+        return segment
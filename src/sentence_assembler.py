@@ -0,0 +1,174 @@
+import re
+import time
+
+from segment import Segment
+
+# Words a sentence almost never ends on (articles, prepositions, conjunctions).
+# A fragment ending in one of them is held for the next window unless the
+# deadline forces it out.
+CONTINUATION_WORDS = {
+    'it': {'il', 'lo', 'la', 'i', 'gli', 'le', 'un', 'uno', 'una', 'di', 'a', 'da', 'in', 'con', 'su', 'per',
+           'tra', 'fra', 'e', 'ed', 'o', 'ma', 'che', 'perché', 'quando', 'se', 'del', 'della', 'dei', 'delle',
+           'al', 'alla', 'nel', 'nella', 'sul', 'sulla', 'come', 'anche', 'non', 'però', 'quindi', 'cioè'},
+    'en': {'the', 'a', 'an', 'of', 'to', 'in', 'on', 'at', 'for', 'with', 'from', 'by', 'and', 'or', 'but',
+           'that', 'which', 'because', 'when', 'if', 'so', 'as', 'than', 'is', 'are', 'was', 'were', 'my',
+           'your', 'our', 'their', 'his', 'her', 'its', 'not', 'very'},
+    'es': {'el', 'la', 'los', 'las', 'un', 'una', 'de', 'a', 'en', 'con', 'por', 'para', 'y', 'e', 'o', 'pero',
+           'que', 'porque', 'cuando', 'si', 'del', 'al', 'como', 'muy', 'no'},
+    'fr': {'le', 'la', 'les', 'un', 'une', 'des', 'de', 'du', 'à', 'au', 'aux', 'en', 'dans', 'avec', 'pour',
+           'par', 'sur', 'et', 'ou', 'mais', 'que', 'qui', 'parce', 'quand', 'si', 'comme', 'très', 'ne'},
+    'de': {'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'einen', 'einem', 'einer', 'und', 'oder',
+           'aber', 'dass', 'weil', 'wenn', 'als', 'von', 'zu', 'mit', 'für', 'auf', 'in', 'an', 'bei', 'nach',
+           'sehr', 'nicht'},
+    'pt': {'o', 'a', 'os', 'as', 'um', 'uma', 'de', 'do', 'da', 'em', 'no', 'na', 'com', 'por', 'para', 'e',
+           'ou', 'mas', 'que', 'porque', 'quando', 'se', 'como', 'muito', 'não'},
+}
+
+SENTENCE_END = re.compile(r'[.!?。！？]+["»”)]*(?=\s|$)')
+
+
+class SentenceAssembler:
+    """Joins recognized audio windows into sentences before they are translated
+
+    The recognizer returns one fragment per fixed audio window, which
+    usually cuts sentences in half. Fragments are merged into one pending
+    Segment until a boundary is likely: terminal punctuation, a pause
+    (trailing silence in the window or a window with no speech), a change
+    of speaker, or a fragment that does not end on a continuation word after enough words.
+    A pending sentence is never held longer than `max_delay` seconds.
+    """
+
+    def __init__(self, max_delay=6.0, max_words=40, pause_seconds=0.6, min_words=4):
+        self.max_delay = max_delay
+        self.max_words = max_words
+        self.pause_seconds = pause_seconds
+        self.min_words = min_words
+        self.pending = None
+        self._pending_since = None
+        # Delivered segments are numbered per sentence rather than per audio window
+        self._next_index = 1
+        self.fragments = 0
+        self.sentences = 0
+        self.forced = 0
+        self.max_wait = 0.0
+
+    def _boundary_score(self, text, source_lang, trailing_silence):
+        words = text.split()
+        if not words:
+            return 0.0
+        last = words[-1].lower().strip(',;:')
+        if words[-1][-1] in '.!?。！？':
+            return 1.0
+        if last in CONTINUATION_WORDS.get(source_lang, ()):
+            return 0.0
+        score = 0.0
+        if trailing_silence >= self.pause_seconds:
+            score += 0.6
+        if trailing_silence >= 2 * self.pause_seconds:
+            score += 0.3
+        if len(words) >= self.min_words:
+            score += 0.2
+        if words[-1][-1] == ',':
+            score -= 0.3
+        return score
+
+    def _merge(self, segment):
+        pending = self.pending
+        pending.source_text = f"{pending.source_text} {segment.source_text}".strip()
+        pending.end_sample = segment.end_sample
+        pending.recognize_ns += segment.recognize_ns
+        pending.language_id_ns += segment.language_id_ns
+        pending.capture_glitches += segment.capture_glitches
+        # n-best lists describe single windows, not the joined sentence
+        pending.alternatives = []
+        if segment.confidence is not None:
+            pending.confidence = (segment.confidence if pending.confidence is None
+                                  else min(pending.confidence, segment.confidence))
+
+    def _take(self, now, forced=False):
+        sentence = self.pending
+        self.pending = None
+        if sentence is None:
+            return []
+        self.sentences += 1
+        if forced:
+            self.forced += 1
+        self.max_wait = max(self.max_wait, now - self._pending_since)
+        self._pending_since = None
+        return [sentence]
+
+    def _split_complete(self, fragment, now):
+        """Emit everything up to the last sentence-ending punctuation; keep the rest pending
+
+        The remainder came from the latest fragment, so it keeps that
+        fragment's audio range (overlapping the emitted sentence's end).
+        """
+        text = self.pending.source_text
+        ends = [m.end() for m in SENTENCE_END.finditer(text)]
+        if not ends or ends[-1] >= len(text.rstrip()):
+            return []
+        head, tail = text[:ends[-1]].strip(), text[ends[-1]:].strip()
+        sentence = self.pending
+        sentence.source_text = head
+        rest = Segment(self._next_index, sentence.source_lang, fragment.start_sample, fragment.end_sample,
+                       sentence.sample_rate)
+        rest.source_text = tail
+        # The remainder is still the fragment's speaker, language guess, confidence and capture quality
+        rest.speaker_turn = fragment.speaker_turn
+        rest.confidence = fragment.confidence
+        rest.language_confidence = fragment.language_confidence
+        rest.capture_glitches = fragment.capture_glitches
+        self._next_index += 1
+        self.pending = sentence
+        completed = self._take(now)
+        self.pending = rest
+        self._pending_since = now
+        return completed
+
+    def add(self, segment, trailing_silence=0.0, now=None):
+        """Add one recognized fragment; returns the sentences completed by it"""
+        now = time.monotonic() if now is None else now
+        self.fragments += 1
+        completed = []
+        if self.pending is not None and (self.pending.source_lang != segment.source_lang
+                                         or self.pending.speaker_turn != segment.speaker_turn):
+            # A language switch or a new speaker always ends the sentence
+            completed += self._take(now)
+
+        if self.pending is None:
+            segment.index = self._next_index
+            self._next_index += 1
+            self.pending = segment
+            self._pending_since = now
+        else:
+            self._merge(segment)
+
+        completed += self._split_complete(segment, now)
+        pending = self.pending
+        words = len(pending.source_text.split())
+        if (self._boundary_score(pending.source_text, pending.source_lang, trailing_silence) >= 0.5
+                or words >= self.max_words):
+            completed += self._take(now)
+        elif now - self._pending_since >= self.max_delay:
+            completed += self._take(now, forced=True)
+        return completed
+
+    def pause(self, now=None):
+        """A window without speech: whatever is pending is a complete sentence"""
+        return self._take(time.monotonic() if now is None else now)
+
+    def due(self, now=None):
+        """Release the pending sentence once it has waited `max_delay` seconds"""
+        now = time.monotonic() if now is None else now
+        if self.pending is not None and now - self._pending_since >= self.max_delay:
+            return self._take(now, forced=True)
+        return []
+
+    def flush(self):
+        return self._take(time.monotonic())
+
+    def report(self):
+        ratio = self.fragments / self.sentences if self.sentences else 0.0
+        return (f"Sentences: {self.fragments} fragments → {self.sentences} translations "
+                f"({ratio:.1f} per request) | {self.forced} cut at the {self.max_delay:.0f}s deadline | "
+                f"longest wait {self.max_wait:.1f}s")
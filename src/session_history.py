@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+from collections import deque
+
+from segment import Segment
+
+
+class SessionHistory:
+    """Segment history with a fixed in-memory window and the rest spilled to a JSONL file
+
+    Memory use depends only on `window`, not on how long the session runs.
+    Records pushed out of the window are appended to `spill_path`; when the
+    history is closed the window is written too, so the file holds the
+    whole session.
+    """
+
+    def __init__(self, window=200, spill_path=None):
+        self.window = deque(maxlen=window)
+        self.spill_path = spill_path
+        self._spill_file = None
+        self.total = 0
+        self.spilled = 0
+
+    def _spill(self, record):
+        if self.spill_path is None:
+            return
+        if self._spill_file is None:
+            self._spill_file = open(self.spill_path, 'a', encoding='utf-8')
+        self._spill_file.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+        self.spilled += 1
+
+    def append(self, record):
+        if len(self.window) == self.window.maxlen:
+            self._spill(self.window[0])
+        self.window.append(record)
+        self.total += 1
+
+    def recent(self, count=None):
+        """Newest records first, at most `count` of them"""
+        records = reversed(self.window)
+        if count is None:
+            return list(records)
+        return [record for _, record in zip(range(count), records)]
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        """Every record of the session, oldest first (spilled ones are read back from disk)"""
+        if self._spill_file is not None:
+            self._spill_file.flush()
+            with open(self.spill_path, encoding='utf-8') as f:
+                for line in f:
+                    yield Segment.from_dict(json.loads(line))
+        yield from self.window
+
+    def close(self):
+        """Write the in-memory window to the spill file so it holds the full session"""
+        if self.spill_path is not None:
+            while self.window:
+                self._spill(self.window.popleft())
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def report(self):
+        return (f"History: {self.total} records | {len(self.window)} in memory | "
+                f"{self.spilled} spilled{f' to {self.spill_path}' if self.spill_path else ''}")
+
+
+def current_rss_bytes():
+    """Resident set size of this process (peak RSS where the current value is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        try:
+            import resource
+        except ImportError:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryMonitor:
+    """Tracks RSS over a session so growth shows up in the periodic report"""
+
+    def __init__(self):
+        self.start_rss = current_rss_bytes()
+        self.peak_rss = self.start_rss
+
+    def report(self):
+        rss = current_rss_bytes()
+        self.peak_rss = max(self.peak_rss, rss)
+        mb = 1024 * 1024
+        return (f"Memory: RSS {rss / mb:.1f} MB | peak {self.peak_rss / mb:.1f} MB | "
+                f"since start {(rss - self.start_rss) / mb:+.1f} MB")
@@ -0,0 +1,185 @@
+import bisect
+import time
+from collections import deque
+
+import numpy as np
+
+
+def _mel_filterbank(sample_rate, n_fft, n_mels, low_hz=80.0, high_hz=None):
+    """Triangular mel filters as an (n_mels, n_fft // 2 + 1) matrix"""
+    high_hz = high_hz or sample_rate / 2
+
+    def to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    mels = np.linspace(to_mel(low_hz), to_mel(high_hz), n_mels + 2)
+    hz = 700.0 * (10.0 ** (mels / 2595.0) - 1.0)
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower, centre, upper = hz[:-2, None], hz[1:-1, None], hz[2:, None]
+    rising = (bins[None, :] - lower) / (centre - lower)
+    falling = (upper - bins[None, :]) / (upper - centre)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def _dct_matrix(n_mfcc, n_mels):
+    """Orthonormal DCT-II rows 1..n_mfcc (c0 is dropped: it only tracks loudness)"""
+    k = np.arange(1, n_mfcc + 1)[:, None]
+    n = np.arange(n_mels)[None, :]
+    return (np.sqrt(2.0 / n_mels) * np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels))).astype(np.float32)
+
+
+class SpeakerChangeDetector:
+    """Streaming speaker-change detection over the captured audio
+
+    Each capture block is turned into MFCC frames in one vectorized pass
+    (framing, FFT, mel filterbank and DCT as array operations). Only
+    frames above the running noise floor are kept, so pauses neither count
+    as a speaker nor hide one. Every `step_seconds` of speech the last two
+    windows of `window_seconds` each are modelled as diagonal Gaussians and
+    compared with the symmetric Kullback-Leibler distance. The distance
+    peaks where the windows straddle a change of voice; a peak at least
+    `peak_ratio` times the recent median marks a turn, at most one per
+    `min_turn_seconds`. A turn is confirmed one step after its peak, so it
+    is known about `window_seconds` + `step_seconds` of speech after the
+    boundary itself.
+
+    Positions are absolute sample offsets in the session audio, the same
+    ones Segment.start_sample/end_sample use; `start_sample` is the offset
+    of the first block fed.
+    """
+
+    def __init__(self, sample_rate=16000, window_seconds=1.5, step_seconds=0.25, min_turn_seconds=2.0,
+                 peak_ratio=4.0,
+                 min_distance=1.0, frame_length=400, hop_length=160, n_mels=26, n_mfcc=12, start_sample=0):
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.n_fft = 1 << (frame_length - 1).bit_length()
+        self.window_frames = int(window_seconds * sample_rate / hop_length)
+        self.step_frames = max(1, int(step_seconds * sample_rate / hop_length))
+        self.min_turn_samples = int(min_turn_seconds * sample_rate)
+        self.peak_ratio = peak_ratio
+        self.min_distance = min_distance
+        self._window = np.hamming(frame_length).astype(np.float32)
+        self._mel = _mel_filterbank(sample_rate, self.n_fft, n_mels)
+        self._dct = _dct_matrix(n_mfcc, n_mels)
+
+        # Speech frames of the last two windows: features and the sample each frame starts at
+        capacity = 2 * self.window_frames
+        self._features = np.zeros((capacity, n_mfcc), dtype=np.float32)
+        self._positions = np.zeros(capacity, dtype=np.int64)
+        self._count = 0
+        self._since_check = 0
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._tail_start = start_sample
+        self._noise_floor = None
+        # Recent window distances (about ten seconds of speech) and the last one, for peak picking
+        self._distances = deque(maxlen=40)
+        self._previous = None
+        self._rising = False
+
+        self.changes = []
+        self.samples_seen = 0
+        self.speech_frames = 0
+        self.work_ns = 0
+
+    def _mfcc(self, signal):
+        frames = np.lib.stride_tricks.sliding_window_view(signal, self.frame_length)[::self.hop_length]
+        # Pre-emphasis inside each frame, then the analysis window
+        emphasized = np.empty_like(frames)
+        emphasized[:, 0] = frames[:, 0]
+        emphasized[:, 1:] = frames[:, 1:] - 0.97 * frames[:, :-1]
+        spectrum = np.fft.rfft(emphasized * self._window, n=self.n_fft)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        energy = np.log(power.sum(axis=1) + 1e-10)
+        mfcc = np.log(power @ self._mel.T + 1e-10) @ self._dct.T
+        return mfcc, energy
+
+    def feed(self, pcm):
+        """Analyze the next block of 16-bit mono PCM; returns the turns found in it"""
+        started = time.perf_counter_ns()
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        self.samples_seen += len(samples)
+        signal = np.concatenate((self._tail, samples)) if len(self._tail) else samples
+        found = []
+        if len(signal) >= self.frame_length:
+            count = (len(signal) - self.frame_length) // self.hop_length + 1
+            mfcc, energy = self._mfcc(signal)
+            positions = self._tail_start + np.arange(count, dtype=np.int64) * self.hop_length
+            consumed = count * self.hop_length
+            self._tail = signal[consumed:].copy()
+            self._tail_start += consumed
+
+            # Lower envelope of the frame energy; speech sits well above it
+            floor = float(np.percentile(energy, 10))
+            self._noise_floor = floor if self._noise_floor is None else min(
+                floor, 0.98 * self._noise_floor + 0.02 * floor + 0.01)
+            speech = energy > self._noise_floor + 2.0
+            for feature, position in zip(mfcc[speech], positions[speech]):
+                change = self._push(feature, position)
+                if change is not None:
+                    found.append(change)
+        else:
+            self._tail = signal.copy()
+        self.work_ns += time.perf_counter_ns() - started
+        return found
+
+    def _push(self, feature, position):
+        capacity = len(self._positions)
+        if self._count == capacity:
+            self._features[:-1] = self._features[1:]
+            self._positions[:-1] = self._positions[1:]
+            self._count -= 1
+        self._features[self._count] = feature
+        self._positions[self._count] = position
+        self._count += 1
+        self.speech_frames += 1
+        self._since_check += 1
+        if self._count < capacity or self._since_check < self.step_frames:
+            return None
+        self._since_check = 0
+        return self._check()
+
+    def _check(self):
+        w = self.window_frames
+        left, right = self._features[:w], self._features[w:]
+        mean_l, mean_r = left.mean(axis=0), right.mean(axis=0)
+        var_l, var_r = left.var(axis=0) + 1e-3, right.var(axis=0) + 1e-3
+        distance = 0.5 * float(np.mean(var_l / var_r + var_r / var_l - 2.0
+                                       + (mean_l - mean_r) ** 2 * (1.0 / var_l + 1.0 / var_r)))
+        boundary = int(self._positions[w])
+
+        # The previous check is a turn when it was a local peak well above the recent baseline
+        found = None
+        previous, rising = self._previous, self._rising
+        if previous is not None and rising and distance < previous[0] and len(self._distances) >= 8:
+            baseline = float(np.median(self._distances))
+            last = self.changes[-1] if self.changes else 0
+            if (previous[0] > max(self.peak_ratio * baseline, self.min_distance)
+                    and previous[1] - last >= self.min_turn_samples):
+                self.changes.append(previous[1])
+                found = previous[1]
+        self._rising = previous is None or distance > previous[0]
+        self._previous = (distance, boundary)
+        self._distances.append(distance)
+        return found
+
+    def turn_at(self, sample):
+        """Number of speaker changes before `sample`"""
+        return bisect.bisect_right(self.changes, sample)
+
+    def first_change(self, start, end):
+        """Earliest change strictly inside (start, end), or None"""
+        i = bisect.bisect_right(self.changes, start)
+        if i < len(self.changes) and self.changes[i] < end:
+            return self.changes[i]
+        return None
+
+    def report(self):
+        audio_seconds = self.samples_seen / self.sample_rate
+        cpu_seconds = self.work_ns / 1e9
+        load = 100 * cpu_seconds / audio_seconds if audio_seconds else 0.0
+        per_second = 1e3 * cpu_seconds / audio_seconds if audio_seconds else 0.0
+        speech = self.speech_frames * self.hop_length / self.sample_rate
+        return (f"Speaker turns: {len(self.changes)} changes in {speech:.0f}s of speech | "
+                f"{per_second:.1f} ms CPU per audio second ({load:.2f}% of one core)")
@@ -1,11 +1,15 @@
 import speech_recognition as sr
 import io
+from recognition import recognize_nbest
 
 class SpeechToText:
     def __init__(self, language='it-IT'):
         self.recognizer = sr.Recognizer()
         self.language = language
         self.audio_data_buffer = bytearray()
+        # n-best list and top confidence of the last recognized window
+        self.last_alternatives = []
+        self.last_confidence = None
         
     def add_audio_data(self, audio_data):
         """Add audio data to buffer"""
@@ -27,12 +31,11 @@ class SpeechToText:
             # Clear buffer after processing
             self.audio_data_buffer.clear()
             
-            # Recognize speech using Google Speech Recognition
-            text = self.recognizer.recognize_google(
-                audio_data, 
-                language=self.language
-            )
-            return text
+            # Recognize speech using Google Speech Recognition, keeping the alternatives
+            hypotheses = recognize_nbest(self.recognizer, audio_data, self.language)
+            self.last_alternatives = hypotheses
+            self.last_confidence = hypotheses[0].confidence
+            return hypotheses[0].text
             
         except sr.UnknownValueError:
             return None
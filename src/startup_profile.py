@@ -0,0 +1,65 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Records how long each startup phase takes, up to the first captured audio frame"""
+
+    def __init__(self, launch_epoch_ms=None):
+        self.origin = time.perf_counter()
+        self.phases = []
+        self.first_frame_at = None
+        self.reported = False
+        self._lock = threading.Lock()
+
+        # The GUI passes the wall-clock time of the Start click so the report
+        # can include interpreter startup and everything before main()
+        if launch_epoch_ms is None:
+            launch_epoch_ms = os.environ.get("RTT_LAUNCH_EPOCH_MS")
+        self.launch_offset = None
+        if launch_epoch_ms:
+            try:
+                self.launch_offset = time.time() - int(launch_epoch_ms) / 1000.0
+            except ValueError:
+                self.launch_offset = None
+
+    @contextmanager
+    def phase(self, name):
+        """Time a startup phase (safe to use from several threads at once)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append((name, start - self.origin, end - start, threading.current_thread().name))
+
+    def mark_first_frame(self):
+        """Called from the audio callback; only the first call is recorded"""
+        if self.first_frame_at is None:
+            self.first_frame_at = time.perf_counter() - self.origin
+
+    def first_frame_ms(self):
+        """Milliseconds from the Start click (or from main() if unknown) to the first frame"""
+        if self.first_frame_at is None:
+            return None
+        return (self.first_frame_at + (self.launch_offset or 0.0)) * 1000.0
+
+    def report(self):
+        """Print the startup breakdown by phase"""
+        self.reported = True
+        print("⏱️ STARTUP REPORT")
+        if self.launch_offset is not None:
+            print(f"⏱️   {'launch → main()':<32} {self.launch_offset * 1000:8.1f} ms")
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+        for name, offset, duration, thread_name in phases:
+            print(f"⏱️   {name:<32} {duration * 1000:8.1f} ms  (at +{offset * 1000:.1f} ms, {thread_name})")
+        first_frame = self.first_frame_ms()
+        if first_frame is not None:
+            origin = "Start" if self.launch_offset is not None else "main()"
+            print(f"⏱️ FIRST_FRAME: {first_frame:.0f} ms after {origin}")
+        sys.stdout.flush()
@@ -0,0 +1,163 @@
+import sys
+import time
+from datetime import datetime
+
+
+class TranscriptWriter:
+    """Writes one target language's transcript file with paragraph formatting"""
+
+    def __init__(self, output_file, source_lang, target_lang, max_paragraph_sentences=50):
+        self.output_file = output_file
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+
+        # Paragraph tracking; a paragraph is closed after max_paragraph_sentences even
+        # without a pause, so an all-day session never accumulates an unbounded paragraph
+        self.current_paragraph = []
+        self.max_paragraph_sentences = max_paragraph_sentences
+        self.last_translation_time = time.time()
+        self.paragraph_counter = 1
+        self.last_speaker_turn = None
+        self.finished = False
+
+        # Set when the session audio is archived; segments then record their sample range
+        self.audio_archive = None
+        self.audio_rate = 16000
+
+    def write_header(self):
+        """Initialize the output file with header"""
+        with open(self.output_file, 'w', encoding='utf-8') as f:
+            f.write("=" * 60 + "\n")
+            f.write(f"REAL-TIME {self.source_lang.upper()} TO {self.target_lang.upper()} TRANSLATION LOG\n")
+            f.write("=" * 60 + "\n")
+            f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Languages: {self.source_lang} → {self.target_lang}\n")
+            f.write(f"File: {self.output_file}\n")
+            if self.audio_archive:
+                f.write(f"Audio archive: {self.audio_archive} ({self.audio_rate} Hz mono)\n")
+            f.write("=" * 60 + "\n\n")
+
+    def _should_start_new_paragraph(self, current_time, speaker_turn=None):
+        """Determine if we should start a new paragraph based on timing and speaker changes"""
+        if not self.current_paragraph:
+            return True
+        if len(self.current_paragraph) >= self.max_paragraph_sentences:
+            return True
+        if speaker_turn is not None and speaker_turn != self.last_speaker_turn:
+            return True
+
+        # If more than 15 seconds since last translation, start new paragraph
+        time_gap = current_time - self.last_translation_time
+        return time_gap > 15.0
+
+    def _is_complete_sentence(self, text):
+        """Check if text looks like a complete sentence"""
+        # Simple heuristic: ends with sentence-ending punctuation
+        text = text.strip()
+        return any(text.endswith(punct) for punct in ['.', '!', '?', '。', '！', '？'])
+
+    def write_segment(self, segment):
+        """Save this writer's translation of a segment with paragraph formatting"""
+        source_lang = segment.source_lang or self.source_lang
+        current_time = segment.wall_time
+        timestamp = segment.clock()
+        translated_text = segment.translations.get(self.target_lang, "")
+
+        # Check if we should start a new paragraph
+        should_start_new_paragraph = self._should_start_new_paragraph(current_time, segment.speaker_turn)
+
+        with open(self.output_file, 'a', encoding='utf-8') as f:
+            if should_start_new_paragraph and self.current_paragraph:
+                # Save the completed paragraph
+                f.write("\n" + "─" * 50 + "\n")
+                f.write(f"PARAGRAPH {self.paragraph_counter} COMPLETE\n")
+                f.write("─" * 50 + "\n")
+                for sentence in self.current_paragraph:
+                    f.write(f"• {sentence}\n")
+                f.write("─" * 50 + "\n\n")
+
+                # Start new paragraph
+                self.current_paragraph = []
+                self.paragraph_counter += 1
+
+            if should_start_new_paragraph:
+                f.write("\n" + "═" * 50 + "\n")
+                speaker = f" | SPEAKER TURN {segment.speaker_turn + 1}" if segment.speaker_turn is not None else ""
+                f.write(f"PARAGRAPH {self.paragraph_counter} START: {timestamp}{speaker}\n")
+                f.write("═" * 50 + "\n")
+
+            # Save the current translation
+            f.write(f"[{timestamp}]\n")
+            f.write(f"{source_lang.upper()}: {segment.source_text}\n")
+            f.write(f"{self.target_lang.upper()}: {translated_text}\n")
+            if self.audio_archive and segment.end_sample:
+                start, end = segment.start_sample, segment.end_sample
+                f.write(f"AUDIO: samples {start}-{end} ({start / self.audio_rate:.2f}s-{end / self.audio_rate:.2f}s)\n")
+            if segment.capture_glitches:
+                # The device dropped or padded audio in this window, so the text may be wrong
+                f.write(f"CAPTURE: {segment.capture_glitches} overflow/underflow event(s) in this audio\n")
+            f.write("-" * 40 + "\n")
+
+            # Add to current paragraph if it's a complete sentence
+            if self._is_complete_sentence(translated_text):
+                self.current_paragraph.append(translated_text)
+
+        # Update timing
+        self.last_translation_time = current_time
+        self.last_speaker_turn = segment.speaker_turn
+
+        # Debug info
+        print(f"📝 Paragraph {self.paragraph_counter}, Sentences: {len(self.current_paragraph)}")
+        print(f"💾 Saved to: {self.output_file}")
+        sys.stdout.flush()
+
+    def write_revision(self, segment, previous_text):
+        """Record a second-pass correction of an already written segment"""
+        source_lang = segment.source_lang or self.source_lang
+        confidence = f", confidence {segment.confidence:.2f}" if segment.confidence is not None else ""
+        with open(self.output_file, 'a', encoding='utf-8') as f:
+            f.write(f"[{datetime.now().strftime('%H:%M:%S')}] REVISION of [{segment.clock()}]{confidence}\n")
+            f.write(f"WAS: {previous_text}\n")
+            f.write(f"{source_lang.upper()}: {segment.source_text}\n")
+            f.write(f"{self.target_lang.upper()}: {segment.translations.get(self.target_lang, '')}\n")
+            f.write("-" * 40 + "\n")
+
+    def write_language_change(self, source_lang, target_lang):
+        """Record a mid-session language switch"""
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        with open(self.output_file, 'a', encoding='utf-8') as f:
+            f.write(f"\n[{datetime.now().strftime('%H:%M:%S')}] LANGUAGES CHANGED: {source_lang} → {target_lang}\n\n")
+
+    def _save_final_paragraph(self):
+        """Save any remaining sentences in the current paragraph when stopping"""
+        if self.current_paragraph:
+            with open(self.output_file, 'a', encoding='utf-8') as f:
+                f.write("\n" + "─" * 50 + "\n")
+                f.write(f"PARAGRAPH {self.paragraph_counter} COMPLETE (FINAL)\n")
+                f.write("─" * 50 + "\n")
+                for sentence in self.current_paragraph:
+                    f.write(f"• {sentence}\n")
+                f.write("─" * 50 + "\n\n")
+
+            print(f"💾 Saved final paragraph with {len(self.current_paragraph)} sentences")
+            sys.stdout.flush()
+
+    def finish(self):
+        """Write the final paragraph and session summary (only once)"""
+        if self.finished:
+            return
+        self.finished = True
+
+        # Save any remaining paragraph
+        self._save_final_paragraph()
+
+        # Add final summary
+        with open(self.output_file, 'a', encoding='utf-8') as f:
+            f.write("\n" + "=" * 60 + "\n")
+            f.write("SESSION SUMMARY\n")
+            f.write("=" * 60 + "\n")
+            f.write(f"Ended: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Total paragraphs: {self.paragraph_counter}\n")
+            f.write(f"File location: {self.output_file}\n")
+            f.write("=" * 60 + "\n")
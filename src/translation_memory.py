@@ -0,0 +1,201 @@
+import glob
+import json
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+# MinHash signature length and LSH banding: 16 bands of 4 rows make two
+# sentences with Jaccard similarity 0.9 share a bucket with probability
+# ~1.0, and ones at 0.3 only ~12% of the time. Candidates are then checked
+# against the exact shingle Jaccard.
+NUM_HASHES = 64
+BANDS = 16
+ROWS = NUM_HASHES // BANDS
+_PRIME = (1 << 61) - 1
+_rng = np.random.RandomState(7664)
+_A = _rng.randint(1, 1 << 30, size=NUM_HASHES).astype(np.uint64)
+_B = _rng.randint(0, 1 << 30, size=NUM_HASHES).astype(np.uint64)
+
+_ENTRY_TIME = re.compile(r"^\[\d{2}:\d{2}:\d{2}\]$")
+_ENTRY_TEXT = re.compile(r"^([A-Z]{2,3}): (.*)$")
+
+
+def normalize(text):
+    return " ".join(text.lower().strip(" \t.,;:!?¿¡\"'").split())
+
+
+def shingles(text, size=3):
+    padded = f" {text} "
+    return {zlib.crc32(padded[i:i + size].encode("utf-8")) for i in range(max(1, len(padded) - size + 1))}
+
+
+def minhash(shingle_set):
+    hashes = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+    # (a * h + b) mod p for every hash function at once; inputs stay below 2**32 so nothing overflows 2**64
+    return ((hashes[:, None] * _A[None, :] + _B[None, :]) % _PRIME).min(axis=0)
+
+
+class _PairIndex:
+    """Exact and MinHash/LSH index for one source → target language pair"""
+
+    def __init__(self):
+        self.exact = {}
+        self.entries = []
+        self.buckets = [{} for _ in range(BANDS)]
+
+    def add(self, key, translation):
+        if key in self.exact:
+            self.exact[key] = translation
+            return
+        self.exact[key] = translation
+        shingle_set = shingles(key)
+        entry_id = len(self.entries)
+        self.entries.append((key, shingle_set))
+        signature = minhash(shingle_set)
+        for band in range(BANDS):
+            bucket_key = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+            self.buckets[band].setdefault(bucket_key, []).append(entry_id)
+
+    def nearest(self, key):
+        """Most similar stored sentence and its Jaccard similarity"""
+        shingle_set = shingles(key)
+        signature = minhash(shingle_set)
+        candidates = set()
+        for band in range(BANDS):
+            candidates.update(self.buckets[band].get(signature[band * ROWS:(band + 1) * ROWS].tobytes(), ()))
+        best, best_score = None, 0.0
+        for entry_id in candidates:
+            stored, stored_shingles = self.entries[entry_id]
+            score = len(shingle_set & stored_shingles) / len(shingle_set | stored_shingles)
+            if score > best_score:
+                best, best_score = stored, score
+        return best, best_score
+
+
+class TranslationMemory:
+    """Sentence-level translation memory built from past transcripts
+
+    Exact repeats are answered from a dictionary; near-repeats (character
+    3-gram Jaccard similarity at or above `threshold`) are found through a
+    MinHash LSH index, so a lookup costs microseconds regardless of how
+    many sentences are stored. A fuzzy match is only accepted when the
+    numbers in both sentences are identical, so "meeting at 3" never
+    returns the translation of "meeting at 4".
+
+    Past sessions in the output folder are indexed on a background thread;
+    sentences translated during the session are added as they are written.
+    """
+
+    def __init__(self, folder, threshold=0.9, min_fuzzy_length=20):
+        self.folder = folder
+        self.threshold = threshold
+        self.min_fuzzy_length = min_fuzzy_length
+        self._pairs = {}
+        self._lock = threading.Lock()
+        self._served = set()
+        self.ready = threading.Event()
+        self.loaded_files = 0
+        self.lookups = 0
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.lookup_ns = 0
+
+    def start(self):
+        threading.Thread(target=self._load_folder, name="translation-memory", daemon=True).start()
+        return self
+
+    def _load_folder(self):
+        started = time.perf_counter()
+        try:
+            for path in sorted(glob.glob(os.path.join(self.folder, "translations_*.txt"))):
+                self._load_transcript(path)
+            for path in sorted(glob.glob(os.path.join(self.folder, "translations_*.history.jsonl"))):
+                self._load_history(path)
+        finally:
+            self.ready.set()
+        print(f"📚 Translation memory: {len(self)} sentences from {self.loaded_files} files "
+              f"indexed in {time.perf_counter() - started:.1f}s")
+        sys.stdout.flush()
+
+    def _load_transcript(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = [line.rstrip("\n") for line in f]
+        except (OSError, UnicodeDecodeError):
+            return
+        self.loaded_files += 1
+        for i, line in enumerate(lines[:-2]):
+            if not _ENTRY_TIME.match(line):
+                continue
+            source = _ENTRY_TEXT.match(lines[i + 1])
+            target = _ENTRY_TEXT.match(lines[i + 2])
+            if source and target:
+                self.add(source.group(2), target.group(2), source.group(1).lower(), target.group(1).lower())
+
+    def _load_history(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    for target, translation in (record.get("translations") or {}).items():
+                        self.add(record.get("source_text", ""), translation, record.get("source_lang"), target)
+        except (OSError, ValueError, UnicodeDecodeError):
+            return
+        self.loaded_files += 1
+
+    def add(self, source_text, translation, source_lang, target_lang):
+        key = normalize(source_text)
+        if not key or not translation or not source_lang or translation.startswith("[Translation failed]"):
+            return
+        with self._lock:
+            pair = self._pairs.get((source_lang, target_lang))
+            if pair is None:
+                pair = self._pairs[(source_lang, target_lang)] = _PairIndex()
+            pair.add(key, translation)
+
+    def add_segment(self, segment):
+        """Store a freshly translated segment (not ones the memory itself answered)"""
+        key = normalize(segment.source_text)
+        for target, translation in segment.translations.items():
+            if (key, target) in self._served:
+                self._served.discard((key, target))
+                continue
+            self.add(segment.source_text, translation, segment.source_lang, target)
+
+    def lookup(self, text, source_lang, target_lang):
+        """Stored translation for `text`, or None when the sentence is new"""
+        started = time.perf_counter_ns()
+        self.lookups += 1
+        key = normalize(text)
+        result = None
+        with self._lock:
+            pair = self._pairs.get((source_lang, target_lang))
+            if pair is not None and key:
+                result = pair.exact.get(key)
+                if result is not None:
+                    self.exact_hits += 1
+                elif len(key) >= self.min_fuzzy_length:
+                    stored, score = pair.nearest(key)
+                    if score >= self.threshold and re.findall(r"\d+", stored) == re.findall(r"\d+", key):
+                        result = pair.exact[stored]
+                        self.fuzzy_hits += 1
+        if result is not None:
+            self._served.add((key, target_lang))
+        self.lookup_ns += time.perf_counter_ns() - started
+        return result
+
+    def __len__(self):
+        return sum(len(pair.exact) for pair in self._pairs.values())
+
+    def report(self):
+        hits = self.exact_hits + self.fuzzy_hits
+        hit_rate = 100 * hits / self.lookups if self.lookups else 0.0
+        average_us = self.lookup_ns / 1e3 / self.lookups if self.lookups else 0.0
+        return (f"Translation memory: {len(self)} sentences | hit rate {hit_rate:.0f}% "
+                f"({self.exact_hits} exact, {self.fuzzy_hits} fuzzy of {self.lookups}) | "
+                f"lookup {average_us:.0f} µs avg")
@@ -1,14 +1,18 @@
 from googletrans import Translator
 import logging
+from glossary import Glossary
+from languages import translator_code
 
 # Configure logging to reduce verbosity
 logging.getLogger('googletrans').setLevel(logging.ERROR)
 
 class TextTranslator:
-    def __init__(self, src_lang='it', dest_lang='en'):
+    def __init__(self, src_lang='it', dest_lang='en', glossary_file=None):
         self.translator = Translator()
         self.src_lang = src_lang
         self.dest_lang = dest_lang
+        # Optional terminology file, enforced around every translation
+        self.glossary = Glossary(glossary_file) if glossary_file else None
         
     def translate_text(self, text):
         """Translate text from source to destination language"""
@@ -16,12 +20,17 @@ class TextTranslator:
             if not text or len(text.strip()) == 0:
                 return ""
                 
-            translation = self.translator.translate(
-                text, 
-                src=self.src_lang, 
-                dest=self.dest_lang
-            )
-            return translation.text
+            if self.glossary is not None:
+                return self.glossary.translate(text, self.src_lang, self.dest_lang, self._translate)
+            return self._translate(text)
         except Exception as e:
             print(f"Translation error: {e}")
-            return f"[Translation failed] {text}"
\ No newline at end of file
+            return f"[Translation failed] {text}"
+    
+    def _translate(self, text):
+        translation = self.translator.translate(
+            text, 
+            src=translator_code(self.src_lang), 
+            dest=translator_code(self.dest_lang)
+        )
+        return translation.text
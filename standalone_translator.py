@@ -1,40 +1,311 @@
 #!/usr/bin/env python3
+import argparse
 import sys
 import os
 import time
+import threading
 from datetime import datetime
-import speech_recognition as sr
-from googletrans import Translator
-import sounddevice as sd
-import numpy as np
 import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared pipeline modules live in src/ next to this script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import backends
+import event_bus
+import metrics
+from language_id import LanguageIdentifier, parse_source
+from languages import parse_targets, recognizer_locale, translator_code
+from recognition import SecondPass, print_alternatives, recognize_nbest
+from startup_profile import StartupProfiler
+from segment import Segment
+from sentence_assembler import SentenceAssembler
+from session_history import MemoryMonitor, SessionHistory
+from transcript_writer import TranscriptWriter
+
+# Pipeline metrics; exported over HTTP and/or to a JSON file with --metrics / --metrics-file
+SEGMENTS = metrics.counter("rt_segments_total", "Audio windows recognized")
+SENTENCES = metrics.counter("rt_sentences_total", "Sentences translated and written")
+NO_SPEECH = metrics.counter("rt_no_speech_total", "Windows without recognizable speech (UnknownValueError)")
+RECOGNIZER_ERRORS = metrics.counter("rt_recognizer_errors_total", "Windows that failed to process", ["kind"])
+CACHE_HITS = metrics.counter("rt_cache_hits_total", "Translations answered without calling the translator", ["cache"])
+QUEUE_DEPTH = metrics.gauge("rt_audio_queue_depth", "Capture blocks waiting to be buffered")
+BUFFER_SECONDS = metrics.gauge("rt_audio_buffer_seconds", "Audio buffered for the next recognition window")
+REAL_TIME_FACTOR = metrics.gauge("rt_real_time_factor", "Processing time of the last window divided by its length")
+STAGE_LATENCY = metrics.histogram("rt_stage_latency_seconds", "Latency of each pipeline stage per sentence", ["stage"])
+DROPPED_SAMPLES = metrics.DROPPED_SAMPLES
 
 class StandaloneTranslator:
-    def __init__(self, source_lang='it', target_lang='en', output_folder=""):
-        self.recognizer = sr.Recognizer()
-        self.translator = Translator()
+    def __init__(self, source_lang='it', target_lang='en', output_folder="", profiler=None, denoise=False,
+                 input_source='mic', archive_audio=None, long_session=False, captions_port=None,
+                 glossary=None, sentence_delay=6.0, translation_memory=None, second_pass=None,
+                 speaker_turns=False, profile=False, metrics_port=None, metrics_file=None):
+        # Optional sampling profiler over every thread; started first so warm-up is included
+        self.sampler = None
+        if profile:
+            self.set_profiling(True)
+        # speech_recognition/googletrans are imported and their objects built on
+        # a background thread while the audio device is being opened
+        self.startup = profiler or StartupProfiler()
+        self.backends = backends.BackendWarmer(self.startup).start()
         self.source_lang = source_lang
-        self.target_lang = target_lang
+        # One recognized segment is translated into every target language
+        self.target_langs = parse_targets(target_lang)
+        # 'auto' / 'auto:it,en' picks the source language per segment
+        self.language_id = None
+        self._configure_language_id()
         self.is_listening = False
+        self.session_active = False
+        
+        # Language changes requested while running wait for the next segment boundary
+        self._pending_languages = None
+        self._config_lock = threading.Lock()
         
         # Audio setup
         self.audio_queue = queue.Queue()
         self.audio_buffer = bytearray()
         self.sample_rate = 16000
+        self.stream = None
+        self.preprocessor = None
+        # 'mic', 'loopback' (system audio via PulseAudio/PipeWire) or a WAV/raw file path
+        self.input_source = input_source
+        # Optional compressed session audio ('flac' or 'opus'); segments record their sample range
+        self.archive_format = archive_audio
+        self.archiver = None
+        self.samples_captured = 0
+        # Device overflows, callback jitter and effective rate of the open capture stream
+        self.capture_monitor = None
+        self.segment_counter = 0
+        # Long-session mode: bounded history spilled to disk plus periodic memory reports
+        self.long_session = long_session
+        self.history = None
+        self.memory = None
+        # Optional spectral-gating noise suppression for speaker-captured audio
+        self.denoise = denoise
+        self.denoiser = None
+        # Optional live caption sink (SSE + shared memory) for overlays and OBS
+        self.caption_server = None
+        # Optional Prometheus endpoint and/or periodic JSON snapshot of the pipeline metrics
+        self.metrics_exporter = None
+        # Recognized windows are joined into sentences before translation; 0 translates each window
+        self.sentence_delay = sentence_delay
+        self.assembler = None
+        # Optional terminology file enforced around every translation call
+        self.glossary = None
+        if glossary:
+            self.set_glossary(glossary)
+        # Optional memory of past sessions' sentences, consulted before the remote translator
+        self.translation_memory = None
+        # Low-confidence sentences can be re-recognized in the background and revised
+        self.second_pass = None
+        self._recent_windows = deque(maxlen=12)
+        self._last_delivered_text = ""
+        if second_pass is not None:
+            self.set_second_pass(second_pass)
+        # Optional speaker-change detection: turns end sentences and paragraphs and cut windows
+        self.speaker_turns = speaker_turns
+        self.speaker_detector = None
+        
+        # Fan-out translation: a warm pool with one googletrans client per worker thread
+        self._translate_pool = None
+        self._translate_pool_size = 0
+        self._thread_local = threading.local()
+        
+        # Create output directory and one transcript per target language
+        with self.startup.phase("prepare output folder"):
+            self.output_dir = self._get_output_directory(output_folder)
+            self._create_writers()
+        
+        if captions_port is not None:
+            self.set_caption_server(captions_port)
+        if metrics_port is not None or metrics_file:
+            self.set_metrics(metrics_port, metrics_file)
+        if translation_memory is not None:
+            self.set_translation_memory(translation_memory)
+        
+        print(f"🚀 Standalone Translator initialized: {source_lang} → {', '.join(self.target_langs)}")
+        self._print_output_files()
+        sys.stdout.flush()
+    
+    def prepare_session(self, source_lang, target_lang, output_folder="", profiler=None, archive_audio=None,
+                        long_session=False, sentence_delay=6.0):
+        """Reset per-session state so an already-warm translator can run a new session"""
+        if profiler is not None:
+            self.startup = profiler
+        self.source_lang = source_lang
+        self.target_langs = parse_targets(target_lang)
+        self.archive_format = archive_audio
+        self.long_session = long_session
+        self.sentence_delay = sentence_delay
+        self._configure_language_id()
+        with self._config_lock:
+            self._pending_languages = None
         
-        # Paragraph tracking
-        self.current_paragraph = []
-        self.last_translation_time = time.time()
-        self.paragraph_counter = 1
+        # Drop audio captured before this session started
+        self.audio_buffer.clear()
+        try:
+            while True:
+                self.audio_queue.get_nowait()
+        except queue.Empty:
+            pass
         
-        # Create output directory and file
         self.output_dir = self._get_output_directory(output_folder)
-        self.output_file = self._create_output_file(output_folder)
+        self._create_writers()
+        print(f"🚀 Session prepared: {source_lang} → {', '.join(self.target_langs)}")
+        self._print_output_files()
+        sys.stdout.flush()
+    
+    def _configure_language_id(self):
+        """Enable per-segment language identification when the source is 'auto'"""
+        source, candidates = parse_source(self.source_lang)
+        if candidates is None:
+            self.language_id = None
+        elif self.language_id is None or self.language_id.candidates != candidates:
+            self.language_id = LanguageIdentifier(candidates)
+    
+    @property
+    def target_lang(self):
+        """The primary (first) target language"""
+        return self.target_langs[0]
+    
+    @property
+    def output_file(self):
+        """The primary target's transcript file"""
+        return self.writers[self.target_lang].output_file
+    
+    def _create_writers(self):
+        """Create one transcript writer per target language"""
+        self.writers = {}
+        for target in self.target_langs:
+            self.writers[target] = self._new_writer(target)
+    
+    def _new_writer(self, target):
+        # A single target keeps the plain translations_<timestamp>.txt name
+        suffix = f"_{target}" if len(self.target_langs) > 1 else ""
+        writer = TranscriptWriter(self._create_output_file(self.output_dir, suffix), self.source_lang, target)
+        if self.archiver is not None:
+            writer.audio_archive = self.archiver.path
+            writer.audio_rate = self.sample_rate
+        return writer
+    
+    def _session_base_path(self):
+        """translations_<timestamp> in the output folder, without any _<lang> suffix"""
+        base_path = os.path.splitext(self.output_file)[0]
+        if len(self.writers) > 1:
+            base_path = base_path[:-len(f"_{self.target_lang}")]
+        return base_path
+    
+    def _start_history(self):
+        """Keep a fixed window of recent segments in memory and spill older ones to disk"""
+        if not self.long_session:
+            return
+        self.history = SessionHistory(window=200, spill_path=self._session_base_path() + ".history.jsonl")
+        self.memory = MemoryMonitor()
+        print(f"🧠 Long-session mode: history beyond 200 segments goes to {self.history.spill_path}")
+        sys.stdout.flush()
+    
+    def _start_archive(self):
+        """Start encoding this session's audio next to its transcripts"""
+        self.samples_captured = 0
+        self.segment_counter = 0
+        if self.capture_monitor is not None:
+            self.capture_monitor.reset()
+        if not self.archive_format:
+            return
+        from audio_archive import SessionArchiver
+        self.archiver = SessionArchiver(self._session_base_path(), self.sample_rate, self.archive_format).start()
+        for writer in self.writers.values():
+            writer.audio_archive = self.archiver.path
+            writer.audio_rate = self.sample_rate
+        print(f"🗜️ Archiving session audio to: {self.archiver.path}")
+        sys.stdout.flush()
+    
+    def _drain_audio_queue(self):
+        """Move captured audio into the recognition buffer and the archive"""
+        try:
+            while True:
+                audio_data = self.audio_queue.get_nowait()
+                self.audio_buffer.extend(audio_data)
+                self.samples_captured += len(audio_data) // 2
+                if self.speaker_detector is not None:
+                    self.speaker_detector.feed(audio_data)
+                if self.archiver is not None:
+                    self.archiver.submit(audio_data)
+        except queue.Empty:
+            pass
+    
+    def _print_output_files(self):
+        for target, writer in self.writers.items():
+            label = f" ({target})" if len(self.writers) > 1 else ""
+            print(f"📁 Output file{label}: {writer.output_file}")
+    
+    def reconfigure(self, source_lang=None, target_lang=None):
+        """Switch the language pair of a running pipeline at the next segment boundary
+        
+        Capture, buffered audio and the warm Recognizer/Translator are left
+        untouched; only the languages used for the next segment change.
+        """
+        with self._config_lock:
+            current = self._pending_languages or (self.source_lang, tuple(self.target_langs))
+            targets = tuple(parse_targets(target_lang)) if target_lang else current[1]
+            self._pending_languages = (source_lang or current[0], targets)
+            pending = self._pending_languages
         
-        print(f"🚀 Standalone Translator initialized: {source_lang} → {target_lang}")
-        print(f"📁 Output file: {self.output_file}")
+        if self.session_active:
+            print(f"🌍 Language change queued: {pending[0]} → {', '.join(pending[1])} (applies at next segment)")
+            sys.stdout.flush()
+        else:
+            self._apply_pending_config()
+    
+    def _apply_pending_config(self):
+        """Apply a queued language change; called between segments only"""
+        with self._config_lock:
+            pending, self._pending_languages = self._pending_languages, None
+        if pending is None or pending == (self.source_lang, tuple(self.target_langs)):
+            return
+        
+        source_lang, targets = pending[0], list(pending[1])
+        old_writers = self.writers
+        self.source_lang, self.target_langs = source_lang, targets
+        self._configure_language_id()
+        
+        if len(targets) == 1 and len(old_writers) == 1:
+            # Single-target switch: keep writing the same transcript
+            self.writers = {targets[0]: next(iter(old_writers.values()))}
+        else:
+            # Keep transcripts of targets that stay, open new ones for added targets
+            self.writers = {}
+            for target in targets:
+                writer = old_writers.get(target)
+                if writer is None:
+                    writer = self._new_writer(target)
+                    if self.session_active:
+                        writer.write_header()
+                self.writers[target] = writer
+            for target, writer in old_writers.items():
+                if target not in self.writers and self.session_active:
+                    writer.finish()
+        
+        for target, writer in self.writers.items():
+            if (writer.source_lang, writer.target_lang) == (source_lang, target):
+                continue
+            if self.session_active:
+                writer.write_language_change(source_lang, target)
+            else:
+                writer.source_lang, writer.target_lang = source_lang, target
+        locale = "auto-detect" if self.language_id else recognizer_locale(self.source_lang)
+        print(f"🌍 Languages switched: {self.source_lang} → {', '.join(self.target_langs)} (recognizer locale {locale})")
         sys.stdout.flush()
     
+    @property
+    def recognizer(self):
+        return self.backends.recognizer
+    
+    @property
+    def translator(self):
+        return self.backends.translator
+    
     def _get_output_directory(self, custom_folder=""):
         """Get the output directory - use custom folder if provided, else default"""
         if custom_folder and os.path.exists(custom_folder):
@@ -53,138 +324,231 @@ class StandaloneTranslator:
         os.makedirs(output_dir, exist_ok=True)
         return output_dir
     
-    def _create_output_file(self, custom_folder=""):
+    def _create_output_file(self, output_dir, suffix=""):
         """Create output file path with timestamp"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"translations_{timestamp}.txt"
-        output_dir = self._get_output_directory(custom_folder)
+        filename = f"translations_{timestamp}{suffix}.txt"
         return os.path.join(output_dir, filename)
     
-    def _initialize_output_file(self):
-        """Initialize the output file with header"""
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 60 + "\n")
-            f.write(f"REAL-TIME {self.source_lang.upper()} TO {self.target_lang.upper()} TRANSLATION LOG\n")
-            f.write("=" * 60 + "\n")
-            f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Languages: {self.source_lang} → {self.target_lang}\n")
-            f.write(f"File: {self.output_file}\n")
-            f.write("=" * 60 + "\n\n")
-    
-    def _should_start_new_paragraph(self, current_time):
-        """Determine if we should start a new paragraph based on timing"""
-        if not self.current_paragraph:
-            return True
-        
-        # If more than 15 seconds since last translation, start new paragraph
-        time_gap = current_time - self.last_translation_time
-        return time_gap > 15.0
-    
-    def _is_complete_sentence(self, text):
-        """Check if text looks like a complete sentence"""
-        # Simple heuristic: ends with sentence-ending punctuation
-        text = text.strip()
-        return any(text.endswith(punct) for punct in ['.', '!', '?', '。', '！', '？'])
-    
-    def _save_translation_with_paragraphs(self, source_text, translated_text):
-        """Save translation to file with paragraph formatting"""
-        current_time = time.time()
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        
-        # Check if we should start a new paragraph
-        should_start_new_paragraph = self._should_start_new_paragraph(current_time)
-        
-        with open(self.output_file, 'a', encoding='utf-8') as f:
-            if should_start_new_paragraph and self.current_paragraph:
-                # Save the completed paragraph
-                f.write("\n" + "─" * 50 + "\n")
-                f.write(f"PARAGRAPH {self.paragraph_counter} COMPLETE\n")
-                f.write("─" * 50 + "\n")
-                for sentence in self.current_paragraph:
-                    f.write(f"• {sentence}\n")
-                f.write("─" * 50 + "\n\n")
-                
-                # Start new paragraph
-                self.current_paragraph = []
-                self.paragraph_counter += 1
-            
-            if should_start_new_paragraph:
-                f.write("\n" + "═" * 50 + "\n")
-                f.write(f"PARAGRAPH {self.paragraph_counter} START: {timestamp}\n")
-                f.write("═" * 50 + "\n")
-            
-            # Save the current translation
-            f.write(f"[{timestamp}]\n")
-            f.write(f"{self.source_lang.upper()}: {source_text}\n")
-            f.write(f"{self.target_lang.upper()}: {translated_text}\n")
-            f.write("-" * 40 + "\n")
-            
-            # Add to current paragraph if it's a complete sentence
-            if self._is_complete_sentence(translated_text):
-                self.current_paragraph.append(translated_text)
-        
-        # Update timing
-        self.last_translation_time = current_time
+    def audio_callback(self, indata, frames, time, status):
+        """Callback for audio stream"""
+        if self.is_listening:
+            self.startup.mark_first_frame()
+            # Downmix, resample to 16 kHz, normalize and convert to 16-bit PCM in one pass
+            audio_bytes = self.preprocessor.process(indata)
+            self.capture_monitor.on_block(frames, status, len(audio_bytes) // 2 if audio_bytes else 0)
+            if audio_bytes:
+                self.audio_queue.put(audio_bytes)
+    
+    def open_audio_stream(self):
+        """Open the capture source; frames are dropped until is_listening is set"""
+        if self.stream is not None:
+            return
+        with self.startup.phase("import sounddevice + numpy"):
+            # Only the microphone needs PortAudio; loopback and file sources do not
+            sd = backends.sounddevice() if self.input_source == 'mic' else None
+            import audio_preprocess
+            import capture_sources
+            from capture_monitor import CaptureMonitor
+        with self.startup.phase("open audio device"):
+            # Capture at the source's own rate/channels and convert to 16 kHz mono ourselves,
+            # so devices that only offer 44.1/48 kHz stereo work too
+            source = capture_sources.create_source(self.input_source, sd)
+            blocksize = max(256, source.samplerate * 1024 // self.sample_rate)
+            self.preprocessor = audio_preprocess.AudioPreprocessor(
+                source.samplerate, source.channels, self.sample_rate, max_block=blocksize * 2
+            )
+            self.set_noise_suppression(self.denoise)
+            self.capture_monitor = CaptureMonitor(source.samplerate, self.sample_rate,
+                                                  realtime=getattr(source, 'realtime', True))
+            source.start(self.audio_callback, blocksize)
+            self.stream = source
+        print(f"🎚️ Capturing from {source.description} at {source.samplerate} Hz, "
+              f"{source.channels} channel(s) → {self.sample_rate} Hz mono")
+        sys.stdout.flush()
+    
+    def set_input_source(self, spec):
+        """Switch between 'mic', 'loopback' and a file/pipe; reopens the capture if it is open"""
+        spec = spec or 'mic'
+        if spec == self.input_source:
+            return
+        self.input_source = spec
+        if self.stream is not None:
+            self.close_audio_stream()
+            self.open_audio_stream()
+    
+    def set_noise_suppression(self, enabled):
+        """Turn the noise suppressor on or off; takes effect on the next capture block"""
+        self.denoise = enabled
+        if enabled and self.denoiser is None:
+            from noise_suppression import SpectralGate
+            self.denoiser = SpectralGate(self.sample_rate)
+        if self.preprocessor is not None:
+            self.preprocessor.denoiser = self.denoiser if enabled else None
+    
+    def set_profiling(self, enabled):
+        """Start sampling all threads, or stop and write the profile; returns the files written"""
+        if enabled:
+            if self.sampler is None:
+                from sampling_profiler import SamplingProfiler
+                self.sampler = SamplingProfiler().start()
+                print("🔬 Profiling started")
+                sys.stdout.flush()
+            return []
+        if self.sampler is None:
+            return []
+        sampler, self.sampler = self.sampler, None
+        sampler.stop()
+        output_dir = getattr(self, "output_dir", None) or os.getcwd()
+        paths = sampler.dump(os.path.join(output_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"))
+        print(f"🔬 {sampler.report()}")
+        print(f"🔬 Profile saved: {paths[0]} (flamegraph input) and {paths[1]}")
+        sys.stdout.flush()
+        return paths
+    
+    def set_speaker_detection(self, enabled):
+        """Detect speaker changes in the captured audio; a running session starts detecting immediately"""
+        self.speaker_turns = enabled
+        if not enabled:
+            self.speaker_detector = None
+        elif self.speaker_detector is None and self.session_active:
+            from speaker_change import SpeakerChangeDetector
+            self.speaker_detector = SpeakerChangeDetector(self.sample_rate, start_sample=self.samples_captured)
+    
+    def _speaker_cut(self):
+        """Sample where the buffered audio should be cut at a speaker change, or None
         
-        # Debug info
-        print(f"📝 Paragraph {self.paragraph_counter}, Sentences: {len(self.current_paragraph)}")
-        print(f"💾 Saved to: {self.output_file}")
+        Only changes with at least a second of audio before them are cut at;
+        earlier ones are left inside the window.
+        """
+        if self.speaker_detector is None:
+            return None
+        end = self.samples_captured
+        start = end - len(self.audio_buffer) // 2
+        return self.speaker_detector.first_change(start + self.sample_rate, end)
+    
+    def set_glossary(self, path):
+        """Load a glossary file (reloaded automatically when it changes), or drop it when path is None"""
+        if not path:
+            self.glossary = None
+            return
+        if self.glossary is not None and self.glossary.path == path:
+            return
+        from glossary import Glossary
+        try:
+            self.glossary = Glossary(path)
+            print(f"📖 Glossary loaded: {path}")
+        except (OSError, UnicodeDecodeError) as e:
+            self.glossary = None
+            print(f"❌ Could not load glossary {path}: {e}")
         sys.stdout.flush()
     
-    def _save_final_paragraph(self):
-        """Save any remaining sentences in the current paragraph when stopping"""
-        if self.current_paragraph:
-            with open(self.output_file, 'a', encoding='utf-8') as f:
-                f.write("\n" + "─" * 50 + "\n")
-                f.write(f"PARAGRAPH {self.paragraph_counter} COMPLETE (FINAL)\n")
-                f.write("─" * 50 + "\n")
-                for sentence in self.current_paragraph:
-                    f.write(f"• {sentence}\n")
-                f.write("─" * 50 + "\n\n")
-            
-            print(f"💾 Saved final paragraph with {len(self.current_paragraph)} sentences")
+    def set_translation_memory(self, threshold):
+        """Index past transcripts in the output folder for fuzzy reuse, or turn the memory off with None"""
+        if threshold is None:
+            self.translation_memory = None
+            return
+        memory = self.translation_memory
+        if memory is not None and memory.folder == self.output_dir:
+            memory.threshold = threshold
+            return
+        from translation_memory import TranslationMemory
+        self.translation_memory = TranslationMemory(self.output_dir, threshold).start()
+    
+    def set_second_pass(self, threshold):
+        """Re-recognize sentences below `threshold` confidence in the background, or stop with None"""
+        if self.second_pass is not None:
+            if threshold is not None:
+                self.second_pass.threshold = threshold
+                return
+            self.second_pass.close()
+            self.second_pass = None
+        if threshold is None:
+            return
+        
+        def recognize(pcm, language):
+            sr = backends.speech_recognition()
+            return recognize_nbest(self.recognizer, sr.AudioData(pcm, self.sample_rate, 2), recognizer_locale(language))
+        
+        def translate(text, source):
+            return {target: self._translate_one(text, source, target, self._thread_translator())
+                    for target in list(self.target_langs)}
+        
+        self.second_pass = SecondPass(recognize, translate, threshold)
+    
+    def set_caption_server(self, port):
+        """Start the live caption server on `port`, or stop it when port is None"""
+        if self.caption_server is not None:
+            if port is not None and port in (0, self.caption_server.port):
+                return
+            self.caption_server.close()
+            self.caption_server = None
+        if port is not None:
+            from caption_server import CaptionServer
+            try:
+                self.caption_server = CaptionServer(port).start()
+            except OSError as e:
+                print(f"❌ Could not start caption server on port {port}: {e}")
+                sys.stdout.flush()
+    
+    def set_metrics(self, port, snapshot_path=None):
+        """Export the pipeline metrics on `port` and/or to a JSON file, or stop when both are None"""
+        exporter = self.metrics_exporter
+        if exporter is not None:
+            if port in (0, exporter.port) and snapshot_path == exporter.snapshot_path:
+                return
+            exporter.close()
+            metrics.registry.remove_collector(self._collect_metrics)
+            self.metrics_exporter = None
+        if port is None and not snapshot_path:
+            return
+        try:
+            self.metrics_exporter = metrics.MetricsExporter(port, snapshot_path=snapshot_path).start()
+        except OSError as e:
+            print(f"❌ Could not start metrics endpoint on port {port}: {e}")
             sys.stdout.flush()
+            return
+        metrics.registry.on_collect(self._collect_metrics)
     
-    def audio_callback(self, indata, frames, time, status):
-        """Callback for audio stream"""
-        if self.is_listening:
-            # Convert numpy array to bytes (16-bit PCM)
-            audio_bytes = (indata * 32767).astype(np.int16).tobytes()
-            self.audio_queue.put(audio_bytes)
+    def _collect_metrics(self):
+        """Queue and buffer gauges are read when scraped rather than kept current"""
+        QUEUE_DEPTH.set(self.audio_queue.qsize())
+        BUFFER_SECONDS.set(len(self.audio_buffer) / 2 / self.sample_rate)
+        if self.capture_monitor is not None:
+            self.capture_monitor.effective_rate()
+    
+    def close_audio_stream(self):
+        """Stop and close the input device"""
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
     
     def start_audio_capture(self):
-        """Start capturing audio using sounddevice"""
+        """Start capturing audio from the configured input source"""
         self.is_listening = True
         try:
-            self.stream = sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=1,
-                callback=self.audio_callback,
-                blocksize=1024,
-                dtype='float32'
-            )
-            self.stream.start()
-            print("🎤 Audio capture started - listening for audio...")
+            self.open_audio_stream()
+            print(f"🎤 Audio capture started ({self.stream.description}) - listening for audio...")
             sys.stdout.flush()
         except Exception as e:
             print(f"❌ Failed to start audio capture: {e}")
             sys.stdout.flush()
             raise
     
-    def process_audio(self):
-        """Process audio and return any translations"""
+    def process_audio(self, min_seconds=1.0):
+        """Recognize and translate the buffered audio; returns a Segment or None"""
         # Collect audio data
-        try:
-            while True:
-                audio_data = self.audio_queue.get_nowait()
-                self.audio_buffer.extend(audio_data)
-        except queue.Empty:
-            pass
+        self._drain_audio_queue()
         
         # Check if we have enough audio to process
-        if len(self.audio_buffer) < self.sample_rate * 2:  # Need at least 1 second
+        if len(self.audio_buffer) < self.sample_rate * 2 * min_seconds:
             return None
         
+        # Segment boundary: pick up any language change before recognizing the next window
+        self._apply_pending_config()
+        
+        sr = backends.speech_recognition()
         try:
             # Convert to AudioData for speech recognition
             audio_data = sr.AudioData(
@@ -192,73 +556,317 @@ class StandaloneTranslator:
                 self.sample_rate, 
                 2  # 16-bit = 2 bytes per sample
             )
+            # Position of this window in the session audio (and its archive)
+            self.segment_counter += 1
+            segment = Segment(
+                self.segment_counter, None,
+                self.samples_captured - len(self.audio_buffer) // 2, self.samples_captured, self.sample_rate
+            )
             
-            # Clear buffer after processing
-            self.audio_buffer.clear()
+            cut = self._speaker_cut()
+            if cut is not None:
+                # End the window where the next speaker starts; their audio stays buffered
+                keep = (cut - segment.start_sample) * 2
+                audio_data = sr.AudioData(bytes(self.audio_buffer[:keep]), self.sample_rate, 2)
+                segment.end_sample = cut
+                del self.audio_buffer[:keep]
+            else:
+                # Clear buffer after processing
+                self.audio_buffer.clear()
+            if self.speaker_detector is not None:
+                segment.speaker_turn = self.speaker_detector.turn_at((segment.start_sample + segment.end_sample) // 2)
+            if self.capture_monitor is not None:
+                segment.capture_glitches = self.capture_monitor.events_between(segment.start_sample, segment.end_sample)
+            # Recent windows stay available for a second recognition pass
+            self._recent_windows.append((segment.start_sample, segment.end_sample, audio_data.frame_data))
             
-            # Try recognition in source language
-            language_code = f'{self.source_lang}-{self.source_lang.upper()}'
+            # Try recognition in source language (the session prior when auto-detecting)
+            source_lang = self.language_id.current() if self.language_id else self.source_lang
+            language_code = recognizer_locale(source_lang)
             print(f"🔍 Attempting speech recognition for {language_code}...")
             sys.stdout.flush()
             
-            recognized_text = self.recognizer.recognize_google(audio_data, language=language_code)
+            stage_start = time.monotonic_ns()
+            try:
+                hypotheses = recognize_nbest(self.recognizer, audio_data, language_code)
+            except sr.UnknownValueError:
+                if self.language_id:
+                    self.language_id.note_failure()
+                raise
+            segment.recognize_ns = time.monotonic_ns() - stage_start
+            SEGMENTS.inc()
+            recognized_text = hypotheses[0].text
+            segment.confidence = hypotheses[0].confidence
+            segment.alternatives = [tuple(h) for h in hypotheses]
+            if segment.confidence is not None and segment.confidence < 0.7:
+                print(f"🎯 Low confidence {segment.confidence:.2f}")
+                print_alternatives(hypotheses)
             
-            # Send recognized text to GUI immediately
-            print(f"🔊 RECOGNIZED_{self.source_lang.upper()}: {recognized_text}")
-            sys.stdout.flush()
+            if self.language_id:
+                first_lang = source_lang
+                recognized_text, source_lang = self._identify_language(audio_data, recognized_text, source_lang)
+                if source_lang != first_lang:
+                    # Re-recognized in another language: the first pass's scores no longer apply
+                    segment.confidence = None
+                    segment.alternatives = []
+                segment.language_id_ns = int(self.language_id.last_latency_ms * 1e6)
+                segment.language_confidence = self.language_id.last_confidence
+            segment.source_lang = source_lang
+            segment.source_text = recognized_text
             
-            # Translate to target language
-            print("🔄 Translating...")
-            sys.stdout.flush()
-            translated_text = self.translator.translate(recognized_text, src=self.source_lang, dest=self.target_lang).text
-            
-            # Send translated text to GUI immediately
-            print(f"🌐 TRANSLATED_{self.target_lang.upper()}: {translated_text}")
-            sys.stdout.flush()
-            
-            # Save to file with paragraph formatting
-            self._save_translation_with_paragraphs(recognized_text, translated_text)
+            # Send recognized text to GUI immediately
+            event_bus.publish("caption", f"🔊 RECOGNIZED_{source_lang.upper()}: {recognized_text}",
+                              stage="recognized", lang=source_lang, caption=recognized_text,
+                              segment=segment.index)
             
-            return {
-                'source_text': recognized_text,
-                'translated_text': translated_text,
-                'timestamp': datetime.now().strftime('%H:%M:%S')
-            }
+            # Hold the fragment until its sentence is complete (or the deadline passes)
+            if self.assembler is not None:
+                sentences = self.assembler.add(segment, self._trailing_silence(audio_data.frame_data))
+                pending = self.assembler.pending
+            else:
+                sentences, pending = [segment], segment
+            if self.caption_server is not None and pending is not None:
+                self.caption_server.publish_partial(pending)
+            delivered = self._translate_sentences(sentences)
+            REAL_TIME_FACTOR.set(segment.elapsed_ns() / 1e9 / segment.duration)
+            return delivered
             
         except sr.UnknownValueError:
+            NO_SPEECH.inc()
             print("🔇 No speech detected in audio")
             sys.stdout.flush()
+            if self.assembler is not None:
+                # A silent window ends whatever sentence was in progress
+                return self._translate_sentences(self.assembler.pause())
         except sr.RequestError as e:
+            RECOGNIZER_ERRORS.inc(kind="request")
             print(f"❌ Speech recognition error: {e}")
             sys.stdout.flush()
         except Exception as e:
+            RECOGNIZER_ERRORS.inc(kind="processing")
             print(f"❌ Processing error: {e}")
             sys.stdout.flush()
         
         return None
     
-    def run_translation_loop(self):
+    def _translate_sentences(self, sentences):
+        """Translate and write each completed sentence; returns the last one delivered"""
+        delivered = None
+        for segment in sentences:
+            try:
+                delivered = self._deliver(segment) or delivered
+            except Exception as e:
+                print(f"❌ Processing error: {e}")
+                sys.stdout.flush()
+        return delivered
+    
+    def _deliver(self, segment):
+        """Translate one sentence into every target language and hand it to every sink"""
+        print("🔄 Translating...")
+        sys.stdout.flush()
+        stage_start = time.monotonic_ns()
+        segment.translations = self._translate_all(segment.source_text, segment.source_lang)
+        segment.translate_ns = time.monotonic_ns() - stage_start
+        if not segment.translations:
+            return None
+        
+        stage_start = time.monotonic_ns()
+        for target, translated_text in segment.translations.items():
+            # Send translated text to GUI immediately
+            event_bus.publish("caption", f"🌐 TRANSLATED_{target.upper()}: {translated_text}",
+                              stage="translated", lang=target, caption=translated_text,
+                              segment=segment.index)
+            
+            # Save to file with paragraph formatting
+            self.writers[target].write_segment(segment)
+        if self.caption_server is not None:
+            self.caption_server.publish_final(segment)
+        if self.translation_memory is not None:
+            self.translation_memory.add_segment(segment)
+        if self.history is not None:
+            self.history.append(segment)
+        segment.write_ns = time.monotonic_ns() - stage_start
+        self._observe_latencies(segment)
+        self._submit_second_pass(segment)
+        self._last_delivered_text = segment.source_text
+        print(f"⏱️ Segment {segment.index}: {segment.latency_report()}")
+        sys.stdout.flush()
+        return segment
+    
+    def _observe_latencies(self, segment):
+        SENTENCES.inc()
+        STAGE_LATENCY.observe(segment.recognize_ns / 1e9, stage="recognize")
+        if segment.language_id_ns:
+            STAGE_LATENCY.observe(segment.language_id_ns / 1e9, stage="language_id")
+        STAGE_LATENCY.observe(segment.translate_ns / 1e9, stage="translate")
+        STAGE_LATENCY.observe(segment.write_ns / 1e9, stage="write")
+        # From the moment the window was cut to the sentence reaching every sink
+        STAGE_LATENCY.observe(segment.elapsed_ns() / 1e9, stage="end_to_end")
+    
+    def _submit_second_pass(self, segment):
+        """Hand a low-confidence sentence's audio to the background recognizer"""
+        if self.second_pass is None or not self.second_pass.wants(segment):
+            return
+        windows = [w for w in self._recent_windows if w[0] < segment.end_sample and w[1] > segment.start_sample]
+        if not windows:
+            return
+        pcm = b"".join(w[2] for w in windows)
+        context = ""
+        earlier = [w for w in self._recent_windows if w[1] <= windows[0][0]]
+        if len(windows) == 1 and earlier and self._last_delivered_text:
+            # A single window gets the last second before it as context
+            pcm = earlier[-1][2][-self.sample_rate * 2:] + pcm
+            context = self._last_delivered_text
+        self.second_pass.submit(segment, pcm, context)
+    
+    def _apply_revisions(self):
+        """Publish and record second-pass corrections that have finished"""
+        for revision in self.second_pass.revisions():
+            segment = revision.segment
+            previous_text = segment.source_text
+            segment.source_text = revision.text
+            segment.confidence = revision.confidence
+            segment.translations = revision.translations or segment.translations
+            event_bus.publish("revision", f"✏️ REVISED segment {segment.index}: {previous_text} → {revision.text}",
+                              segment=segment.index, lang=segment.source_lang, caption=revision.text,
+                              previous=previous_text, translations=segment.translations,
+                              confidence=revision.confidence)
+            for target, writer in self.writers.items():
+                if target in segment.translations:
+                    writer.write_revision(segment, previous_text)
+            if self.caption_server is not None:
+                self.caption_server.publish_final(segment)
+            if self.translation_memory is not None:
+                self.translation_memory.add_segment(segment)
+    
+    def _trailing_silence(self, pcm, threshold=0.02):
+        """Seconds of quiet at the end of a window (20 ms frames below `threshold` RMS)"""
+        import numpy as np
+        
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        frame = self.sample_rate // 50
+        count = len(samples) // frame
+        if count == 0:
+            return 0.0
+        frames = samples[len(samples) - count * frame:].reshape(count, frame).astype(np.float32) / 32768.0
+        loud = np.flatnonzero(np.sqrt((frames * frames).mean(axis=1)) >= threshold)
+        quiet = count if len(loud) == 0 else count - 1 - loud[-1]
+        return quiet * frame / self.sample_rate
+    
+    def _identify_language(self, audio_data, recognized_text, source_lang):
+        """Check the recognized text's language; re-recognize once if the speaker switched"""
+        detected = self.language_id.decide(recognized_text)
+        print(f"🧭 LID: {detected} (confidence {self.language_id.last_confidence:.2f}, "
+              f"{self.language_id.last_source}) in {self.language_id.last_latency_ms:.3f} ms")
+        sys.stdout.flush()
+        
+        if detected != source_lang:
+            print(f"🧭 Language switch detected: {source_lang} → {detected}, re-recognizing segment")
+            sys.stdout.flush()
+            recognized_text = self.recognizer.recognize_google(audio_data, language=recognizer_locale(detected))
+            source_lang = detected
+        return recognized_text, source_lang
+    
+    def _thread_translator(self):
+        """Return this worker thread's own googletrans client"""
+        translator = getattr(self._thread_local, "translator", None)
+        if translator is None:
+            translator = backends.googletrans().Translator()
+            self._thread_local.translator = translator
+        return translator
+    
+    def _translate_one(self, text, source, target, translator):
+        def translate(text):
+            return translator.translate(text, src=translator_code(source), dest=translator_code(target)).text
+        
+        memory = self.translation_memory
+        if memory is not None:
+            remembered = memory.lookup(text, source, target)
+            if remembered is not None:
+                CACHE_HITS.inc(cache="translation_memory")
+                return remembered
+        
+        glossary = self.glossary
+        if glossary is not None:
+            return glossary.translate(text, source, target, translate)
+        return translate(text)
+    
+    def _translate_all(self, text, source=None):
+        """Translate one recognized segment into every target language
+        
+        With several targets the calls run concurrently, so each extra
+        language costs one translation request rather than a pipeline.
+        """
+        source = source or self.source_lang
+        targets = list(self.target_langs)
+        if len(targets) == 1:
+            return {targets[0]: self._translate_one(text, source, targets[0], self.translator)}
+        
+        if self._translate_pool is None or self._translate_pool_size < len(targets):
+            if self._translate_pool is not None:
+                self._translate_pool.shutdown(wait=False)
+            self._translate_pool = ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="translate")
+            self._translate_pool_size = len(targets)
+        
+        futures = {
+            target: self._translate_pool.submit(lambda t: self._translate_one(text, source, t, self._thread_translator()), target)
+            for target in targets
+        }
+        translations = {}
+        for target, future in futures.items():
+            try:
+                translations[target] = future.result()
+            except Exception as e:
+                # One failing language must not cost the others their caption
+                print(f"❌ Translation error ({target}): {e}")
+                sys.stdout.flush()
+        return translations
+    
+    def run_translation_loop(self, keep_stream_open=False):
         """Main translation loop for GUI"""
         print("🔄 Starting translation loop...")
         # Initialize the file here to ensure it's created when translation starts
-        self._initialize_output_file()
+        with self.startup.phase("initialize output file"):
+            self._start_archive()
+            self._start_history()
+            self.assembler = SentenceAssembler(self.sentence_delay) if self.sentence_delay > 0 else None
+            if self.speaker_turns:
+                from speaker_change import SpeakerChangeDetector
+                self.speaker_detector = SpeakerChangeDetector(self.sample_rate)
+            self._recent_windows.clear()
+            self._last_delivered_text = ""
+            for writer in self.writers.values():
+                writer.write_header()
+        self.session_active = True
         sys.stdout.flush()
         self.start_audio_capture()
         
         try:
             last_process_time = time.time()
             audio_level_check_time = time.time()
+            memory_report_time = time.time()
             consecutive_no_audio = 0
             
             while self.is_listening:
                 current_time = time.time()
                 
+                # A file or pipe ran out: recognize what is left and end the session
+                if self.stream is not None and self.stream.finished and self.audio_queue.empty():
+                    self._process_remaining_audio()
+                    print("📄 Input finished - ending the session")
+                    sys.stdout.flush()
+                    break
+                
+                # Report startup timings once audio is flowing and the backends are warm
+                if not self.startup.reported and self.startup.first_frame_at is not None and self.backends.ready:
+                    self.startup.report()
+                
                 # Show audio level periodically
                 if current_time - audio_level_check_time > 2.0:
                     buffer_seconds = len(self.audio_buffer) / (self.sample_rate * 2)
                     queue_size = self.audio_queue.qsize()
-                    print(f"📊 Audio buffer: {buffer_seconds:.1f}s | Queue: {queue_size}")
-                    sys.stdout.flush()
+                    event_bus.publish("status", f"📊 Audio buffer: {buffer_seconds:.1f}s | Queue: {queue_size}",
+                                      buffer_seconds=round(buffer_seconds, 1), queue=queue_size)
                     
                     # Check if we're getting any audio data
                     if buffer_seconds < 0.1 and queue_size == 0:
@@ -268,17 +876,32 @@ class StandaloneTranslator:
                             sys.stdout.flush()
                     else:
                         consecutive_no_audio = 0
+                    self._warn_capture_glitches()
                     
                     audio_level_check_time = current_time
                 
-                # Process audio every 3 seconds
-                if current_time - last_process_time > 3.0:
+                # Long sessions: RSS should stay flat however long we run
+                if self.memory is not None and current_time - memory_report_time > 600.0:
+                    print(f"🧠 {self.memory.report()} | {self.history.report()}")
+                    sys.stdout.flush()
+                    memory_report_time = current_time
+                
+                # Process audio every 3 seconds, or as soon as a speaker change closes a window
+                if self.speaker_detector is not None:
+                    self._drain_audio_queue()
+                if current_time - last_process_time > 3.0 or self._speaker_cut() is not None:
                     translation = self.process_audio()
                     last_process_time = current_time
+                elif self.assembler is not None:
+                    # Never hold a sentence back longer than the deadline
+                    self._translate_sentences(self.assembler.due())
+                if self.second_pass is not None:
+                    self._apply_revisions()
                 
                 # Limit buffer size
                 if len(self.audio_buffer) > self.sample_rate * 2 * 5:  # Max 5 seconds
-                    self.audio_buffer = self.audio_buffer[self.sample_rate * 2:]
+                    del self.audio_buffer[:self.sample_rate * 2]  # in place, no reallocation
+                    DROPPED_SAMPLES.inc(self.sample_rate, where="buffer")
                 
                 time.sleep(0.1)
                 
@@ -289,42 +912,147 @@ class StandaloneTranslator:
             print(f"❌ Error in translation loop: {e}")
             sys.stdout.flush()
         finally:
-            self.cleanup()
+            if keep_stream_open:
+                self.finish_session()
+            else:
+                self.cleanup()
     
-    def cleanup(self):
-        """Cleanup resources"""
+    def _process_remaining_audio(self):
+        """Recognize the audio still buffered once no more will arrive, including a last window under 1 s"""
+        self._drain_audio_queue()
+        while len(self.audio_buffer) >= self.sample_rate * 2 // 10:
+            buffered = len(self.audio_buffer)
+            self.process_audio(min_seconds=0.1)
+            if len(self.audio_buffer) >= buffered:
+                break
+    
+    def _warn_capture_glitches(self):
+        """Report device overflows/underflows since the last check; the callback itself must not print"""
+        events = self.capture_monitor.new_events() if self.capture_monitor is not None else []
+        if not events:
+            return
+        kinds = sorted({kind for _, _, kind in events})
+        event_bus.publish("status", f"⚠️  Audio input {'/'.join(kinds)}: {len(events)} event(s) at "
+                                    f"{events[0][0] / self.sample_rate:.1f}s - the host is too loaded for "
+                                    "real-time capture", capture_glitches=len(events))
+    
+    def finish_session(self):
+        """Write the final paragraph and session summary (only once per session)"""
         self.is_listening = False
-        # Save any remaining paragraph
-        self._save_final_paragraph()
-        
-        # Add final summary
-        with open(self.output_file, 'a', encoding='utf-8') as f:
-            f.write("\n" + "=" * 60 + "\n")
-            f.write("SESSION SUMMARY\n")
-            f.write("=" * 60 + "\n")
-            f.write(f"Ended: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Total paragraphs: {self.paragraph_counter}\n")
-            f.write(f"File location: {self.output_file}\n")
-            f.write("=" * 60 + "\n")
-        
-        if hasattr(self, 'stream'):
-            self.stream.stop()
-            self.stream.close()
-        print(f"✅ Translation stopped. File saved to: {self.output_file}")
+        if not self.session_active:
+            return
+        self.session_active = False
+        
+        if self.assembler is not None:
+            # The sentence in progress when translation stopped still belongs in the transcript
+            self._translate_sentences(self.assembler.flush())
+            print(f"🧩 {self.assembler.report()}")
+            self.assembler = None
+        for writer in self.writers.values():
+            writer.finish()
+            print(f"✅ Translation stopped. File saved to: {writer.output_file}")
+        if self.language_id:
+            print(f"🧭 {self.language_id.report()}")
+        if self.capture_monitor is not None:
+            print(f"🎙️ {self.capture_monitor.report()}")
+        if self.denoise and self.denoiser is not None:
+            print(f"🔇 {self.denoiser.report()}")
+        if self.speaker_detector is not None:
+            print(f"🗣️ {self.speaker_detector.report()}")
+            self.speaker_detector = None
+        if self.second_pass is not None:
+            self._apply_revisions()
+            print(f"✏️ {self.second_pass.report()}")
+        if self.glossary is not None:
+            print(f"📖 {self.glossary.report()}")
+        if self.translation_memory is not None:
+            print(f"📚 {self.translation_memory.report()}")
+        if self.caption_server is not None:
+            print(f"📺 {self.caption_server.report()}")
+        if self.metrics_exporter is not None:
+            print(f"📈 {self.metrics_exporter.report()}")
+        if self.archiver is not None:
+            # Audio captured after the last recognized window still belongs in the archive
+            self._drain_audio_queue()
+            print(f"🗜️ {self.archiver.close()}")
+            self.archiver = None
+        if self.history is not None:
+            self.history.close()
+            print(f"🧠 {self.memory.report()} | {self.history.report()}")
+            self.history = None
+            self.memory = None
         sys.stdout.flush()
+    
+    def cleanup(self):
+        """Cleanup resources"""
+        self.finish_session()
+        self.close_audio_stream()
+        self.set_caption_server(None)
+        self.set_metrics(None)
+        self.set_second_pass(None)
+        self.set_profiling(False)
+        if self._translate_pool is not None:
+            self._translate_pool.shutdown(wait=False)
+            self._translate_pool = None
+            self._translate_pool_size = 0
 
-def main():
+def main(argv=None):
     """Main function for command line usage"""
-    source_lang = sys.argv[1] if len(sys.argv) > 1 else "it"
-    target_lang = sys.argv[2] if len(sys.argv) > 2 else "en"
-    output_folder = sys.argv[3] if len(sys.argv) > 3 else ""
+    profiler = StartupProfiler()
+    parser = argparse.ArgumentParser(description="Real-time speech translator")
+    parser.add_argument("source_lang", nargs="?", default="it",
+                        help="source language, 'auto' or 'auto:it,en' to detect it per segment")
+    parser.add_argument("target_lang", nargs="?", default="en",
+                        help="target language, comma-separated for several (e.g. en,de,es)")
+    parser.add_argument("output_folder", nargs="?", default="")
+    parser.add_argument("--input", default="mic", metavar="mic|loopback|PATH",
+                        help="capture from the microphone, system audio (PulseAudio/PipeWire monitor) "
+                             "or a WAV/raw 16 kHz PCM file ('-' for stdin)")
+    parser.add_argument("--archive-audio", nargs="?", const="flac", choices=["flac", "opus"],
+                        help="save the session audio next to the transcript (default format: flac)")
+    parser.add_argument("--long-session", action="store_true",
+                        help="bounded memory for all-day sessions: older history is spilled to disk")
+    parser.add_argument("--denoise", action="store_true",
+                        help="suppress steady background noise (fans, hum) before recognition")
+    parser.add_argument("--captions", nargs="?", type=int, const=8765, metavar="PORT",
+                        help="serve live captions for overlays/OBS over SSE and shared memory (default port 8765)")
+    parser.add_argument("--glossary", metavar="FILE",
+                        help="tab-separated terminology file applied to every translation (reloaded when edited)")
+    parser.add_argument("--sentence-delay", type=float, default=6.0, metavar="SECONDS",
+                        help="join recognized windows into sentences before translating, holding text at most "
+                             "this long (0 translates every window on its own)")
+    parser.add_argument("--translation-memory", nargs="?", type=float, const=0.9, metavar="SIMILARITY",
+                        help="reuse translations of identical or near-identical sentences from past sessions "
+                             "in the output folder (default similarity 0.9)")
+    parser.add_argument("--second-pass", nargs="?", type=float, const=0.7, metavar="CONFIDENCE",
+                        help="re-recognize sentences below this recognizer confidence in the background "
+                             "and publish corrections (default 0.7)")
+    parser.add_argument("--metrics", nargs="?", type=int, const=metrics.DEFAULT_METRICS_PORT, metavar="PORT",
+                        help="serve pipeline metrics for Prometheus at /metrics (default port 9464)")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="also write the metrics as a JSON snapshot to this file every 15 seconds")
+    parser.add_argument("--profile", action="store_true",
+                        help="sample every thread while running and write a flamegraph-ready profile on exit")
+    parser.add_argument("--speaker-turns", action="store_true",
+                        help="detect speaker changes and start a new sentence and paragraph at each one")
+    args = parser.parse_args(argv)
+    source_lang = args.source_lang
+    target_lang = args.target_lang
+    output_folder = args.output_folder
     
     print(f"🚀 Starting Standalone Translator: {source_lang} → {target_lang}")
     if output_folder:
         print(f"📁 Custom output folder: {output_folder}")
     sys.stdout.flush()
     
-    translator = StandaloneTranslator(source_lang, target_lang, output_folder)
+    translator = StandaloneTranslator(source_lang, target_lang, output_folder, profiler=profiler,
+                                      denoise=args.denoise, input_source=args.input,
+                                      archive_audio=args.archive_audio, long_session=args.long_session,
+                                      captions_port=args.captions, glossary=args.glossary,
+                                      sentence_delay=args.sentence_delay,
+                                      translation_memory=args.translation_memory, second_pass=args.second_pass,
+                                      speaker_turns=args.speaker_turns, profile=args.profile,
+                                      metrics_port=args.metrics, metrics_file=args.metrics_file)
     
     try:
         translator.run_translation_loop()
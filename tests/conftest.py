@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Pipeline modules are imported flat from src/, as standalone_translator.py does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
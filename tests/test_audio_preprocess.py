@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from audio_preprocess import PolyphaseResampler
+
+
+def resample_tone(input_rate, frequency, seconds=2.0, block=1024):
+    resampler = PolyphaseResampler(input_rate, 16000)
+    t = np.arange(int(seconds * input_rate)) / input_rate
+    signal = (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+    output = np.concatenate([resampler.process(signal[i:i + block]).copy()
+                             for i in range(0, len(signal), block)])
+    # Skip the filter's start-up transient
+    return signal, output[len(output) // 4:]
+
+
+def level_db(output, signal):
+    rms = lambda x: np.sqrt(np.mean(np.asarray(x, dtype=np.float64) ** 2))
+    return 20 * np.log10(rms(output) / rms(signal))
+
+
+@pytest.mark.parametrize("input_rate", [48000, 44100, 32000])
+def test_stopband_rejects_aliases_by_60_db(input_rate):
+    # 11 kHz is above the 8 kHz output Nyquist and would fold back to 5 kHz
+    signal, output = resample_tone(input_rate, 11000)
+    assert level_db(output, signal) <= -60.0
+
+
+@pytest.mark.parametrize("input_rate", [48000, 44100, 22050])
+def test_passband_is_preserved(input_rate):
+    signal, output = resample_tone(input_rate, 1000)
+    assert abs(level_db(output, signal)) < 0.5
+
+
+def test_output_length_follows_the_ratio():
+    resampler = PolyphaseResampler(44100, 16000)
+    total = sum(len(resampler.process(np.zeros(441, dtype=np.float32))) for _ in range(100))
+    assert abs(total - 16000) <= 1
@@ -0,0 +1,70 @@
+import numpy as np
+
+from batch_translate import split_on_pauses
+
+RATE = 16000
+
+
+def pcm(*parts):
+    """(seconds, amplitude) parts as PCM16 bytes; amplitude 0 is silence"""
+    chunks = []
+    for seconds, amplitude in parts:
+        t = np.arange(int(seconds * RATE)) / RATE
+        chunks.append(amplitude * np.sin(2 * np.pi * 220 * t))
+    return (np.concatenate(chunks) * 32767).astype(np.int16).tobytes()
+
+
+def assert_covers(windows, total_samples):
+    assert windows[0][0] == 0
+    assert windows[-1][1] == total_samples
+    for (_, end, _, _), (start, _, _, _) in zip(windows, windows[1:]):
+        assert end == start
+
+
+def test_short_recording_is_one_window():
+    audio = pcm((3.0, 0.3))
+    windows = split_on_pauses(audio)
+
+    assert len(windows) == 1
+    assert_covers(windows, len(audio) // 2)
+    assert windows[0][3]
+
+
+def test_cut_lands_in_the_pause():
+    audio = pcm((7.0, 0.3), (1.0, 0.0), (8.0, 0.3))
+    windows = split_on_pauses(audio, max_seconds=15.0)
+
+    assert_covers(windows, len(audio) // 2)
+    cut = windows[0][1] / RATE
+    assert 7.0 <= cut <= 8.0
+    assert windows[0][2] >= 0.4  # the pause before the cut stays with the window it ends
+
+
+def test_windows_never_exceed_the_maximum():
+    audio = pcm((40.0, 0.3))
+    windows = split_on_pauses(audio, min_seconds=4.0, max_seconds=15.0)
+
+    assert_covers(windows, len(audio) // 2)
+    assert all((end - start) / RATE <= 15.0 for start, end, _, _ in windows)
+
+
+def test_last_window_may_be_shorter_than_the_minimum():
+    audio = pcm((14.0, 0.3), (0.5, 0.0), (1.0, 0.3))
+    windows = split_on_pauses(audio, min_seconds=4.0, max_seconds=15.0)
+
+    assert_covers(windows, len(audio) // 2)
+    assert (windows[-1][1] - windows[-1][0]) / RATE < 4.0
+
+
+def test_all_silent_input_has_no_speech():
+    audio = pcm((20.0, 0.0))
+    windows = split_on_pauses(audio)
+
+    assert_covers(windows, len(audio) // 2)
+    assert not any(has_speech for _, _, _, has_speech in windows)
+    assert all(pause == (end - start) / RATE for start, end, pause, _ in windows)
+
+
+def test_empty_and_partial_frame_input():
+    assert split_on_pauses(b"") == []
+    assert split_on_pauses(b"\x00\x00" * 100) == []
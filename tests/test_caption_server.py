@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from caption_server import SHM_HEADER, CaptionServer, read_shared_snapshot
+from segment import Segment
+
+shared_memory = pytest.importorskip("multiprocessing.shared_memory")
+
+
+def test_leftover_shared_memory_is_reused(tmp_path):
+    name = f"rt_test_captions_{os.getpid()}"
+    # A crashed writer's segment: smaller than the default and stuck mid-update (odd sequence)
+    stale = shared_memory.SharedMemory(name=name, create=True, size=4096)
+    SHM_HEADER.pack_into(stale.buf, 0, 7, 0)
+    server = CaptionServer(port=0, shm_name=name).start()
+    try:
+        assert server.shm_size == stale.size
+        segment = Segment(1, "it")
+        segment.source_text = "ciao " * 2000
+        segment.translations = {"en": "hello"}
+        server.publish_final(segment)
+
+        assert read_shared_snapshot(name) == []
+        short = Segment(2, "it")
+        short.source_text = "ciao"
+        server.publish_final(short)
+        assert [caption["source_text"] for caption in read_shared_snapshot(name)] == ["ciao"]
+    finally:
+        server.close()
+        stale.close()
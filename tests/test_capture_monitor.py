@@ -0,0 +1,50 @@
+from capture_monitor import PA_INPUT_OVERFLOW, PA_INPUT_UNDERFLOW, CaptureMonitor
+
+
+class Flags:
+    """sounddevice.CallbackFlags stand-in"""
+
+    def __init__(self, overflow=False, underflow=False):
+        self.input_overflow = overflow
+        self.input_underflow = underflow
+
+    def __bool__(self):
+        return self.input_overflow or self.input_underflow
+
+
+def test_events_are_counted_and_located():
+    monitor = CaptureMonitor(48000, 16000, realtime=False)
+    for i in range(10):
+        monitor.on_block(1536, Flags(overflow=True) if i == 4 else None, 512)
+    monitor.on_block(1536, PA_INPUT_OVERFLOW | PA_INPUT_UNDERFLOW, 512)
+
+    assert monitor.counts == {"overflow": 2, "underflow": 1}
+    assert monitor.events_between(0, 2048) == 0
+    assert monitor.events_between(2048, 2560) == 1
+    assert monitor.events_between(5120, 5632) == 2
+    assert [kind for _, _, kind in monitor.new_events()] == ["overflow", "overflow", "underflow"]
+    assert monitor.new_events() == []
+
+
+def test_event_history_is_bounded():
+    monitor = CaptureMonitor(16000, realtime=False, max_events=8)
+    for _ in range(100):
+        monitor.on_block(512, PA_INPUT_OVERFLOW, 512)
+
+    assert monitor.counts["overflow"] == 100
+    assert len(monitor.events) == len(monitor.event_positions) == 8
+    # Only the latest events are reported once the history has wrapped
+    assert [position for position, _, _ in monitor.new_events()] == [512 * i for i in range(92, 100)]
+    monitor.on_block(512, PA_INPUT_OVERFLOW, 512)
+    assert [position for position, _, _ in monitor.new_events()] == [512 * 100]
+    assert monitor.events_between(512 * 99, 512 * 101) == 2
+
+
+def test_reset_starts_a_new_session():
+    monitor = CaptureMonitor(16000, realtime=False)
+    monitor.on_block(512, PA_INPUT_OVERFLOW, 512)
+    monitor.reset()
+
+    assert monitor.position == 0
+    assert monitor.counts["overflow"] == 0
+    assert monitor.new_events() == []
@@ -0,0 +1,35 @@
+import sys
+import threading
+
+import pytest
+
+load_test = pytest.importorskip("load_test")
+
+
+@pytest.fixture
+def stub_backends(monkeypatch):
+    """Simulated speech_recognition/googletrans for this test only"""
+    for name in ("speech_recognition", "googletrans"):
+        monkeypatch.setitem(sys.modules, name, None)
+    load_test.install_stub_backends(load_test.LatencyModel("recognizer", 0.01, spike_rate=0, error_rate=0),
+                                    load_test.LatencyModel("translator", 0.01, spike_rate=0, error_rate=0))
+
+
+def test_session_ends_at_end_of_file(tmp_path, stub_backends):
+    wav = tmp_path / "input.wav"
+    load_test.synthesize_speech(str(wav), 2.5, seed=1)
+    translator = load_test.standalone_translator.StandaloneTranslator(
+        "it", "en", str(tmp_path / "out"), input_source=str(wav), sentence_delay=6.0)
+
+    loop = threading.Thread(target=translator.run_translation_loop, daemon=True)
+    loop.start()
+    loop.join(timeout=20)
+
+    assert not loop.is_alive()
+    assert not translator.is_listening
+    # Every sample of the file reached the recognizer, the last window included
+    assert translator.samples_captured == 40000
+    assert not translator.audio_buffer
+    transcript = open(translator.output_file, encoding='utf-8').read()
+    assert "<en>" in transcript
+    assert "SESSION SUMMARY" in transcript
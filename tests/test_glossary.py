@@ -0,0 +1,70 @@
+import os
+
+from glossary import Glossary, TermMatcher
+
+
+def matched(matcher, text):
+    return [text[start:end] for start, end, _ in matcher.find(text)]
+
+
+def write_glossary(path, rows):
+    path.write_text("# test glossary\nit\ten\n" + "".join(f"{it}\t{en}\n" for it, en in rows), encoding="utf-8")
+    return str(path)
+
+
+def test_overlapping_terms_take_the_leftmost_longest_match():
+    matcher = TermMatcher(["intelligenza", "intelligenza artificiale", "artificiale generale", "rete"])
+
+    assert matched(matcher, "l'intelligenza artificiale generale e la rete") == [
+        "intelligenza artificiale", "rete"]
+    # Failure links: after "intelligenza a..." fails, the shorter term still matches
+    assert matched(matcher, "intelligenza arti e rete") == ["intelligenza", "rete"]
+
+
+def test_terms_inside_longer_words_do_not_match():
+    matcher = TermMatcher(["rete", "Rossi"])
+
+    assert matched(matcher, "reterete e Rossini, arete") == []
+    assert matched(matcher, "la rete di Rossi.") == ["rete", "Rossi"]
+
+
+def test_mixed_case_and_accented_input():
+    matcher = TermMatcher(["Università di Padova", "città"])
+
+    text = "L'UNIVERSITÀ DI PADOVA è in CITTÀ, non in cittàdina"
+    assert matched(matcher, text) == ["UNIVERSITÀ DI PADOVA", "CITTÀ"]
+
+
+def test_placeholders_survive_a_translation_that_reorders_words(tmp_path):
+    glossary = Glossary(write_glossary(tmp_path / "terms.tsv", [("Mario Rossi", "Mario Rossi"),
+                                                                ("intelligenza artificiale", "AI")]))
+
+    def translate(text):
+        # Reorders the words and spaces out a placeholder, as translation services sometimes do
+        return " ".join(reversed(text.split())).replace("ZX1QJ", "ZX 1 qj")
+
+    result = glossary.translate("Mario Rossi studia intelligenza artificiale", "it", "en", translate)
+
+    assert result == "AI studia Mario Rossi"
+    assert glossary.terms_applied == 2
+    assert glossary.placeholders_lost == 0
+
+
+def test_lost_placeholders_are_counted(tmp_path):
+    glossary = Glossary(write_glossary(tmp_path / "terms.tsv", [("Mario Rossi", "Mario Rossi")]))
+
+    assert glossary.translate("ciao Mario Rossi", "it", "en", lambda text: "hello") == "hello"
+    assert glossary.placeholders_lost == 1
+
+
+def test_glossary_reloads_when_the_file_changes(tmp_path):
+    path = write_glossary(tmp_path / "terms.tsv", [("rete", "network")])
+    glossary = Glossary(path, reload_interval=0.0)
+    assert glossary.translate("la rete", "it", "en", lambda text: text) == "la network"
+
+    write_glossary(tmp_path / "terms.tsv", [("rete", "net")])
+    mtime = os.stat(path).st_mtime + 10
+    os.utime(path, (mtime, mtime))
+
+    assert glossary.translate("la rete", "it", "en", lambda text: text) == "la net"
+    assert glossary.reloads == 1
@@ -0,0 +1,103 @@
+from language_id import LanguageIdentifier, StopwordDetector, parse_source
+
+
+class ScriptedDetector:
+    """Returns the queued (language, confidence) results in order and counts the calls"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+
+    def detect(self, text):
+        self.calls += 1
+        return self.results.pop(0)
+
+
+def test_stopwords_tell_latin_languages_apart():
+    detector = StopwordDetector()
+    assert detector.detect("questa è la riunione che non è finita")[0] == 'it'
+    assert detector.detect("this is the meeting that we have to do")[0] == 'en'
+    assert detector.detect("el proyecto que está en la mesa es muy bueno")[0] == 'es'
+    assert detector.detect("der Bericht ist noch nicht fertig und wir haben")[0] == 'de'
+
+
+def test_script_decides_non_latin_languages():
+    detector = StopwordDetector()
+    assert detector.detect("これは会議です") == ('ja', 1.0)
+    assert detector.detect("это наша встреча")[0] == 'ru'
+    assert detector.detect("今天的会议")[0] == 'zh'
+
+
+def test_no_evidence_is_no_decision():
+    detector = StopwordDetector(['it', 'en'])
+    assert detector.detect("") == (None, 0.0)
+    assert detector.detect("Kubernetes Grafana") == (None, 0.0)
+
+
+def test_low_confidence_result_keeps_the_prior():
+    lid = LanguageIdentifier(['it', 'en'], detector=ScriptedDetector([('en', 0.3)]))
+    assert lid.decide("ok") == 'it'
+    assert lid.current() == 'it'
+
+
+def test_single_uncertain_switch_does_not_move_the_prior():
+    detector = ScriptedDetector([('it', 0.9)] * 3 + [('en', 0.6)] * 4)
+    lid = LanguageIdentifier(['it', 'en'], detector=detector, recheck_every=0)
+    for text in ("uno", "due", "tre"):
+        assert lid.decide(text) == 'it'
+
+    # The segment itself is English, but uncertain results do not switch the session yet
+    assert lid.decide("four") == 'en'
+    assert lid.current() == 'it'
+    lid.decide("five")
+    lid.decide("six")
+    assert lid.current() == 'it'
+    # Once English is the majority of recent decisions the prior follows
+    lid.decide("seven")
+    assert lid.current() == 'en'
+    assert lid.switches == 1
+
+
+def test_majority_moves_the_prior():
+    detector = ScriptedDetector([('en', 0.6)] * 3)
+    lid = LanguageIdentifier(['it', 'en'], detector=detector, recheck_every=0, history_size=3)
+    lid.decide("one")
+    lid.decide("two")
+    assert lid.current() == 'en'
+    assert lid.switches == 1
+
+
+def test_confident_result_switches_immediately():
+    lid = LanguageIdentifier(['it', 'en'], detector=ScriptedDetector([('en', 0.9)]))
+    assert lid.decide("good morning everyone") == 'en'
+    assert lid.current() == 'en'
+
+
+def test_detection_is_skipped_while_stable_and_forced_after_a_failure():
+    detector = ScriptedDetector([('it', 0.9)] * 10)
+    lid = LanguageIdentifier(['it', 'en'], detector=detector, recheck_every=4)
+    for i in range(3):
+        lid.decide(f"frase numero {i}")
+    calls = detector.calls
+    lid.decide("frase numero 3")
+    assert detector.calls == calls  # stable: the prior is reused
+    assert lid.skipped >= 1
+
+    lid.note_failure()
+    lid.decide("frase numero 4")
+    assert detector.calls == calls + 1
+
+
+def test_repeated_text_comes_from_the_cache():
+    detector = ScriptedDetector([('it', 0.9), ('en', 0.9)])
+    lid = LanguageIdentifier(['it', 'en'], detector=detector, recheck_every=0)
+    lid.decide("ciao a tutti")
+    lid.decide("ciao a tutti")
+    assert detector.calls == 1
+    assert lid.cache_hits == 1
+
+
+def test_parse_source():
+    assert parse_source('it') == ('it', None)
+    assert parse_source('auto:it,en') == ('auto', ['it', 'en'])
+    assert parse_source('auto')[1][0] == 'it'
@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+from metrics import MetricsExporter, Registry
+
+
+def exposition(registry):
+    return registry.render().splitlines()
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("rt_test_latency_seconds", "Test latency", ["stage"], buckets=(0.1, 0.5, 1.0))
+    for value in (0.05, 0.1, 0.3, 0.7, 2.0):
+        latency.observe(value, stage="recognize")
+
+    lines = exposition(registry)
+    assert lines[:2] == ["# HELP rt_test_latency_seconds Test latency", "# TYPE rt_test_latency_seconds histogram"]
+    # 0.1 lies exactly on a bound and is counted in that bucket (le is "less than or equal")
+    assert lines[2:] == [
+        'rt_test_latency_seconds_bucket{stage="recognize",le="0.1"} 2',
+        'rt_test_latency_seconds_bucket{stage="recognize",le="0.5"} 3',
+        'rt_test_latency_seconds_bucket{stage="recognize",le="1.0"} 4',
+        'rt_test_latency_seconds_bucket{stage="recognize",le="+Inf"} 5',
+        'rt_test_latency_seconds_sum{stage="recognize"} 3.15',
+        'rt_test_latency_seconds_count{stage="recognize"} 5',
+    ]
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    errors = registry.counter("rt_test_errors_total", "Test errors", ["kind"])
+    errors.inc(kind='say "hi"\\now\nthen')
+
+    assert exposition(registry)[2] == 'rt_test_errors_total{kind="say \\"hi\\"\\\\now\\nthen"} 1'
+
+
+def test_one_name_cannot_be_two_kinds():
+    registry = Registry()
+    counter = registry.counter("rt_test_total", "Test")
+
+    assert registry.counter("rt_test_total", "Other help") is counter
+    with pytest.raises(ValueError):
+        registry.gauge("rt_test_total", "Test")
+
+
+def test_snapshot_file_is_replaced_atomically(tmp_path):
+    registry = Registry()
+    registry.gauge("rt_test_depth", "Test depth").set(3)
+    path = tmp_path / "metrics.json"
+    path.write_text("previous snapshot", encoding="utf-8")
+    exporter = MetricsExporter(port=None, snapshot_path=str(path), registry=registry)
+
+    with open(path, encoding="utf-8") as reader:
+        exporter.write_snapshot()
+        # A reader that opened the old file keeps reading the old, complete content
+        assert reader.read() == "previous snapshot"
+
+    snapshot = json.loads(path.read_text(encoding="utf-8"))
+    assert snapshot["metrics"]["rt_test_depth"]["values"] == [{"labels": {}, "value": 3}]
+    assert os.listdir(tmp_path) == ["metrics.json"]
+    assert exporter.snapshots_written == 1
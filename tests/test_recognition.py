@@ -0,0 +1,86 @@
+import threading
+
+from recognition import Hypothesis, SecondPass, strip_context
+from segment import Segment
+
+
+def test_strip_context_drops_the_echoed_words():
+    context = "Buongiorno a tutti, oggi parliamo del progetto."
+
+    # Fully echoed: the last words of the context come back before the new sentence
+    assert strip_context("oggi parliamo del progetto il cliente vuole una demo", context) == "il cliente vuole una demo"
+    # Partially echoed, with different case and punctuation
+    assert strip_context("Progetto. Il cliente vuole una demo", context) == "Il cliente vuole una demo"
+    # Not echoed at all
+    assert strip_context("il cliente vuole una demo", context) == "il cliente vuole una demo"
+
+
+def segment(text, confidence):
+    seg = Segment(source_lang="it")
+    seg.source_text = text
+    seg.confidence = confidence
+    return seg
+
+
+def run_second_pass(second_pass, jobs):
+    for seg in jobs:
+        second_pass.submit(seg, b"\0\0" * 16000)
+    second_pass.close()
+    second_pass._thread.join(timeout=5)
+    return second_pass.revisions()
+
+
+def test_only_low_confidence_segments_are_wanted():
+    second_pass = SecondPass(lambda pcm, language: [], lambda text, language: {}, threshold=0.7)
+
+    assert second_pass.wants(segment("ciao", 0.5))
+    assert not second_pass.wants(segment("ciao", 0.9))
+    assert not second_pass.wants(segment("ciao", None))
+    second_pass.close()
+
+
+def test_revision_needs_to_beat_the_first_pass_by_the_margin():
+    answers = {"barely": Hypothesis("il cliente vuole una demo", 0.54),
+               "clearly": Hypothesis("il cliente vuole una demo", 0.60),
+               "same words": Hypothesis("Il cliente vuole una cena.", 0.90)}
+    jobs = ["barely", "clearly", "same words"]
+
+    def recognize(pcm, language):
+        return [answers[jobs.pop(0)]]
+
+    second_pass = SecondPass(recognize, lambda text, language: {"en": f"<en> {text}"}, margin=0.05)
+    revisions = run_second_pass(second_pass, [segment("il cliente vuole una cena", 0.5) for _ in range(3)])
+
+    assert [(r.text, r.confidence, r.translations) for r in revisions] == [
+        ("il cliente vuole una demo", 0.60, {"en": "<en> il cliente vuole una demo"})]
+    assert (second_pass.revised, second_pass.unchanged, second_pass.failed) == (1, 2, 0)
+
+
+def test_failed_recognition_keeps_the_first_result():
+    def recognize(pcm, language):
+        raise RuntimeError("no speech")
+
+    second_pass = SecondPass(recognize, lambda text, language: {})
+
+    assert run_second_pass(second_pass, [segment("ciao", 0.4)]) == []
+    assert second_pass.failed == 1
+
+
+def test_pending_jobs_are_bounded():
+    started, release = threading.Event(), threading.Event()
+
+    def recognize(pcm, language):
+        started.set()
+        release.wait(5)
+        return [Hypothesis("uguale", 0.9)]
+
+    second_pass = SecondPass(recognize, lambda text, language: {}, max_pending=2)
+    assert second_pass.submit(segment("uguale", 0.4), b"")
+    started.wait(5)
+    # One job is being recognized; two more may wait, the rest are skipped
+    accepted = [second_pass.submit(segment("uguale", 0.4), b"") for _ in range(4)]
+    release.set()
+
+    assert accepted == [True, True, False, False]
+    assert (second_pass.submitted, second_pass.skipped) == (3, 2)
+    second_pass.close()
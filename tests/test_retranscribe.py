@@ -0,0 +1,91 @@
+from datetime import datetime
+
+from retranscribe import main, plan_windows, read_transcript
+from segment import Segment
+
+HEADER = """============================================================
+REAL-TIME IT TO EN TRANSLATION LOG
+============================================================
+Started: 2026-03-02 23:59:50
+Languages: it → en
+File: session.txt
+Audio archive: session_audio.flac (16000 Hz mono)
+============================================================
+
+"""
+
+
+def entry(clock, source, target, start, end):
+    return (f"[{clock}]\nIT: {source}\nEN: {target}\n"
+            f"AUDIO: samples {start}-{end} ({start / 16000:.2f}s-{end / 16000:.2f}s)\n" + "-" * 40 + "\n")
+
+
+def write_transcript(tmp_path, body):
+    path = tmp_path / "session.txt"
+    path.write_text(HEADER + body, encoding='utf-8')
+    return str(path)
+
+
+def segment(lang, start_seconds, end_seconds):
+    return Segment(0, lang, int(start_seconds * 16000), int(end_seconds * 16000))
+
+
+def test_read_transcript_header_and_entries(tmp_path):
+    path = write_transcript(tmp_path, entry("23:59:52", "buongiorno", "good morning", 32000, 80000)
+                            + entry("23:59:56", "a tutti", "everyone", 80000, 128000))
+    info = read_transcript(path)
+
+    assert info['started'] == datetime(2026, 3, 2, 23, 59, 50)
+    assert (info['source_lang'], info['target_lang']) == ('it', 'en')
+    assert info['archive'] == "session_audio.flac"
+    assert info['sample_rate'] == 16000
+    segments = info['segments']
+    assert [s.source_text for s in segments] == ["buongiorno", "a tutti"]
+    assert segments[0].translations == {'en': "good morning"}
+    assert segments[1].sample_range == (80000, 128000)
+
+
+def test_read_transcript_rolls_over_midnight(tmp_path):
+    path = write_transcript(tmp_path, entry("23:59:58", "prima", "before", 0, 32000)
+                            + entry("00:00:03", "dopo", "after", 32000, 64000))
+    first, second = read_transcript(path)['segments']
+
+    assert datetime.fromtimestamp(first.wall_time) == datetime(2026, 3, 2, 23, 59, 58)
+    assert datetime.fromtimestamp(second.wall_time) == datetime(2026, 3, 3, 0, 0, 3)
+
+
+def test_read_transcript_skips_entries_without_audio(tmp_path):
+    body = "[23:59:52]\nIT: senza audio\nEN: no audio\n" + "-" * 40 + "\n"
+    body += entry("23:59:56", "con audio", "with audio", 0, 16000)
+    segments = read_transcript(write_transcript(tmp_path, body))['segments']
+
+    assert [s.source_text for s in segments] == ["con audio"]
+
+
+def test_plan_windows_groups_up_to_the_window_length():
+    segments = [segment('it', 3 * i, 3 * (i + 1)) for i in range(10)]
+    windows = plan_windows(segments, window_seconds=9.0)
+
+    assert [len(w) for w in windows] == [3, 3, 3, 1]
+    assert [s for w in windows for s in w] == segments
+
+
+def test_plan_windows_breaks_on_language_and_gaps():
+    segments = [segment('it', 0, 3), segment('it', 3, 6), segment('en', 6, 9),
+                segment('en', 12, 15), segment('en', 15.5, 18)]
+    windows = plan_windows(segments, window_seconds=20.0, max_gap_seconds=1.0)
+
+    assert [[s.start_sample // 16000 for s in w] for w in windows] == [[0, 3], [6], [12, 15]]
+
+
+def test_plan_windows_empty():
+    assert plan_windows([]) == []
+
+
+def test_main_continues_after_an_unreadable_transcript(tmp_path, capsys):
+    empty = write_transcript(tmp_path, "")
+    main([str(tmp_path / "missing.txt"), empty])
+
+    output = capsys.readouterr().out
+    assert "missing.txt" in output
+    assert "no archived audio ranges" in output
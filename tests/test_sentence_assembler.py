@@ -0,0 +1,95 @@
+from segment import Segment
+from sentence_assembler import SentenceAssembler
+
+
+def fragment(text, start, end, speaker_turn=None, confidence=None, capture_glitches=0):
+    segment = Segment(0, 'it', start, end)
+    segment.source_text = text
+    segment.speaker_turn = speaker_turn
+    segment.confidence = confidence
+    segment.capture_glitches = capture_glitches
+    return segment
+
+
+def test_windows_are_merged_until_the_sentence_ends():
+    assembler = SentenceAssembler()
+    assert assembler.add(fragment("Oggi parliamo del", 0, 48000), now=0.0) == []
+    completed = assembler.add(fragment("nuovo progetto.", 48000, 96000), now=3.0)
+
+    assert [(s.index, s.source_text, s.sample_range) for s in completed] == [
+        (1, "Oggi parliamo del nuovo progetto.", (0, 96000))]
+    assert assembler.pending is None
+
+
+def test_pending_sentence_is_released_at_the_deadline():
+    assembler = SentenceAssembler(max_delay=6.0)
+    assembler.add(fragment("e quindi la", 0, 48000), now=0.0)
+
+    assert assembler.due(now=5.9) == []
+    assert [s.source_text for s in assembler.due(now=6.0)] == ["e quindi la"]
+    assert assembler.forced == 1
+    # A fragment arriving after the deadline is cut together with what was pending
+    assembler.add(fragment("poi il", 48000, 96000), now=10.0)
+    assert [s.source_text for s in assembler.add(fragment("nostro", 96000, 144000), now=16.5)] == ["poi il nostro"]
+    assert assembler.forced == 2
+
+
+def test_pause_ends_the_sentence():
+    assembler = SentenceAssembler(pause_seconds=0.6)
+    # Enough words and a long trailing silence make a boundary without punctuation
+    completed = assembler.add(fragment("va bene ci vediamo domani", 0, 48000), trailing_silence=1.3, now=0.0)
+    assert [s.source_text for s in completed] == ["va bene ci vediamo domani"]
+
+    # A window with no speech flushes what is pending, however it ends
+    assembler.add(fragment("allora per", 48000, 96000), now=3.0)
+    assert [s.source_text for s in assembler.pause(now=4.0)] == ["allora per"]
+    assert assembler.pause(now=5.0) == []
+
+
+def test_fragment_is_split_after_the_last_full_stop():
+    assembler = SentenceAssembler()
+    assembler.add(fragment("il cliente vuole", 0, 48000), now=0.0)
+    completed = assembler.add(fragment("una demo. Poi la", 48000, 96000), now=3.0)
+
+    assert [s.source_text for s in completed] == ["il cliente vuole una demo."]
+    assert (assembler.pending.source_text, assembler.pending.sample_range) == ("Poi la", (48000, 96000))
+    assert [s.source_text for s in assembler.flush()] == ["Poi la"]
+
+
+def test_long_sentences_are_cut_at_max_words():
+    assembler = SentenceAssembler(max_words=6)
+    assert assembler.add(fragment("uno due tre e", 0, 48000), now=0.0) == []
+    completed = assembler.add(fragment("quattro cinque e", 48000, 96000), now=3.0)
+
+    assert [s.source_text for s in completed] == ["uno due tre e quattro cinque e"]
+
+
+def test_split_remainder_keeps_the_fragment_attributes():
+    assembler = SentenceAssembler()
+    completed = assembler.add(fragment("Buongiorno a tutti. Oggi parliamo di", 0, 48000, speaker_turn=0,
+                                       confidence=0.5, capture_glitches=2), now=0.0)
+
+    assert [s.source_text for s in completed] == ["Buongiorno a tutti."]
+    rest = assembler.pending
+    assert rest.source_text == "Oggi parliamo di"
+    assert rest.speaker_turn == 0
+    assert rest.confidence == 0.5
+    assert rest.capture_glitches == 2
+
+
+def test_split_remainder_merges_with_the_same_speaker():
+    assembler = SentenceAssembler()
+    assembler.add(fragment("Buongiorno a tutti. Oggi parliamo di", 0, 48000, speaker_turn=0), now=0.0)
+    completed = assembler.add(fragment("del nuovo progetto.", 48000, 96000, speaker_turn=0), now=3.0)
+
+    assert [s.source_text for s in completed] == ["Oggi parliamo di del nuovo progetto."]
+    assert completed[0].speaker_turn == 0
+
+
+def test_new_speaker_ends_the_sentence():
+    assembler = SentenceAssembler()
+    assembler.add(fragment("Oggi parliamo di", 0, 48000, speaker_turn=0), now=0.0)
+    completed = assembler.add(fragment("scusa una domanda", 48000, 96000, speaker_turn=1), now=3.0)
+
+    assert [s.source_text for s in completed] == ["Oggi parliamo di"]
+    assert assembler.pending.speaker_turn == 1
@@ -0,0 +1,76 @@
+from segment import Segment
+from transcript_writer import TranscriptWriter
+from translation_memory import TranslationMemory
+
+SENTENCE = "dobbiamo rivedere il budget del progetto entro venerdì prossimo"
+TRANSLATION = "we need to review the project budget by next Friday"
+
+
+def memory(**kwargs):
+    tm = TranslationMemory("unused", **kwargs)
+    tm.add(SENTENCE + ".", TRANSLATION, "it", "en")
+    tm.add("grazie a tutti", "thanks everyone", "it", "en")
+    return tm
+
+
+def test_exact_repeat_hits_after_normalization():
+    tm = memory()
+
+    assert tm.lookup("  Dobbiamo rivedere il budget del progetto entro venerdì prossimo!", "it", "en") == TRANSLATION
+    assert tm.exact_hits == 1
+
+
+def test_near_duplicate_above_threshold_hits():
+    tm = memory(threshold=0.8)
+
+    assert tm.lookup("dobbiamo rivedere il budget del progetto entro venerdi prossimo", "it", "en") == TRANSLATION
+    assert tm.fuzzy_hits == 1
+
+
+def test_different_sentence_misses():
+    tm = memory(threshold=0.8)
+
+    assert tm.lookup("domani parliamo del nuovo cliente e della fase due", "it", "en") is None
+    assert tm.lookups == 1 and tm.exact_hits == tm.fuzzy_hits == 0
+
+
+def test_numbers_must_match_for_a_fuzzy_hit():
+    tm = TranslationMemory("unused", threshold=0.8)
+    tm.add("la riunione è alle 3 nella sala grande", "the meeting is at 3 in the large room", "it", "en")
+
+    assert tm.lookup("la riunione è alle 4 nella sala grande", "it", "en") is None
+
+
+def test_short_texts_only_match_exactly():
+    tm = memory(threshold=0.5)
+
+    assert tm.lookup("grazie a tutti", "it", "en") == "thanks everyone"
+    # Below min_fuzzy_length a one-letter difference is a different sentence
+    assert tm.lookup("grazie a tutte", "it", "en") is None
+
+
+def test_other_language_pairs_never_match():
+    tm = memory()
+
+    assert tm.lookup(SENTENCE, "it", "de") is None
+    assert tm.lookup(SENTENCE, "es", "en") is None
+
+
+def test_round_trip_through_a_transcript(tmp_path):
+    path = str(tmp_path / "translations_20260301_100000.txt")
+    writer = TranscriptWriter(path, "it", "en")
+    writer.write_header()
+    for text, translation in ((SENTENCE + ".", TRANSLATION + "."), ("grazie a tutti", "thanks everyone")):
+        segment = Segment(source_lang="it")
+        segment.source_text = text
+        segment.translations = {"en": translation}
+        writer.write_segment(segment)
+    writer.finish()
+
+    tm = TranslationMemory(str(tmp_path))
+    tm._load_transcript(path)
+
+    assert tm.loaded_files == 1
+    assert len(tm) == 2
+    assert tm.lookup(SENTENCE, "it", "en") == TRANSLATION + "."
+    assert tm.lookup("Grazie a tutti.", "it", "en") == "thanks everyone"
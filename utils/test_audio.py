@@ -6,6 +6,7 @@ from config import Config
 from audio_capture import AudioCapture
 from speech_to_text import SpeechToText
 from translator import TextTranslator
+from languages import recognizer_locale
 
 class TeamsTranslator:
     def __init__(self, config):
@@ -15,7 +16,7 @@ class TeamsTranslator:
             chunk_size=config.CHUNK_SIZE,
             channels=config.CHANNELS
         )
-        self.speech_to_text = SpeechToText(language=f'{config.SOURCE_LANGUAGE}-{config.SOURCE_LANGUAGE.upper()}')
+        self.speech_to_text = SpeechToText(language=recognizer_locale(config.SOURCE_LANGUAGE))
         self.translator = TextTranslator(
             src_lang=config.SOURCE_LANGUAGE,
             dest_lang=config.TARGET_LANGUAGE